@@ -25,13 +25,54 @@ FUTURE SUGGESTIONS & PLANNED:
 - UnlockedLicenses is the list of product IDs.
 """
 
-from src.gui.main_window import MoneyBoosterGUI
+import os
+import sys
 
-def run_application():
-    """Initializes and runs the Money Booster GUI."""
+from src import startup_profile
+from src import tracing
+
+def run_application(profile_startup=False):
+    """Initializes and runs the Money Booster GUI.
+
+    With profile_startup the app prints an import/init timing breakdown
+    once the first frame is drawn, then exits at once. If MONEY_BOOSTER_TRACE names
+    a file, a Chrome trace of the session is written there on exit.
+    """
+    trace_path = os.environ.get(tracing.TRACE_ENV)
+    if trace_path:
+        tracing.enable()
+    if profile_startup:
+        startup_profile.start()
     print("Launching Supermarket Money Booster...")
+    
+    from src.gui.main_window import MoneyBoosterGUI
+    startup_profile.mark("Import main_window")
     app = MoneyBoosterGUI()
-    app.run()
+    
+    if profile_startup:
+        def first_frame():
+            app.root.update()
+            startup_profile.mark("First frame drawn")
+            print(startup_profile.stop().report(), flush=True)
+            if trace_path:
+                tracing.finish(trace_path)
+            # Skip run()'s exit work (pending hashes, session save, backup flush): it is
+            # not part of time-to-window and would overwrite the user's session.json
+            os._exit(0)
+        app.root.after(0, first_frame)
+    try:
+        app.run()
+    finally:
+        if trace_path:
+            tracing.finish(trace_path)
 
 if __name__ == "__main__":
-    run_application()
+    args = sys.argv[1:]
+    # After an update, run the installed version the pointer file selects
+    from src.updater.staged_applier import launch_active_version
+    launch_active_version(args)
+    if args and args[0] != "--profile-startup":
+        # Headless batch mode: never imports tkinter
+        from src.cli import main
+        sys.exit(main(args))
+    run_application(profile_startup="--profile-startup" in args)
@@ -0,0 +1,281 @@
+"""Headless command line for batch work on saves (no tkinter).
+
+    python money_mods.py stats "saves/*.json"
+    python money_mods.py money --amount 50000 slot1.json slot2.json
+    python money_mods.py scan ~/backups --workers 8
+    python money_mods.py diff backups/slot1_backup.json slot1.json
+    python money_mods.py --trace trace.json scan ~/backups
+
+Every processed file produces one JSON line on stdout with its result and
+timing; diagnostics go to stderr. Exit code 0 means every file succeeded,
+1 that at least one failed, 2 a usage error or no matching files.
+"""
+import os
+import sys
+import json
+import glob
+import time
+import argparse
+import threading
+import contextlib
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from src import tracing
+from src.tracing import TRACE_ENV
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+# subcommand -> (SaveEditor method, value type or None, help)
+EDIT_COMMANDS = {
+    'money': ('modify_money', float, "Add to or set the money amount"),
+    'level': ('modify_level', int, "Set the store level"),
+    'xp': ('modify_xp', int, "Set the store XP"),
+    'points': ('modify_store_points', int, "Set the store expansion points"),
+    'rating': ('modify_rating', float, "Set the store rating"),
+    'unlock-licenses': ('unlock_all_licenses', None, "Unlock all product licenses"),
+    'reset-licenses': ('reset_licenses', None, "Reset licenses to the basic one"),
+    'repair': ('repair_interaction', None, "Reset movement/reach stats to 1.0"),
+    'boost-staff': ('boost_staff_stats', None, "Boost hired employee stats"),
+}
+COMMANDS = ('scan', 'stats', 'backup', 'diff', 'serve') + tuple(EDIT_COMMANDS)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="money_mods.py", description="Supermarket Money Booster (headless)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker threads (default: CPU count, max 8)")
+    parser.add_argument('--trace', metavar='FILE', default=os.environ.get(TRACE_ENV),
+                        help=f"Write a Chrome trace of the run to FILE and print a timing summary (or set {TRACE_ENV})")
+    commands = parser.add_subparsers(dest='command', required=True)
+    # --workers is also accepted after the subcommand; SUPPRESS keeps a value given before it
+    pooled = argparse.ArgumentParser(add_help=False)
+    pooled.add_argument('--workers', type=int, default=argparse.SUPPRESS, help="Worker threads (default: CPU count, max 8)")
+
+    scan = commands.add_parser('scan', parents=[pooled], help="Scan directories or files for saves (default: game locations)")
+    scan.add_argument('paths', nargs='*', help="Directories, files or glob patterns")
+
+    stats = commands.add_parser('stats', parents=[pooled], help="Print money, level, XP, points and rating")
+    stats.add_argument('paths', nargs='+', help="Save files or glob patterns")
+
+    backup = commands.add_parser('backup', parents=[pooled], help="Create a backup of each save")
+    backup.add_argument('paths', nargs='+', help="Save files or glob patterns")
+
+    diff = commands.add_parser('diff', help="Show changed fields between two saves (e.g. a backup and the live save)")
+    diff.add_argument('old')
+    diff.add_argument('new')
+    diff.add_argument('--limit', type=int, default=10000, help="Stop after this many changes")
+
+    for name, (_, value_type, help_text) in EDIT_COMMANDS.items():
+        edit = commands.add_parser(name, parents=[pooled], help=help_text)
+        if value_type is not None:
+            edit.add_argument('--value', '--amount', dest='value', type=value_type, required=True)
+        if name == 'money':
+            edit.add_argument('--op', choices=('add', 'set'), default='add')
+        edit.add_argument('paths', nargs='+', help="Save files or glob patterns")
+
+    serve = commands.add_parser('serve', parents=[pooled], help="Run the local JSON-RPC service (see src/service.py)")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--root', action='append', dest='roots', default=[],
+                       help="Extra directory the service may read and edit (repeatable)")
+    return parser
+
+
+def expand_paths(patterns) -> list:
+    """Expands globs (including **), keeps literal paths, drops duplicates; order is stable."""
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(os.path.expanduser(pattern), recursive=True)) if glob.has_magic(pattern) else [os.path.expanduser(pattern)]
+        for match in matches:
+            key = os.path.normcase(os.path.abspath(match))
+            if key not in seen:
+                seen.add(key)
+                paths.append(Path(match))
+    return paths
+
+
+class BatchRunner:
+    """Runs one task per path on a thread pool and writes a JSON line per result."""
+
+    def __init__(self, out, workers=None):
+        self.out = out
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.failed = 0
+        self._write_lock = threading.Lock()
+
+    def run(self, command, paths, task) -> int:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="cli") as pool:
+            for path in paths:
+                pool.submit(self._run_one, command, path, task)
+        self.emit({
+            'command': command,
+            'summary': True,
+            'files': len(paths),
+            'failed': self.failed,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 3),
+        })
+        return EXIT_FAILED if self.failed else EXIT_OK
+
+    def emit(self, record):
+        line = json.dumps(record, default=json_default)
+        with self._write_lock:
+            self.out.write(line + "\n")
+            self.out.flush()
+
+    def _run_one(self, command, path, task):
+        started = time.perf_counter()
+        record = {'command': command, 'path': str(path)}
+        try:
+            result = task(path)
+            ok = result is not False and result is not None
+            if isinstance(result, dict):
+                record.update(result)
+        except Exception as e:
+            ok = False
+            record['error'] = str(e)
+        record['ok'] = ok
+        record['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        if not ok:
+            with self._write_lock:
+                self.failed += 1
+        self.emit(record)
+
+
+def json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Path):
+        return str(value)
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()  # SaveRecord
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _scan_task(path):
+    from src.save_detection.save_scanner import SupermarketSaveScanner
+    scanner = SupermarketSaveScanner()  # one per task: progress counters are not shared
+    if path.is_dir():
+        saves = scanner._scan_for_save_files(path)
+    elif path.is_file():
+        save = scanner._analyze_save_file(path)
+        saves = [save] if save else []
+    else:
+        raise FileNotFoundError(f"No such file or directory: {path}")
+    return {'saves': saves, 'count': len(saves)}
+
+
+def _scan_game_locations():
+    from src.save_detection.save_scanner import SupermarketSaveScanner
+    scanner = SupermarketSaveScanner()
+    scanner.detect_game_installation()
+    return [Path(save['path']) for save in scanner.found_saves]
+
+
+def _diff(out, old, new, limit) -> int:
+    """One JSON line per changed path, then a summary line."""
+    from src.save_editor.save_diff import diff_files
+    old, new = Path(old), Path(new)
+    runner = BatchRunner(out)
+    started = time.perf_counter()
+    try:
+        _require_file(old)
+        _require_file(new)
+        changes = diff_files(old, new, limit)
+    except Exception as e:
+        runner.emit({'command': 'diff', 'old': str(old), 'new': str(new), 'ok': False, 'error': str(e)})
+        return EXIT_FAILED
+    for change in changes:
+        runner.emit(dict(change, command='diff'))
+    runner.emit({
+        'command': 'diff',
+        'summary': True,
+        'old': str(old),
+        'new': str(new),
+        'changes': len(changes),
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 3),
+    })
+    return EXIT_OK
+
+
+def _require_file(path):
+    if not path.is_file():
+        raise FileNotFoundError(f"No such file: {path}")
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if not args.trace:
+        return _run(args)
+    tracing.enable()
+    try:
+        return _run(args)
+    finally:
+        tracing.finish(args.trace)
+
+
+def _run(args) -> int:
+    if args.command == 'serve':
+        from src.service import serve
+        return serve(args.host, args.port, workers=args.workers or 4, roots=args.roots)
+
+    out = sys.stdout
+    # SaveEditor and the scanner report problems with print(); keep stdout pure JSON lines
+    with contextlib.redirect_stdout(sys.stderr):
+        if args.command == 'diff':
+            return _diff(out, args.old, args.new, args.limit)
+        if args.command == 'scan' and not args.paths:
+            paths = _scan_game_locations()
+        else:
+            paths = expand_paths(args.paths)
+        if not paths:
+            print("No matching save files.", file=sys.stderr)
+            return EXIT_USAGE
+
+        runner = BatchRunner(out, args.workers)
+        if args.command == 'scan':
+            return runner.run('scan', paths, _scan_task)
+
+        from src.save_editor.json_editor import SaveEditor
+        from src.save_editor.backup_worker import get_backup_worker
+        editor = SaveEditor()
+
+        if args.command == 'stats':
+            def task(path):
+                return {'stats': editor.read_stats(path)}
+        elif args.command == 'backup':
+            def task(path):
+                _require_file(path)
+                backup_path = editor.backup_system.create_backup(path)
+                return {'backup': str(backup_path)} if backup_path else False
+        else:
+            method_name, value_type, _ = EDIT_COMMANDS[args.command]
+            method = getattr(editor, method_name)
+            if args.command == 'money':
+                def call(path):
+                    return method(path, args.value, args.op)
+            elif value_type is not None:
+                def call(path):
+                    return method(path, args.value)
+            else:
+                call = method
+
+            def task(path):
+                _require_file(path)
+                if not call(path):
+                    return False
+                return {'stats': editor.read_stats(path)}
+
+        try:
+            return runner.run(args.command, paths, task)
+        finally:
+            # Backups are catalogued in the background; finish before the process exits
+            get_backup_worker().flush(timeout=30)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ActionRunner:
+    """Runs save edits off the Tk main thread.
+
+    Work is submitted to a single worker thread (edits on one save must not
+    interleave). While anything is in flight the registered buttons are
+    disabled, and the main thread polls the futures with root.after so
+    callbacks always run on the Tk thread.
+    """
+
+    POLL_MS = 16  # ~60 fps, only while work is pending
+
+    def __init__(self, root, max_workers=1):
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="QuickMod")
+        self.buttons = []
+        self._pending = []
+        self._polling = False
+
+    @property
+    def busy(self):
+        return bool(self._pending)
+
+    def register_buttons(self, *buttons):
+        self.buttons.extend(buttons)
+
+    def submit(self, work, on_done=None, on_error=None):
+        """Runs work() on the worker; on_done(result) / on_error(exc) run on the Tk thread."""
+        future = self.executor.submit(work)
+        self._pending.append((future, on_done, on_error))
+        self._set_buttons_state("disabled")
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_MS, self._poll)
+        return future
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+    def _poll(self):
+        still_pending = []
+        finished = []
+        for entry in self._pending:
+            (finished if entry[0].done() else still_pending).append(entry)
+        self._pending = still_pending
+
+        if not self._pending:
+            self._polling = False
+            self._set_buttons_state("!disabled")
+        else:
+            self.root.after(self.POLL_MS, self._poll)
+
+        for future, on_done, on_error in finished:
+            error = future.exception()
+            if error is not None:
+                print(f"Action failed: {error}")
+                if on_error:
+                    on_error(error)
+            elif on_done:
+                on_done(future.result())
+
+    def _set_buttons_state(self, state):
+        for button in self.buttons:
+            button.state([state])
@@ -1,27 +1,27 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import configparser
+import threading
 from pathlib import Path
 
 from src.gui.themes import Theme
 from src.gui.language import Language
+from src.gui.action_runner import ActionRunner
+from src.gui.session import SessionStore
 from src.save_editor.save_manager import SaveManager
 from src.save_editor.json_editor import SaveEditor
 from src.save_editor.backup_system import BackupSystem
-
-# New Detection Modules
-from src.save_detection.save_scanner import SupermarketSaveScanner
-from src.save_detection.save_manager import MultiSaveManager
-from src.save_detection.detection_gui import SaveDetectionGUI
-
-# Update System
-from src.updater.github_updater import GitHubUpdater
 from src.updater.version_check import VersionCheck
+from src import startup_profile
+
+# The detection modules (psutil, winreg), the detection tab and the updater
+# (requests) are imported on first use so the window can appear right away.
 
 class MoneyBoosterGUI:
     def __init__(self):
         self.root = tk.Tk()
         self.root.geometry("600x500") # Expanded for tabs
+        startup_profile.mark("Tk root")
         
         self.config = configparser.ConfigParser()
         self.config.read('config.ini')
@@ -31,25 +31,37 @@ class MoneyBoosterGUI:
         
         self.language = Language(self.current_lang)
         self.theme = Theme.get_theme(self.current_theme_name)
+        startup_profile.mark("Config, language, theme")
         
         # Legacy components
         self.save_manager = SaveManager()
         self.save_editor = SaveEditor()
         self.backup_system = BackupSystem()
         
-        # New Detection components
-        self.scanner = SupermarketSaveScanner()
-        self.multi_save_manager = MultiSaveManager(self.scanner)
+        # New Detection components, created by _detection_components()
+        self.scanner = None
+        self.multi_save_manager = None
+        self._detection_lock = threading.Lock()
+        # Set once interrupted multi-save commits are recovered; edits wait for it
+        self._recovered = threading.Event()
         
         self.current_save_path = None
+        self.current_stats = None
+        self._verify_progress = None
+        self._diff_trees = None
+        self.actions = ActionRunner(self.root)
+        self.session_store = SessionStore()
+        startup_profile.mark("Editor components")
         
         self.apply_theme()
         self.setup_ui()
+        startup_profile.mark("Quick Mod UI")
+        self.restore_session()
         self.load_initial_data()
         
-        # Initialize Updater (Real repository)
+        # Updater (Real repository) is created on the first update check
         self.local_version = VersionCheck.get_local_version()
-        self.updater = GitHubUpdater("infinityambients-tech", "mods-supermarket", self.local_version)
+        self.updater = None
         
         # Check for updates after UI loads
         self.root.after(2000, self.check_for_updates)
@@ -82,25 +94,57 @@ class MoneyBoosterGUI:
         self.notebook.add(self.quick_tab, text="Quick Mod")
         self._setup_quick_tab(self.quick_tab)
         
-        # Tab 2: Advanced Detection
+        # Tab 2: Advanced Detection (built the first time it is selected)
         self.detection_tab = ttk.Frame(self.notebook)
         self.notebook.add(self.detection_tab, text="Advanced Detection")
-        self.detection_gui = SaveDetectionGUI(
-            self.detection_tab, 
-            self.scanner, 
-            self.multi_save_manager,
-            on_save_selected=self.handle_detection_selection
-        )
+        self.detection_gui = None
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
         
         # Settings Bar (Common)
         settings_frame = ttk.Frame(self.root)
         settings_frame.pack(side="bottom", fill="x", pady=5, padx=5)
         ttk.Button(settings_frame, text="PL/EN", command=self.toggle_lang).pack(side="right", padx=2)
         ttk.Button(settings_frame, text="Dark/Light", command=self.toggle_theme).pack(side="right", padx=2)
+        self.backup_status_label = ttk.Label(settings_frame, text="")
+        self.backup_status_label.pack(side="left", padx=2)
+        self._poll_backup_status()
         
         # Menu
         self.create_menu()
 
+    def _on_tab_changed(self, event=None):
+        if self.detection_gui is None and self.notebook.select() == str(self.detection_tab):
+            from src.save_detection.detection_gui import SaveDetectionGUI
+            scanner, manager = self._detection_components()
+            self.detection_gui = SaveDetectionGUI(
+                self.detection_tab, 
+                scanner, 
+                manager,
+                on_save_selected=self.handle_detection_selection
+            )
+
+    def _detection_components(self):
+        """Creates the scanner and multi-save manager on first use (thread-safe)."""
+        with self._detection_lock:
+            if self.multi_save_manager is None:
+                from src.save_detection.save_scanner import SupermarketSaveScanner
+                from src.save_detection.save_manager import MultiSaveManager
+                self.scanner = SupermarketSaveScanner()
+                self.multi_save_manager = MultiSaveManager(self.scanner)
+            return self.scanner, self.multi_save_manager
+
+    def _poll_backup_status(self):
+        """Shows how many backups are still being written/catalogued in the background."""
+        pending = self.backup_system.pending_backups()
+        if self._verify_progress:
+            text = self.language.get("verify_progress").format(*self._verify_progress)
+        elif pending:
+            text = self.language.get("backups_pending").format(pending)
+        else:
+            text = ""
+        self.backup_status_label.config(text=text)
+        self.root.after(500, self._poll_backup_status)
+
     def handle_detection_selection(self, file_path):
         """Callback for when a save is selected in the detection tab"""
         self.current_save_path = Path(file_path)
@@ -211,6 +255,12 @@ class MoneyBoosterGUI:
         
         self.restore_btn = ttk.Button(main_frame, text=self.language.get("restore_button"), command=self.restore_backup)
         self.restore_btn.pack(pady=5)
+        
+        # Disabled while an edit is running in the background
+        self.actions.register_buttons(
+            self.add_btn, self.max_btn, self.set_level_btn, self.max_level_btn, self.set_xp_btn,
+            self.set_points_btn, self.set_rating_btn, self.unlock_btn, self.boost_staff_btn,
+            self.repair_btn, self.reset_licenses_btn, self.backup_btn, self.restore_btn)
 
     def create_menu(self):
         menubar = tk.Menu(self.root)
@@ -218,19 +268,70 @@ class MoneyBoosterGUI:
         file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label=self.language.get("menu_file"), menu=file_menu)
         file_menu.add_command(label=self.language.get("menu_select_save"), command=self.manual_select_save)
+        file_menu.add_command(label=self.language.get("menu_verify_backups"), command=self.verify_backups)
+        file_menu.add_command(label=self.language.get("menu_compare_backup"), command=self.compare_with_backup)
         file_menu.add_separator()
         file_menu.add_command(label=self.language.get("menu_exit"), command=self.root.quit)
 
+    def restore_session(self):
+        """Shows last session's save and stats immediately if the file is unchanged.
+
+        The metadata check is a single stat(); the content hash is verified on
+        the worker afterwards and the stats reparsed if it no longer matches.
+        """
+        session = self.session_store.load()
+        if session is None or not session.is_current():
+            return
+        self.current_save_path = session.save_path
+        self.current_stats = session.stats
+        self.save_editor.stats_cache.put(session.save_path, session.stats, session.snapshot)
+        self._render_info()
+        startup_profile.mark("Session restored")
+
+        def on_validated(matches):
+            if not matches:
+                self.save_editor.stats_cache.invalidate(session.save_path)
+                if self.current_save_path == session.save_path:
+                    self.update_info()
+
+        self.actions.submit(session.content_matches, on_done=on_validated)
+
     def load_initial_data(self):
-        found_file = self.save_manager.find_save_file()
-        if found_file:
-            self.current_save_path = found_file
-            self.update_info()
+        """Finds the save on its own thread so the window and Quick Mod actions stay responsive.
+
+        The disk walk is skipped when the session already restored a save.
+        """
+        def find():
+            try:
+                # MultiSaveManager also recovers interrupted multi-save commits on creation
+                self._detection_components()
+            finally:
+                self._recovered.set()
+            if self.current_save_path:
+                return
+            found_file = self.save_manager.find_save_file()
+            self.root.after(0, on_found, found_file)
+
+        def on_found(found_file):
+            startup_profile.mark("Save found (background)")
+            # Keep a save the user already picked while we were searching
+            if found_file and not self.current_save_path:
+                self.current_save_path = found_file
+                self.update_info()
+
+        threading.Thread(target=find, daemon=True).start()
 
     def update_info(self):
         if self.current_save_path:
+            # Cached per (path, mtime_ns, size); only reparsed if the game changed the file
+            self.current_stats = self.save_editor.get_current_stats(self.current_save_path)
+        self._render_info()
+
+    def _render_info(self):
+        """Redraws status and stats labels from the last known stats (no file access)."""
+        if self.current_save_path and self.current_stats:
             self.status_label.config(text=self.language.get("status_save_found") + f": {self.current_save_path.name}")
-            stats = self.save_editor.get_current_stats(self.current_save_path)
+            stats = self.current_stats
             self.money_label.config(text=self.language.get("current_money").format(f"{stats['money']:,.2f}"))
             self.level_label.config(text=self.language.get("current_level").format(int(stats['level'] or 0)))
             self.xp_label.config(text=self.language.get("current_xp").format(int(stats['xp'] or 0)))
@@ -239,19 +340,40 @@ class MoneyBoosterGUI:
         else:
             self.status_label.config(text=self.language.get("status_no_save"))
 
+    def _run_action(self, work, success_msg, failure_msg=None):
+        """Runs an edit on the worker thread and reports the result when it finishes."""
+        save_path = self.current_save_path
+
+        def on_done(ok):
+            if ok:
+                messagebox.showinfo(self.language.get("success_title"), success_msg)
+                if save_path == self.current_save_path:
+                    self.update_info()
+            elif failure_msg:
+                messagebox.showerror(self.language.get("error_title"), failure_msg)
+
+        def on_error(error):
+            messagebox.showerror(self.language.get("error_title"), failure_msg or str(error))
+
+        def run():
+            # Never edit a save that startup recovery may still roll forward
+            self._recovered.wait()
+            return work()
+
+        self.actions.submit(run, on_done=on_done, on_error=on_error)
+
     def add_money(self):
         if not self.current_save_path:
             messagebox.showerror(self.language.get("error_title"), "No save file selected.")
             return
         try:
             amount = float(self.money_entry.get())
-            if self.save_editor.modify_money(self.current_save_path, amount, 'add'):
-                messagebox.showinfo(self.language.get("success_title"), self.language.get("success_add").format(amount))
-                self.update_info()
-            else:
-                messagebox.showerror(self.language.get("error_title"), "Failed to modify save.")
         except ValueError:
             messagebox.showerror(self.language.get("error_title"), self.language.get("error_amount"))
+            return
+        path = self.current_save_path
+        self._run_action(lambda: self.save_editor.modify_money(path, amount, 'add'),
+                         self.language.get("success_add").format(amount), "Failed to modify save.")
 
     def set_level(self):
         if not self.current_save_path:
@@ -259,13 +381,12 @@ class MoneyBoosterGUI:
             return
         try:
             level = int(self.level_entry.get())
-            if self.save_editor.modify_level(self.current_save_path, level):
-                messagebox.showinfo(self.language.get("success_title"), self.language.get("success_level").format(level))
-                self.update_info()
-            else:
-                messagebox.showerror(self.language.get("error_title"), "Failed to modify level.")
         except ValueError:
             messagebox.showerror(self.language.get("error_title"), "Enter valid level integer!")
+            return
+        path = self.current_save_path
+        self._run_action(lambda: self.save_editor.modify_level(path, level),
+                         self.language.get("success_level").format(level), "Failed to modify level.")
 
     def set_xp(self):
         if not self.current_save_path:
@@ -273,13 +394,12 @@ class MoneyBoosterGUI:
             return
         try:
             xp = int(self.xp_entry.get())
-            if self.save_editor.modify_xp(self.current_save_path, xp):
-                messagebox.showinfo(self.language.get("success_title"), self.language.get("success_xp").format(xp))
-                self.update_info()
-            else:
-                messagebox.showerror(self.language.get("error_title"), "Failed to modify XP.")
         except ValueError:
             messagebox.showerror(self.language.get("error_title"), "Enter valid XP integer!")
+            return
+        path = self.current_save_path
+        self._run_action(lambda: self.save_editor.modify_xp(path, xp),
+                         self.language.get("success_xp").format(xp), "Failed to modify XP.")
 
     def set_points(self):
         if not self.current_save_path:
@@ -287,13 +407,12 @@ class MoneyBoosterGUI:
             return
         try:
             points = int(self.points_entry.get())
-            if self.save_editor.modify_store_points(self.current_save_path, points):
-                messagebox.showinfo(self.language.get("success_title"), self.language.get("success_points").format(points))
-                self.update_info()
-            else:
-                messagebox.showerror(self.language.get("error_title"), "Failed to modify points.")
         except ValueError:
             messagebox.showerror(self.language.get("error_title"), "Enter valid points integer!")
+            return
+        path = self.current_save_path
+        self._run_action(lambda: self.save_editor.modify_store_points(path, points),
+                         self.language.get("success_points").format(points), "Failed to modify points.")
 
     def set_rating(self):
         if not self.current_save_path:
@@ -301,53 +420,46 @@ class MoneyBoosterGUI:
             return
         try:
             rating = float(self.rating_entry.get())
-            if self.save_editor.modify_rating(self.current_save_path, rating):
-                messagebox.showinfo(self.language.get("success_title"), self.language.get("success_rating").format(rating))
-                self.update_info()
-            else:
-                messagebox.showerror(self.language.get("error_title"), "Failed to modify rating.")
         except ValueError:
             messagebox.showerror(self.language.get("error_title"), "Enter valid rating number!")
+            return
+        path = self.current_save_path
+        self._run_action(lambda: self.save_editor.modify_rating(path, rating),
+                         self.language.get("success_rating").format(rating), "Failed to modify rating.")
 
     def boost_staff(self):
         if not self.current_save_path:
             messagebox.showerror(self.language.get("error_title"), "No save file selected.")
             return
-        if self.save_editor.boost_staff_stats(self.current_save_path):
-            messagebox.showinfo(self.language.get("success_title"), self.language.get("success_staff"))
-            self.update_info()
-        else:
-            messagebox.showerror(self.language.get("error_title"), "Failed to boost staff stats. Make sure you have hired employees!")
+        path = self.current_save_path
+        self._run_action(lambda: self.save_editor.boost_staff_stats(path),
+                         self.language.get("success_staff"),
+                         "Failed to boost staff stats. Make sure you have hired employees!")
 
     def repair_interaction(self):
         if not self.current_save_path:
             messagebox.showerror(self.language.get("error_title"), "No save file selected.")
             return
         # Even if keys not found, this will rewrite file with correct ES3 formatting
-        if self.save_editor.repair_interaction(self.current_save_path):
-            messagebox.showinfo(self.language.get("success_title"), self.language.get("success_repair"))
-            self.update_info()
-        else:
-            messagebox.showerror(self.language.get("error_title"), "Failed to repair interaction.")
+        path = self.current_save_path
+        self._run_action(lambda: self.save_editor.repair_interaction(path),
+                         self.language.get("success_repair"), "Failed to repair interaction.")
 
     def reset_licenses(self):
         if not self.current_save_path:
             messagebox.showerror(self.language.get("error_title"), "No save file selected.")
             return
         if messagebox.askyesno("Confirm", "Reset all licenses to basic? This fixes some interaction bugs."):
-            if self.save_editor.reset_licenses(self.current_save_path):
-                messagebox.showinfo(self.language.get("success_title"), "Licenses reset!")
-                self.update_info()
+            path = self.current_save_path
+            self._run_action(lambda: self.save_editor.reset_licenses(path), "Licenses reset!")
 
     def unlock_licenses(self):
         if not self.current_save_path:
             messagebox.showerror(self.language.get("error_title"), "No save file selected.")
             return
-        if self.save_editor.unlock_all_licenses(self.current_save_path):
-            messagebox.showinfo(self.language.get("success_title"), self.language.get("success_licenses"))
-            self.update_info()
-        else:
-            messagebox.showerror(self.language.get("error_title"), "Failed to unlock licenses.")
+        path = self.current_save_path
+        self._run_action(lambda: self.save_editor.unlock_all_licenses(path),
+                         self.language.get("success_licenses"), "Failed to unlock licenses.")
 
     def set_max_money(self):
         self.money_entry.delete(0, tk.END)
@@ -361,9 +473,13 @@ class MoneyBoosterGUI:
 
     def create_backup(self):
         if self.current_save_path:
-            path = self.backup_system.create_backup(self.current_save_path)
-            if path:
-                messagebox.showinfo(self.language.get("success_title"), f"Backup created: {path.name}")
+            path = self.current_save_path
+
+            def on_done(backup_path):
+                if backup_path:
+                    messagebox.showinfo(self.language.get("success_title"), f"Backup created: {backup_path.name}")
+
+            self.actions.submit(lambda: self.backup_system.create_backup(path), on_done=on_done)
 
     def restore_backup(self):
         if not self.current_save_path:
@@ -377,9 +493,76 @@ class MoneyBoosterGUI:
         
         latest = backups[0]
         if messagebox.askyesno("Restore", f"Restore latest backup from {latest['date']}?"):
-            if self.backup_system.restore_backup(latest['path'], self.current_save_path):
-                messagebox.showinfo(self.language.get("success_title"), "Backup restored!")
-                self.update_info()
+            path = self.current_save_path
+            self._run_action(lambda: self.backup_system.restore_backup(latest['path'], path), "Backup restored!")
+
+    def verify_backups(self):
+        """Verifies every backup in the background; progress shows in the status bar."""
+        if self._verify_progress:
+            return
+        from src.save_editor.backup_verifier import BackupVerifier, default_backup_dirs
+        backup_dirs = default_backup_dirs(self.current_save_path)
+        self._verify_progress = (0, 0)
+
+        def on_progress(done, total, bytes_read):
+            self._verify_progress = (done, total)
+
+        def worker():
+            try:
+                report = BackupVerifier().verify(backup_dirs, progress=on_progress)
+                self.root.after(0, lambda: self._show_verify_report(report))
+            except Exception as e:
+                print(f"Backup verification failed: {e}")
+            finally:
+                self._verify_progress = None
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _show_verify_report(self, report):
+        from src.save_editor.backup_verifier import format_report, FAILURE_KEYS
+        bad = sum(len(report[k]) for k in FAILURE_KEYS)
+        if bad:
+            messagebox.showwarning(self.language.get("menu_verify_backups"), format_report(report))
+        else:
+            messagebox.showinfo(self.language.get("menu_verify_backups"),
+                                self.language.get("verify_ok").format(report['total']))
+
+    def compare_with_backup(self):
+        """Shows which fields changed between the latest backup and the current save."""
+        if not self.current_save_path:
+            messagebox.showerror(self.language.get("error_title"), "No save file selected.")
+            return
+        backups = self.backup_system.list_backups(self.current_save_path)
+        if not backups:
+            messagebox.showinfo("Wait", "No backups found for this slot.")
+            return
+        from src.save_editor.save_diff import TreeCache
+        if self._diff_trees is None:
+            self._diff_trees = TreeCache()
+        latest = backups[0]
+        path = self.current_save_path
+
+        def on_error(error):
+            messagebox.showerror(self.language.get("error_title"), str(error))
+
+        self.actions.submit(lambda: self._diff_trees.diff(latest['path'], path),
+                            on_done=lambda changes: self._show_diff(changes, latest['date']),
+                            on_error=on_error)
+
+    def _show_diff(self, changes, backup_date):
+        from src.save_editor.save_diff import format_diff
+        if not changes:
+            messagebox.showinfo(self.language.get("menu_compare_backup"),
+                                self.language.get("diff_none").format(backup_date))
+            return
+        window = tk.Toplevel(self.root)
+        window.title(self.language.get("menu_compare_backup"))
+        window.geometry("560x360")
+        ttk.Label(window, text=self.language.get("diff_summary").format(len(changes), backup_date)).pack(anchor='w', padx=10, pady=(10, 5))
+        text = tk.Text(window, wrap='none', font=('Consolas', 9))
+        text.insert('1.0', format_diff(changes))
+        text.config(state='disabled')
+        text.pack(fill='both', expand=True, padx=10, pady=(0, 10))
 
     def manual_select_save(self):
         filename = filedialog.askopenfilename(filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
@@ -399,7 +582,7 @@ class MoneyBoosterGUI:
         self.language.load_locale(new_lang)
         self.root.title(self.language.get("app_title"))
         self.status_label.config(text=self.language.get("status_no_save") if not self.current_save_path else self.language.get("status_save_found"))
-        self.update_info()
+        self._render_info()
         self.add_btn.config(text=self.language.get("add_button"))
         self.max_btn.config(text=self.language.get("max_button"))
         self.set_level_btn.config(text=self.language.get("set_level_button"))
@@ -416,32 +599,68 @@ class MoneyBoosterGUI:
         self.create_menu()
 
     def check_for_updates(self):
-        """Checks for new version on GitHub."""
-        update_info = self.updater.check_for_updates()
-        if update_info.get('available'):
-            latest_v = update_info['version']
-            msg = self.language.get("update_desc").format(latest_v)
-            if messagebox.askyesno(self.language.get("update_available"), msg):
-                self.perform_update(update_info['download_url'])
-
-    def perform_update(self, download_url):
+        """Checks for new version on GitHub in the background (never blocks the UI on the network)."""
+        def worker():
+            if self.updater is None:
+                from src.updater.github_updater import GitHubUpdater
+                self.updater = GitHubUpdater("infinityambients-tech", "mods-supermarket", self.local_version)
+            update_info = self.updater.check_for_updates()
+            if update_info.get('available'):
+                self.root.after(0, lambda: self._offer_update(update_info))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _offer_update(self, update_info):
+        latest_v = update_info['version']
+        msg = self.language.get("update_desc").format(latest_v)
+        if messagebox.askyesno(self.language.get("update_available"), msg):
+            self.perform_update(update_info)
+
+    def perform_update(self, update_info):
         """Handles the download and application of the update."""
         progress_popup = tk.Toplevel(self.root)
         progress_popup.title(self.language.get("updating"))
         progress_popup.geometry("300x100")
-        ttk.Label(progress_popup, text=self.language.get("updating")).pack(pady=20)
+        ttk.Label(progress_popup, text=self.language.get("updating")).pack(pady=(20, 5))
+        progress_label = ttk.Label(progress_popup, text="")
+        progress_label.pack()
         self.root.update()
 
-        if self.updater.download_update(download_url):
-            if self.updater.apply_update():
-                messagebox.showinfo(self.language.get("success_title"), self.language.get("update_ready"))
-                self.root.quit()
+        def on_progress(downloaded, total):
+            text = f"{downloaded / 1048576:.1f} MB"
+            if total:
+                text += f" / {total / 1048576:.1f} MB"
+            progress_label.config(text=text)
+            progress_popup.update()
+
+        # Only the changed files when the release publishes a manifest, else the full archive
+        installed = bool(update_info.get('manifest_url') and self.updater.download_delta(
+            update_info['manifest_url'], update_info['files_url'], progress=on_progress)
+            and self.updater.apply_update(update_info['version']))
+        if not installed:
+            # Also when the delta downloaded but did not verify against the manifest
+            installed = (self.updater.download_update(update_info['download_url'], update_info.get('sha256'),
+                                                      progress=on_progress)
+                         and self.updater.apply_update(update_info['version']))
+
+        if installed:
+            from src.updater.staged_applier import restart_application
+            messagebox.showinfo(self.language.get("success_title"), self.language.get("update_ready"))
+            restart_application()
+            self.root.quit()
         else:
-            messagebox.showerror(self.language.get("error_title"), "Update failed to download.")
+            messagebox.showerror(self.language.get("error_title"), "Update failed.")
             progress_popup.destroy()
 
     def run(self):
         self.root.mainloop()
+        self.actions.shutdown()
+        if self.current_save_path:
+            # Only stats still valid for the file on disk are worth restoring next time
+            self.session_store.save(self.current_save_path,
+                                    self.save_editor.stats_cache.get(self.current_save_path))
+        # Let queued backups finish cataloguing before the interpreter exits
+        self.backup_system.worker.flush(timeout=10)
 
 if __name__ == "__main__":
     app = MoneyBoosterGUI()
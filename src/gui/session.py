@@ -0,0 +1,96 @@
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.save_editor.file_lock import file_snapshot
+
+SESSION_FILE = "session.json"
+SESSION_VERSION = 1
+
+
+class SessionSnapshot:
+    """Last-session state persisted on exit: the open save and its stats.
+
+    On launch the stats are shown straight from here when the save's
+    (mtime_ns, size) still matches - one stat() call, no parsing - and the
+    content hash is checked in the background afterwards.
+    """
+
+    def __init__(self, save_path: Path, mtime_ns: int, size: int, sha256: str, stats: Dict):
+        self.save_path = save_path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.sha256 = sha256
+        self.stats = stats
+
+    @property
+    def snapshot(self):
+        return self.mtime_ns, self.size
+
+    def is_current(self) -> bool:
+        """True if the save looks unchanged (cheap metadata check only)."""
+        return file_snapshot(self.save_path) == self.snapshot
+
+    def content_matches(self) -> bool:
+        """True if the save's content still hashes to the recorded value."""
+        try:
+            return _hash_file(self.save_path) == self.sha256
+        except OSError:
+            return False
+
+
+class SessionStore:
+    def __init__(self, session_file=SESSION_FILE):
+        self.session_file = Path(session_file)
+
+    def load(self) -> Optional[SessionSnapshot]:
+        try:
+            with open(self.session_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != SESSION_VERSION:
+                return None
+            return SessionSnapshot(Path(data['save_path']), int(data['mtime_ns']), int(data['size']),
+                                   data['sha256'], dict(data['stats']))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ignoring unreadable session file: {e}")
+            return None
+
+    def save(self, save_path, stats: Optional[Dict]) -> bool:
+        """Records the open save; hashes it now so the next launch can validate."""
+        if not save_path or not stats:
+            return False
+        try:
+            snapshot = file_snapshot(save_path)
+            if snapshot is None:
+                return False
+            data = {
+                'version': SESSION_VERSION,
+                'save_path': str(save_path),
+                'mtime_ns': snapshot[0],
+                'size': snapshot[1],
+                'sha256': _hash_file(save_path),
+                'stats': stats,
+            }
+            # Hashing raced with a game autosave: the snapshot would never validate
+            if file_snapshot(save_path) != snapshot:
+                return False
+            tmp = self.session_file.with_name(self.session_file.name + '.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.session_file)
+            return True
+        except Exception as e:
+            print(f"Error saving session: {e}")
+            return False
+
+
+def _hash_file(path, chunk_size=1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -1,39 +1,137 @@
 import PyInstaller.__main__
 import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+APP_NAME = 'SupermarketMoneyBooster'
+
+# Modules that end up in the bundle through build-time dependencies but are
+# never imported by the application at runtime
+TRIMMED_EXCLUDES = [
+    'PyInstaller', 'PIL', 'numpy', 'setuptools', 'pkg_resources', 'pip', 'wheel',
+    'pydoc', 'pydoc_data', 'doctest', 'lib2to3', 'idlelib', 'turtle', 'turtledemo',
+    'tkinter.test', 'sqlite3', 'curses', 'xmlrpc', 'multiprocessing',
+]
+
+# onefile: the legacy single exe; it unpacks everything to a temp dir on every launch.
+# onedir: no unpacking, files load straight from the install folder.
+# fast: onedir + trimmed module set + optimized bytecode, no UPX (decompressing DLLs costs startup time).
+BUILD_PROFILES = {
+    'onefile': {'onefile': True, 'excludes': [], 'optimize': 0, 'upx': True, 'bundle_sources': True},
+    'onedir': {'onefile': False, 'excludes': [], 'optimize': 0, 'upx': True, 'bundle_sources': True},
+    'fast': {'onefile': False, 'excludes': TRIMMED_EXCLUDES, 'optimize': 1, 'upx': False, 'bundle_sources': False},
+}
+
+
+def build_args(profile_name):
+    profile = BUILD_PROFILES[profile_name]
 
-def create_setup():
-    print("Starting build process...")
-    
-    # Define build arguments
-    # Note: Paths separator handling for cross-platform safety, though this is Windows specific task.
-    
     # We need to include data files: src, locales, resources
-    add_data = [
-        'src;src',
-        'locales;locales',
-        'resources;resources',
-        'config.ini;.',
-        'version.json;.'
-    ]
-    
+    add_data = ['locales', 'resources', 'config.ini', 'version.json']
+    if profile['bundle_sources']:
+        # The code itself is already compiled into the bundle; this is a second, source copy
+        add_data.insert(0, 'src')
+
     args = [
         'money_mods.py',
-        '--name=SupermarketMoneyBooster',
-        '--onefile',
+        f'--name={APP_NAME}',
+        '--onefile' if profile['onefile'] else '--onedir',
         '--windowed',
         '--icon=icons/app.ico',
         '--clean',
-        '--noconfirm'
+        '--noconfirm',
+        f'--distpath={Path("dist") / profile_name}',
+        f'--workpath={Path("build") / profile_name}',
     ]
-    
+    if profile['optimize']:
+        args.append(f'--optimize={profile["optimize"]}')
+    if not profile['upx']:
+        args.append('--noupx')
+    for module in profile['excludes']:
+        args.append(f'--exclude-module={module}')
+
     for d in add_data:
-        args.append(f'--add-data={d}')
-        
+        # Optional files (e.g. config.ini) are created on first run if missing
+        if Path(d).exists():
+            target = d if Path(d).is_dir() else '.'
+            args.append(f'--add-data={d}{os.pathsep}{target}')
+    return args
+
+
+def artifact_path(profile_name) -> Path:
+    exe = APP_NAME + ('.exe' if os.name == 'nt' else '')
+    dist = Path('dist') / profile_name
+    return dist / exe if BUILD_PROFILES[profile_name]['onefile'] else dist / APP_NAME / exe
+
+
+def create_setup(profile='onefile'):
+    print(f"Starting build process ({profile} profile)...")
     try:
-        PyInstaller.__main__.run(args)
-        print("Build complete. executable is in dist/ folder.")
+        PyInstaller.__main__.run(build_args(profile))
+        print(f"Build complete. executable is {artifact_path(profile)}")
+        return True
     except Exception as e:
         print(f"Build failed: {e}")
+        return False
+
+
+def benchmark_startup(executable, runs=5, timeout=60):
+    """Launches a built artifact with --profile-startup and measures time to first window.
+
+    The app hard-exits (os._exit, no session save or backup flush) right
+    after its first frame is drawn, so process wall time is time-to-window.
+    The first run is reported separately: it is the closest to a cold start
+    (files not yet in the OS cache, and onefile unpacking).
+    """
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([str(executable), '--profile-startup'], timeout=timeout,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        times.append(time.perf_counter() - started)
+    return {
+        'executable': str(executable),
+        'runs': runs,
+        'first': times[0],
+        'median': statistics.median(times),
+        'min': min(times),
+    }
+
+
+def format_benchmark(profile, result):
+    return (f"{profile:<8} first {result['first'] * 1000:7.0f} ms   "
+            f"median {result['median'] * 1000:7.0f} ms   min {result['min'] * 1000:7.0f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=f"Build {APP_NAME} with PyInstaller")
+    parser.add_argument('--profile', choices=list(BUILD_PROFILES) + ['all'], default='onefile')
+    parser.add_argument('--benchmark', type=int, nargs='?', const=5, default=0, metavar='RUNS',
+                        help="After building, launch each artifact RUNS times and report time-to-window")
+    parser.add_argument('--no-build', action='store_true', help="Only benchmark existing artifacts")
+    args = parser.parse_args(argv)
+
+    profiles = list(BUILD_PROFILES) if args.profile == 'all' else [args.profile]
+    results = []
+    for profile in profiles:
+        if not args.no_build and not create_setup(profile):
+            return 1
+        if args.benchmark:
+            executable = artifact_path(profile)
+            if not executable.exists():
+                print(f"No artifact for {profile}: {executable}")
+                return 1
+            results.append((profile, benchmark_startup(executable, args.benchmark)))
+
+    if results:
+        print("Time to first window:")
+        for profile, result in results:
+            print("  " + format_benchmark(profile, result))
+    return 0
 
 if __name__ == "__main__":
-    create_setup()
+    sys.exit(main())
@@ -1,8 +1,15 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
+from .result_view import SaveResultModel, VirtualSaveTree, SAVE_TYPES
+
+TYPE_FILTERS = ["All"] + [label for _, label in SAVE_TYPES]
+MONEY_FILTERS = {"Any money": None, "Money known": 'known', "Money unknown": 'unknown'}
+AGE_FILTERS = {"Any date": None, "Last 24h": 1, "Last 7 days": 7, "Last 30 days": 30}
+PROGRESS_REFRESH_MS = 100
 
 class SaveDetectionGUI:
     def __init__(self, parent_frame, scanner, manager, on_save_selected=None):
@@ -10,9 +17,13 @@ class SaveDetectionGUI:
         self.scanner = scanner
         self.manager = manager
         self.on_save_selected = on_save_selected
+        # One thread reads save contents for the list; _loading holds paths queued on it
+        self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="SaveContent")
+        self._loading = set()
         
         self.setup_ui()
         self.scanning = False
+        self._status = ("Ready to scan...", 0)
     
     def setup_ui(self):
         detection_frame = ttk.LabelFrame(self.parent, text="Save Detection", padding="10")
@@ -24,6 +35,8 @@ class SaveDetectionGUI:
         
         ttk.Button(button_frame, text="🔍 Full Scan", 
                   command=self.start_system_scan).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="🔄 Refresh", 
+                  command=self.start_refresh).pack(side="left", padx=5)
         
         # Progress
         self.progress_var = tk.DoubleVar()
@@ -35,23 +48,25 @@ class SaveDetectionGUI:
         self.status_label = ttk.Label(detection_frame, text="Ready to scan...")
         self.status_label.pack()
         
-        # Save List
+        # Filters (applied in the model, not the widget)
+        filter_frame = ttk.Frame(detection_frame)
+        filter_frame.pack(fill="x")
+        self.type_filter = ttk.Combobox(filter_frame, values=TYPE_FILTERS, state="readonly", width=12)
+        self.money_filter = ttk.Combobox(filter_frame, values=list(MONEY_FILTERS), state="readonly", width=14)
+        self.age_filter = ttk.Combobox(filter_frame, values=list(AGE_FILTERS), state="readonly", width=12)
+        for box in (self.type_filter, self.money_filter, self.age_filter):
+            box.current(0)
+            box.bind("<<ComboboxSelected>>", lambda e: self._apply_filters())
+            box.pack(side="left", padx=2)
+        self.count_label = ttk.Label(filter_frame, text="")
+        self.count_label.pack(side="right")
+        
+        # Save List (virtualized: only the visible rows exist in the Treeview)
         list_frame = ttk.Frame(detection_frame)
         list_frame.pack(fill="both", expand=True, pady=10)
         
-        columns = ("Status", "Name", "Path", "Modified", "Money")
-        self.save_tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=8)
-        
-        for col in columns:
-            self.save_tree.heading(col, text=col)
-            self.save_tree.column(col, width=100 if col != "Path" else 250)
-            
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", 
-                                 command=self.save_tree.yview)
-        self.save_tree.configure(yscrollcommand=scrollbar.set)
-        
-        self.save_tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        self.results = SaveResultModel()
+        self.save_tree = VirtualSaveTree(list_frame, self.results, height=8, load_contents=self._load_contents)
         
         # Bind double-click
         self.save_tree.bind("<Double-1>", lambda e: self.modify_selected())
@@ -69,18 +84,40 @@ class SaveDetectionGUI:
     def start_system_scan(self):
         if not self.scanning:
             self.scanning = True
+            self.update_status("Scanning system...", 0)
             thread = threading.Thread(target=self._system_scan_thread)
             thread.daemon = True
             thread.start()
+            self._refresh_progress()
+    
+    def start_refresh(self):
+        """Re-checks the folders of the last scan; only changed files are re-analyzed."""
+        if not self.manager.save_dirs:
+            self.start_system_scan()
+            return
+        if not self.scanning:
+            self.scanning = True
+            self.update_status("Refreshing...", 0)
+            thread = threading.Thread(target=self._refresh_thread)
+            thread.daemon = True
+            thread.start()
+            self._refresh_progress()
+    
+    def _refresh_thread(self):
+        try:
+            changed = self.manager.refresh_saves()
+            self.parent.after(0, self._display_results, self.manager.current_saves())
+            self.update_status(f"{len(changed)} saves changed", 100)
+        except Exception as e:
+            self.update_status("Refresh Failed", 0)
+            print(f"Refresh error: {e}")
+        finally:
+            self.scanning = False
     
     def _system_scan_thread(self):
-        self.update_status("Scanning system...", 10)
-        
         try:
-            self.update_status("Detecting game installation...", 30)
-            # Find and classify implicitly runs detection
+            # Find and classify implicitly runs detection; progress comes from scanner.progress
             all_saves = self.manager.find_and_classify_all_saves()
-            self.update_status("Finalizing results...", 90)
             
             self.parent.after(0, self._display_results, all_saves)
             
@@ -99,49 +136,67 @@ class SaveDetectionGUI:
         finally:
             self.scanning = False
             
+    def _load_contents(self, saves, on_done):
+        """Reads the content (money) of saves on the loader thread, then calls on_done on the Tk thread."""
+        saves = [save for save in saves if save.path not in self._loading]
+        if not saves:
+            return
+        self._loading.update(save.path for save in saves)
+        
+        def finish():
+            self._loading.difference_update(save.path for save in saves)
+            on_done()
+        
+        def work():
+            for save in saves:
+                save.analyze()
+            self.parent.after(0, finish)
+        
+        self._loader.submit(work)
+    
     def update_status(self, text, progress):
-        self.parent.after(0, lambda: self.status_label.config(text=text))
-        self.parent.after(0, lambda: self.progress_var.set(progress))
+        """Sets the final status; shown by the next progress refresh, never queued per call."""
+        self._status = (text, progress)
+    
+    def _refresh_progress(self):
+        """Samples scanner progress at a fixed rate so a busy scan cannot flood the Tk queue."""
+        if self.scanning:
+            self.status_label.config(text=self._format_progress(self.scanner.progress.snapshot()))
+            self.progress_var.set(self.scanner.progress.percent())
+            self.parent.after(PROGRESS_REFRESH_MS, self._refresh_progress)
+        else:
+            text, progress = self._status
+            self.status_label.config(text=text)
+            self.progress_var.set(progress)
+    
+    def _format_progress(self, p):
+        text = (f"{p['phase']}: {p['dirs_visited']} dirs, "
+                f"{p['files_analyzed']}/{p['files_matched']} files")
+        if p['eta'] is not None:
+            text += f", ETA {p['eta']:.0f}s"
+        return text
     
     def _display_results(self, all_saves):
-        # Clear
-        for item in self.save_tree.get_children():
-            self.save_tree.delete(item)
-        
-        if all_saves['primary']:
-            self._add_save_to_tree(all_saves['primary'], "⭐ Primary")
-        
-        for save in all_saves['slots']:
-            if save != all_saves['primary']:
-                self._add_save_to_tree(save, "📁 Slot")
-                
-        for backup in all_saves['backups'][:10]: # Show more backups
-            self._add_save_to_tree(backup, "💾 Backup")
-            
-    def _add_save_to_tree(self, save_info, status):
-        money = save_info.get('money_amount')
-        money_str = f"{money:,.2f}$" if money is not None else "Unknown"
-        
-        modified = save_info.get('modified', datetime.now())
-        modified_str = modified.strftime("%Y-%m-%d %H:%M")
-        
-        self.save_tree.insert("", "end", values=(
-            status,
-            save_info['filename'],
-            save_info['path'],
-            modified_str,
-            money_str
-        ))
+        self.results.set_results(all_saves)
+        self._update_view()
+    
+    def _apply_filters(self):
+        type_index = self.type_filter.current()
+        self.results.set_filter(
+            type_filter=type_index - 1 if type_index > 0 else None,
+            money_filter=MONEY_FILTERS[self.money_filter.get()],
+            max_age_days=AGE_FILTERS[self.age_filter.get()])
+        self._update_view()
+    
+    def _update_view(self):
+        self.save_tree.reload()
+        self.count_label.config(text=f"{len(self.results)} / {len(self.results.rows)}")
         
     def modify_selected(self):
-        selected = self.save_tree.selection()
-        if not selected:
+        path = self.save_tree.selected_path()
+        if not path:
             return
         
-        # Get path from item
-        item = self.save_tree.item(selected[0])
-        path = item['values'][2]
-        
         if self.on_save_selected:
             self.on_save_selected(path)
         else:
@@ -149,7 +204,6 @@ class SaveDetectionGUI:
         # In full integration, we would pass this back to main app
         
     def show_info(self):
-        selected = self.save_tree.selection()
-        if selected:
-            item = self.save_tree.item(selected[0])
-            messagebox.showinfo("Info", str(item['values']))
+        position = self.save_tree.selected_position()
+        if position is not None:
+            messagebox.showinfo("Info", str(list(self.results.display_row(position))))
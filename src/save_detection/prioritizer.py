@@ -1,53 +1,215 @@
+import heapq
+import time
+from array import array
 from datetime import datetime
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
+
+from .save_record import known_money
+
+FILE_TYPE_BONUS = {
+    'json': 20,
+    'binary': 10,
+    'unknown': 0
+}
+
+# Checked in order, first match wins
+LOCATION_BONUS = {
+    'appdata': 15,
+    'local': 12,
+    'documents': 10,
+    'steam': 8,
+    'gamefolder': 5
+}
+
+_TYPE_CODES = {name: code for code, name in enumerate(FILE_TYPE_BONUS)}
+_TYPE_BONUS_BY_CODE = list(FILE_TYPE_BONUS.values())
+_LOCATION_BONUS_BY_CODE = list(LOCATION_BONUS.values()) + [0]
+_NO_LOCATION = len(LOCATION_BONUS)
+# mtime sentinel for saves without a modification time: always scores 0 recency
+_NO_MTIME = -1e18
+
+
+class SaveColumns:
+    """Columnar view of a save list: one compact array per scoring input.
+
+    static_bonus holds the time-independent part of the score (type,
+    location, size and money bonuses) so scoring only has to add recency.
+    """
+
+    __slots__ = ('mtime', 'size', 'type_code', 'location_code', 'has_money', 'static_bonus')
+
+    def __init__(self, save_list: List[Dict]):
+        unknown = _TYPE_CODES['unknown']
+        self.mtime = array('d', [_save_mtime(s) for s in save_list])
+        self.size = array('q', [s.get('size', 0) or 0 for s in save_list])
+        self.type_code = array('b', [_TYPE_CODES.get(s.get('file_type', 'unknown'), unknown) for s in save_list])
+        self.location_code = array('b', [_location_code(s.get('path', '')) for s in save_list])
+        self.has_money = array('b', [known_money(s) is not None for s in save_list])
+
+        type_bonus = _TYPE_BONUS_BY_CODE
+        location_bonus = _LOCATION_BONUS_BY_CODE
+        self.static_bonus = array('d', [
+            # Size window adjusted slightly for typical larger JSONs
+            type_bonus[t] + location_bonus[l] + (10 if 5000 < size < 1000000 else 0) + (15 if money else 0)
+            for t, l, size, money in zip(self.type_code, self.location_code, self.size, self.has_money)
+        ])
+
+    def __len__(self):
+        return len(self.mtime)
+
 
 class SavePrioritizer:
     @staticmethod
     def prioritize_saves(save_list: List[Dict]) -> List[Dict]:
         """Sorts saves by priority"""
-        return sorted(save_list, 
-                      key=lambda x: SavePrioritizer._calculate_priority(x),
-                      reverse=True)
-    
+        scores = SavePrioritizer.score_batch(SaveColumns(save_list))
+        order = sorted(range(len(save_list)), key=scores.__getitem__, reverse=True)
+        return [save_list[i] for i in order]
+
+    @staticmethod
+    def top_k(save_list: List[Dict], k: int, now: Optional[float] = None) -> List[Dict]:
+        """Returns the k highest-priority saves, best first, without sorting the whole list."""
+        scores = SavePrioritizer.score_batch(SaveColumns(save_list), now)
+        best = heapq.nlargest(k, range(len(save_list)), key=scores.__getitem__)
+        return [save_list[i] for i in best]
+
+    @staticmethod
+    def score_batch(columns: SaveColumns, now: Optional[float] = None) -> array:
+        """Scores every save in one pass against a single reference time (0-100 each)."""
+        now = time.time() if now is None else now
+        return array('d', [
+            min(100.0, 50.0 + bonus + max(0.0, 30.0 - (now - mtime) // 86400))
+            for mtime, bonus in zip(columns.mtime, columns.static_bonus)
+        ])
+
     @staticmethod
     def _calculate_priority(save_info: Dict) -> float:
         """Calculates save priority (0-100)"""
-        priority = 50.0
-        
-        if 'modified' in save_info:
-            try:
-                days_old = (datetime.now() - save_info['modified']).days
-                recency_score = max(0, 30 - days_old) / 30 * 30
-                priority += recency_score
-            except:
-                pass
-        
-        file_type_bonus = {
-            'json': 20,
-            'binary': 10,
-            'unknown': 0
-        }
-        priority += file_type_bonus.get(save_info.get('file_type', 'unknown'), 0)
-        
-        path = save_info.get('path', '').lower()
-        location_bonus = {
-            'appdata': 15,
-            'local': 12,
-            'documents': 10,
-            'steam': 8,
-            'gamefolder': 5
-        }
-        
-        for loc, bonus in location_bonus.items():
-            if loc in path:
-                priority += bonus
+        return SavePrioritizer.score_batch(SaveColumns([save_info]))[0]
+
+
+def _save_mtime(save) -> float:
+    mtime_ns = getattr(save, 'mtime_ns', None)  # SaveRecord: no datetime round trip
+    if mtime_ns is not None:
+        return mtime_ns / 1e9
+    return _to_timestamp(save.get('modified'))
+
+
+def _to_timestamp(modified) -> float:
+    if isinstance(modified, datetime):
+        return modified.timestamp()
+    if isinstance(modified, (int, float)):
+        return float(modified)
+    return _NO_MTIME
+
+
+def _location_code(path) -> int:
+    path = str(path).lower()
+    for code, loc in enumerate(LOCATION_BONUS):
+        if loc in path:
+            return code
+    return _NO_LOCATION
+
+
+class SavePriorityQueue:
+    """Indexed max-heap of save records keyed by path.
+
+    push/remove/update of a single save cost O(log n) and peek() is O(1), so
+    one autosave or one new backup does not require re-sorting every save.
+    `priority` maps a save dict to its score (default: SavePrioritizer score;
+    since that includes recency, call rebuild() occasionally to refresh ages).
+    """
+
+    def __init__(self, priority: Optional[Callable[[Dict], float]] = None):
+        self.priority = priority or SavePrioritizer._calculate_priority
+        self._heap = []   # [score, path, save_info]
+        self._pos = {}    # path -> index in _heap
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, path):
+        return str(path) in self._pos
+
+    def rebuild(self, save_list: List[Dict]):
+        """Replaces the contents in O(n)."""
+        self._heap = [[self.priority(s), str(s['path']), s] for s in save_list]
+        self._heap.sort(key=lambda entry: -entry[0])  # a sorted list is a valid max-heap
+        self._pos = {entry[1]: i for i, entry in enumerate(self._heap)}
+
+    def push(self, save_info: Dict):
+        """Inserts a save, or updates it if its path is already queued."""
+        path = str(save_info['path'])
+        score = self.priority(save_info)
+        i = self._pos.get(path)
+        if i is None:
+            self._heap.append([score, path, save_info])
+            self._pos[path] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+            return
+        old_score = self._heap[i][0]
+        self._heap[i][0] = score
+        self._heap[i][2] = save_info
+        if score > old_score:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def remove(self, path) -> Optional[Dict]:
+        i = self._pos.pop(str(path), None)
+        if i is None:
+            return None
+        removed = self._heap[i]
+        last = self._heap.pop()
+        if i < len(self._heap):
+            self._heap[i] = last
+            self._pos[last[1]] = i
+            self._sift_up(i)
+            self._sift_down(self._pos[last[1]])
+        return removed[2]
+
+    def peek(self) -> Optional[Dict]:
+        """Highest-priority save, or None."""
+        return self._heap[0][2] if self._heap else None
+
+    def top(self, n: int) -> List[Dict]:
+        """The n best saves, best first, in O(n log n) without touching the rest."""
+        result = []
+        if not self._heap:
+            return result
+        frontier = [(-self._heap[0][0], 0)]
+        while frontier and len(result) < n:
+            _, i = heapq.heappop(frontier)
+            result.append(self._heap[i][2])
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(self._heap):
+                    heapq.heappush(frontier, (-self._heap[child][0], child))
+        return result
+
+    def _swap(self, i, j):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._pos[heap[i][1]] = i
+        self._pos[heap[j][1]] = j
+
+    def _sift_up(self, i):
+        heap = self._heap
+        while i > 0:
+            parent = (i - 1) // 2
+            if heap[i][0] <= heap[parent][0]:
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i):
+        heap = self._heap
+        size = len(heap)
+        while True:
+            largest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < size and heap[child][0] > heap[largest][0]:
+                    largest = child
+            if largest == i:
                 break
-        
-        size = save_info.get('size', 0)
-        if 5000 < size < 1000000: # Adjusted slightly for typical larger JSONs
-            priority += 10
-        
-        if save_info.get('money_amount') is not None:
-            priority += 15
-        
-        return min(100, priority)
+            self._swap(i, largest)
+            i = largest
@@ -0,0 +1,273 @@
+import time
+from tkinter import ttk
+from array import array
+from datetime import datetime
+from typing import Dict, Optional
+
+from .save_record import known_money
+
+# (key in find_and_classify_all_saves result, status label); also the sort order of the Status column
+SAVE_TYPES = [
+    ('primary', "⭐ Primary"),
+    ('slots', "📁 Slot"),
+    ('cloud', "☁ Cloud"),
+    ('backups', "💾 Backup"),
+    ('old_versions', "📄 Old"),
+]
+COLUMNS = ("Status", "Name", "Path", "Modified", "Money")
+
+# Row tuple layout in SaveResultModel; the last item is the save itself. Its money
+# counts as unknown until the record is analyzed, which VirtualSaveTree requests
+# off the Tk thread for the rows on screen (every row when money is sorted/filtered on)
+_TYPE, _NAME, _PATH, _MTIME, _SAVE = range(5)
+_MONEY_COLUMN = COLUMNS.index("Money")
+
+
+class SaveResultModel:
+    """Full scan result as compact row tuples, with filtering and sorting done here, not in Tk.
+
+    `view` holds the indices of the rows that pass the filter, in sort order.
+    """
+
+    def __init__(self):
+        self.rows = []
+        self.view = array('l')
+        # Status order puts the primary save first, like the unsorted list used to
+        self.sort_column = "Status"
+        self.sort_reverse = False
+        self.type_filter = None       # index into SAVE_TYPES or None
+        self.money_filter = None      # 'known', 'unknown' or None
+        self.max_age_days = None
+
+    def __len__(self):
+        return len(self.view)
+
+    def set_results(self, all_saves: Dict):
+        rows = []
+        seen = set()
+        for type_code, (key, _) in enumerate(SAVE_TYPES):
+            saves = all_saves.get(key) or []
+            if not isinstance(saves, list):  # the primary is a single save
+                saves = [saves]
+            for save in saves:
+                if save['path'] in seen:
+                    continue
+                seen.add(save['path'])
+                rows.append((type_code, save['filename'], save['path'], _save_timestamp(save), save))
+        self.rows = rows
+        self.refresh()
+
+    def set_filter(self, type_filter=None, money_filter=None, max_age_days=None):
+        self.type_filter = type_filter
+        self.money_filter = money_filter
+        self.max_age_days = max_age_days
+        self.refresh()
+
+    def sort_by(self, column: str, reverse: Optional[bool] = None):
+        """Sorts by column; repeating the same column flips the direction."""
+        if reverse is None:
+            reverse = not self.sort_reverse if column == self.sort_column else column in ("Modified", "Money")
+        self.sort_column = column
+        self.sort_reverse = reverse
+        self.refresh()
+
+    def refresh(self):
+        rows = self.rows
+        indices = range(len(rows))
+        if self.type_filter is not None:
+            indices = [i for i in indices if rows[i][_TYPE] == self.type_filter]
+        if self.money_filter == 'known':
+            indices = [i for i in indices if _money(rows[i]) is not None]
+        elif self.money_filter == 'unknown':
+            indices = [i for i in indices if _money(rows[i]) is None]
+        if self.max_age_days is not None:
+            cutoff = time.time() - self.max_age_days * 86400
+            indices = [i for i in indices if rows[i][_MTIME] >= cutoff]
+
+        column = COLUMNS.index(self.sort_column)
+        if column == _MONEY_COLUMN:
+            # Unknown money always sorts last
+            missing = float('-inf') if self.sort_reverse else float('inf')
+
+            def key(i):
+                money = _money(rows[i])
+                return missing if money is None else money
+        elif column in (_NAME, _PATH):
+            key = lambda i: rows[i][column].lower()
+        else:
+            key = lambda i: rows[i][column]
+        self.view = array('l', sorted(indices, key=key, reverse=self.sort_reverse))
+
+    def money_ordered(self) -> bool:
+        """Whether the view depends on the money of every row, not just the visible ones."""
+        return self.sort_column == "Money" or self.money_filter is not None
+
+    def unanalyzed(self, positions=None) -> list:
+        """Saves not read yet, at the given view positions or in all rows."""
+        rows = self.rows
+        saves = (rows[i][_SAVE] for i in self.view[positions]) if positions else (row[_SAVE] for row in rows)
+        return [save for save in saves if not getattr(save, 'is_analyzed', True)]
+
+    def path_at(self, position: int) -> str:
+        return self.rows[self.view[position]][_PATH]
+
+    def display_row(self, position: int) -> tuple:
+        """Formatted values for one visible row; only called for rows on screen."""
+        type_code, name, path, mtime, save = self.rows[self.view[position]]
+        money = known_money(save)
+        money_str = f"{money:,.2f}$" if money is not None else "Unknown"
+        modified_str = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M") if mtime > 0 else ""
+        return (SAVE_TYPES[type_code][1], name, path, modified_str, money_str)
+
+
+class VirtualSaveTree:
+    """Treeview that only ever holds one screenful of items.
+
+    The items are created once and re-labelled when scrolling, so showing
+    thousands of results costs the same as showing a dozen.
+    """
+
+    def __init__(self, parent, model: SaveResultModel, height=8, load_contents=None):
+        self.model = model
+        self.height = height
+        self.offset = 0
+        # load_contents(saves, on_done) analyzes saves off the Tk thread, then calls on_done on it
+        self.load_contents = load_contents
+
+        self.tree = ttk.Treeview(parent, columns=COLUMNS, show="headings", height=height, selectmode="browse")
+        for col in COLUMNS:
+            self.tree.heading(col, text=col, command=lambda c=col: self.sort_by(c))
+            self.tree.column(col, width=100 if col != "Path" else 250)
+
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self._on_scrollbar)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self._items = []
+        self._selected = None  # model position of the selected row
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+
+    def bind(self, sequence, func):
+        self.tree.bind(sequence, func)
+
+    def reload(self):
+        self.offset = 0
+        self._selected = None
+        self.render()
+
+    def sort_by(self, column):
+        self.model.sort_by(column)
+        for col in COLUMNS:
+            arrow = (" ▼" if self.model.sort_reverse else " ▲") if col == self.model.sort_column else ""
+            self.tree.heading(col, text=col + arrow)
+        self.reload()
+
+    def scroll(self, rows):
+        self._set_offset(self.offset + rows)
+        return "break"
+
+    def selected_position(self) -> Optional[int]:
+        """Model position of the selected row, or None."""
+        if self._selected is None or self._selected >= len(self.model):
+            return None
+        return self._selected
+
+    def selected_path(self) -> Optional[str]:
+        position = self.selected_position()
+        return None if position is None else self.model.path_at(position)
+
+    def render(self):
+        visible = min(self.height, len(self.model) - self.offset)
+        # Create the fixed set of items lazily, in one batch
+        while len(self._items) < self.height:
+            self._items.append(self.tree.insert("", "end", values=("",) * len(COLUMNS)))
+
+        for slot, iid in enumerate(self._items):
+            if slot < visible:
+                self.tree.item(iid, values=self.model.display_row(self.offset + slot))
+                self.tree.move(iid, "", slot)  # re-attaches rows detached by a shorter view
+            else:
+                self.tree.detach(iid)
+
+        selected_slot = None if self._selected is None else self._selected - self.offset
+        if selected_slot is not None and 0 <= selected_slot < visible:
+            self.tree.selection_set(self._items[selected_slot])
+        else:
+            self.tree.selection_set(())
+
+        total = len(self.model)
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + visible) / total)
+        else:
+            self.scrollbar.set(0, 1)
+        self._request_contents(visible)
+
+    def refresh(self):
+        """Re-sorts/filters in place, keeping the scroll position where possible."""
+        self.model.refresh()
+        self.offset = max(0, min(self.offset, len(self.model) - self.height))
+        self.render()
+
+    def _request_contents(self, visible):
+        if self.load_contents is None:
+            return
+        if self.model.money_ordered():
+            missing, on_done = self.model.unanalyzed(), self.refresh
+        else:
+            missing, on_done = self.model.unanalyzed(slice(self.offset, self.offset + visible)), self.render
+        if missing:
+            self.load_contents(missing, on_done)
+
+    def _set_offset(self, offset):
+        offset = max(0, min(offset, len(self.model) - self.height))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self._set_offset(int(float(value) * len(self.model)))
+        elif action == "scroll":
+            step = self.height if unit == "pages" else 1
+            self._set_offset(self.offset + int(value) * step)
+
+    def _on_select(self, event=None):
+        selection = self.tree.selection()
+        if selection and selection[0] in self._items:
+            self._selected = self.offset + self._items.index(selection[0])
+
+    def _move_selection(self, delta):
+        if not len(self.model):
+            return "break"
+        current = self._selected if self._selected is not None else self.offset - delta
+        self._selected = max(0, min(len(self.model) - 1, current + delta))
+        if self._selected < self.offset:
+            self.offset = self._selected
+        elif self._selected >= self.offset + self.height:
+            self.offset = self._selected - self.height + 1
+        self.render()
+        return "break"
+
+
+def _money(row):
+    return known_money(row[_SAVE])
+
+
+def _save_timestamp(save) -> float:
+    mtime_ns = getattr(save, 'mtime_ns', None)
+    if mtime_ns is not None:
+        return mtime_ns / 1e9
+    return _timestamp(save.get('modified'))
+
+
+def _timestamp(modified) -> float:
+    if isinstance(modified, datetime):
+        return modified.timestamp()
+    if isinstance(modified, (int, float)):
+        return float(modified)
+    return 0.0
@@ -1,12 +1,75 @@
 import os
+import shutil
 import hashlib
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 from pathlib import Path
 
+from src.tracing import traced
+
+# post_modification_verify message for an intact save identical to its backup
+UNCHANGED_WARNING = "Save is unchanged: it is byte-identical to its backup"
+
+
+class SafetyContext:
+    """Opens the save once and captures a single fstat shared by every check."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.file = None
+        self.stat = None
+        self.writable = False
+        self.error = None
+
+    def __enter__(self):
+        try:
+            # Read-only: a write-mode open fails on Windows while the game has the save open
+            self.file = open(self.path, 'rb')
+        except OSError as e:
+            self.error = e
+
+        if self.file is not None:
+            self.stat = os.fstat(self.file.fileno())
+            # Permission bits / the read-only attribute; the save is replaced, not written in place
+            self.writable = os.access(self.path, os.W_OK)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        return False
+
+
+class WriteResult:
+    """Size and hash of bytes as they were written to disk."""
+
+    def __init__(self, size: int, sha256: str):
+        self.size = size
+        self.sha256 = sha256
+
+
+class HashingWriter:
+    """Wraps a binary file and hashes data on its way to disk."""
+
+    def __init__(self, f):
+        self._f = f
+        self._digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self._digest.update(data)
+        self.size += len(data)
+        return self._f.write(data)
+
+    def result(self) -> WriteResult:
+        return WriteResult(self.size, self._digest.hexdigest())
+
+
 class SafetySystem:
     def __init__(self):
         self.max_backups = 10
-    
+
+    @traced
     def pre_modification_check(self, save_info: Dict) -> Tuple[bool, str]:
         """Runs safety checks before modification"""
         checks = [
@@ -17,38 +80,68 @@ class SafetySystem:
             ("Backup possible", self._check_backup_possible),
             ("Permissions sufficient", self._check_permissions),
         ]
-        
-        for check_name, check_func in checks:
-            success, message = check_func(save_info)
-            if not success:
-                return False, f"{check_name} failed: {message}"
-        
+
+        with SafetyContext(save_info['path']) as ctx:
+            for check_name, check_func in checks:
+                success, message = check_func(save_info, ctx)
+                if not success:
+                    return False, f"{check_name} failed: {message}"
+
         return True, "All safety checks passed"
-    
-    def post_modification_verify(self, original_path: str, backup_path: str) -> Tuple[bool, str]:
-        """Verifies modification success"""
+
+    @traced
+    def write_verified(self, path, content) -> WriteResult:
+        """Writes content and returns its size/sha256, computed during the write.
+
+        Text is encoded like a text-mode file would (UTF-8, platform newlines).
+        """
+        if isinstance(content, str):
+            if os.linesep != "\n":
+                content = content.replace("\n", os.linesep)
+            content = content.encode('utf-8')
+        with open(path, 'wb') as f:
+            writer = HashingWriter(f)
+            writer.write(content)
+        return writer.result()
+
+    @traced
+    def post_modification_verify(self, original_path: str, backup_path: str,
+                                 written: Optional[WriteResult] = None,
+                                 backup_hash: Optional[str] = None) -> Tuple[bool, str]:
+        """Verifies modification success.
+
+        With `written` (from write_verified) and `backup_hash` (from the backup
+        index) no file is re-read; only the original is stat'ed once.
+        """
         try:
             if not os.path.exists(backup_path):
                 return False, "Backup was not created"
-            
-            if not os.path.exists(original_path):
+
+            try:
+                orig_size = os.stat(original_path).st_size
+            except FileNotFoundError:
                 return False, "Original file disappeared"
-            
-            orig_size = os.path.getsize(original_path)
-            backup_size = os.path.getsize(backup_path)
-            
+
             if orig_size == 0:
                 return False, "File is empty after modification"
-            
-            # Check if file changed (md5 check)
-            if self._calculate_checksum(original_path) == self._calculate_checksum(backup_path):
-                # NOTE: This might return False if we modified a value to be exactly what it was, 
-                # or if modification failed silently. For now, we assume we wanted a change.
-                # However, usually we want to confirm it IS modified.
-                pass 
-            
+
+            if written is not None:
+                if orig_size != written.size:
+                    return False, "File size does not match written data"
+                new_hash = written.sha256
+            else:
+                new_hash = self._calculate_checksum(original_path)
+
+            if backup_hash is None and written is None:
+                backup_hash = self._calculate_checksum(backup_path)
+
+            if new_hash == backup_hash:
+                # The save is intact, but the edit changed nothing: the new value
+                # equals the old one, or the edit did not take
+                return True, UNCHANGED_WARNING
+
             return True, "Modification verified successfully"
-            
+
         except Exception as e:
             return False, f"Verification error: {str(e)}"
 
@@ -57,7 +150,7 @@ class SafetySystem:
         backup_folder = Path(os.environ.get('USERPROFILE', '')) / "SupermarketSaveBackups"
         if backup_folder.exists():
             backups = sorted(backup_folder.glob("*_backup_*"), key=os.path.getmtime)
-            
+
             if len(backups) > self.max_backups:
                 for old_backup in backups[:-self.max_backups]:
                     try:
@@ -65,18 +158,17 @@ class SafetySystem:
                     except:
                         pass
 
-    def _check_file_exists(self, save_info):
-        return os.path.exists(save_info['path']), "File exists"
+    def _check_file_exists(self, save_info, ctx: SafetyContext):
+        if ctx.stat is None and isinstance(ctx.error, FileNotFoundError):
+            return False, "File not found"
+        return True, "File exists"
 
-    def _check_file_access(self, save_info):
-        try:
-            with open(save_info['path'], 'rb') as f:
-                pass
-            return True, "File is readable"
-        except Exception as e:
-            return False, str(e)
+    def _check_file_access(self, save_info, ctx: SafetyContext):
+        if ctx.file is None:
+            return False, str(ctx.error)
+        return True, "File is readable"
 
-    def _check_not_system_folder(self, save_info):
+    def _check_not_system_folder(self, save_info, ctx: SafetyContext):
         path = str(save_info['path']).lower()
         if "windows\\system32" in path or "program files" in path:
             # We allow Program Files if it's Steam library, but generally careful.
@@ -84,18 +176,26 @@ class SafetySystem:
             pass
         return True, "Safe location"
 
-    def _validate_structure(self, save_info):
+    def _validate_structure(self, save_info, ctx: SafetyContext):
         if save_info.get('is_valid'):
             return True, "Structure valid"
         return False, "Invalid structure"
 
-    def _check_backup_possible(self, save_info):
-        # Could check disk space here
+    def _check_backup_possible(self, save_info, ctx: SafetyContext):
+        try:
+            free = shutil.disk_usage(os.path.dirname(ctx.path) or '.').free
+        except OSError:
+            return True, "Backup feasible"
+        if ctx.stat is not None and free < ctx.stat.st_size * 2:
+            return False, "Not enough disk space for backup"
         return True, "Backup feasible"
 
-    def _check_permissions(self, save_info):
-        return os.access(save_info['path'], os.W_OK), "Write permission granted"
+    def _check_permissions(self, save_info, ctx: SafetyContext):
+        return ctx.writable, "Write permission granted" if ctx.writable else "File is read-only"
 
     def _calculate_checksum(self, file_path: str) -> str:
+        digest = hashlib.sha256()
         with open(file_path, 'rb') as f:
-             return hashlib.md5(f.read()).hexdigest()
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
@@ -1,22 +1,63 @@
 from pathlib import Path
 from datetime import datetime
 import json
-import shutil
 import os
+import time
+from contextlib import ExitStack
 from typing import Dict, List
+from src.save_editor.backup_worker import get_backup_worker
+from src.save_editor.file_lock import get_lock_manager, ConcurrentWriteError, SaveGuard, file_snapshot
+from src.save_editor.binary_save import BinarySave, is_binary_save
+from src.tracing import traced
+from .safety_system import SafetySystem, UNCHANGED_WARNING
+from .transaction import SaveTransaction, PartialCommitError, recover_transactions
+from .prioritizer import SavePriorityQueue
+from .save_record import SaveClass
+
+MONEY_KEYWORDS = ['money', 'cash', 'balance', 'wallet', 'currency', 'funds', 'gold', 'currentmoney']
+
+# Save types the primary save is picked from when no explicit primary exists
+PRIMARY_CANDIDATE_TYPES = (SaveClass.SLOT, SaveClass.CLOUD)
 
 class MultiSaveManager:
     def __init__(self, scanner):
         self.scanner = scanner
         self.backup_folder = Path(os.environ.get('USERPROFILE', '')) / "SupermarketSaveBackups"
         self.backup_folder.mkdir(exist_ok=True)
+        self.backup_worker = get_backup_worker()
+        self.safety = SafetySystem()
+        self.lock_manager = get_lock_manager()
+        
+        # path -> SaveRecord (with its classification) from the last scan, kept current by update_save
+        self._classified = {}
+        self.primary_candidates = SavePriorityQueue(priority=lambda s: s.mtime_ns)
+        # Save folders found by the last full scan, re-checked by refresh_saves
+        self.save_dirs = []
+        
+        # Finish or undo any multi-save commit interrupted by a crash
+        self.journal_dir = self.backup_folder / "transactions"
+        recovered = recover_transactions(self.journal_dir)
+        if any(recovered.values()):
+            print(f"Recovered interrupted save transactions: {recovered}")
     
+    @traced
     def find_and_classify_all_saves(self) -> Dict:
         """Finds and classifies all saves in system"""
         # Re-run detection to populate scanner.found_saves and locations
         self.scanner.found_saves = [] # Clear previous results
-        self.scanner.detect_game_installation()
+        self.save_dirs = self.scanner.detect_game_installation()['saves']
+        
+        self._classified = {}
+        for save_info in self.scanner.found_saves:
+            save_info.classification = self._classify_save(save_info)
+            self._classified[save_info.path] = save_info
+        self.primary_candidates.rebuild(
+            [info for info in self._classified.values() if info.classification in PRIMARY_CANDIDATE_TYPES])
         
+        return self.current_saves()
+    
+    def current_saves(self) -> Dict:
+        """Classification of the known saves, without rescanning"""
         all_saves = {
             'primary': None,
             'slots': [],
@@ -25,42 +66,95 @@ class MultiSaveManager:
             'old_versions': [] 
         }
         
-        for save_info in self.scanner.found_saves:
-            save_type = self._classify_save(save_info)
-            
-            if save_type == 'primary':
+        for save_info in self._classified.values():
+            save_type = save_info.classification
+            if save_type is SaveClass.PRIMARY:
                 all_saves['primary'] = save_info
-            elif save_type == 'slot':
+            elif save_type is SaveClass.SLOT:
                 all_saves['slots'].append(save_info)
-            elif save_type == 'backup':
+            elif save_type is SaveClass.BACKUP:
                 all_saves['backups'].append(save_info)
-            elif save_type == 'cloud':
+            elif save_type is SaveClass.CLOUD:
                 all_saves['cloud'].append(save_info)
             else:
                 all_saves['old_versions'].append(save_info)
         
         # If no primary found, pick latest from slots or cloud
         if not all_saves['primary']:
-            candidates = all_saves['slots'] + all_saves['cloud']
-            if candidates:
-                all_saves['primary'] = max(candidates, key=lambda x: x['modified'])
+            all_saves['primary'] = self.primary_candidates.peek()
         
         return all_saves
+    
+    def primary_save(self):
+        """Latest slot or cloud save, O(1)"""
+        return self.primary_candidates.peek()
+    
+    def top_saves(self, n: int) -> List[Dict]:
+        """The n most recent slot or cloud saves"""
+        return self.primary_candidates.top(n)
+    
+    def update_save(self, file_path):
+        """Re-analyzes one changed or new save file and updates its entry in O(log n).
+        
+        Returns the new save info, or None if the file is gone or unreadable.
+        """
+        save_info = self.scanner._analyze_save_file(Path(file_path)) if Path(file_path).exists() else None
+        if save_info is None:
+            self.remove_save(file_path)
+            return None
+        
+        save_info.classification = self._classify_save(save_info)
+        self._classified[save_info.path] = save_info
+        if save_info.classification in PRIMARY_CANDIDATE_TYPES:
+            self.primary_candidates.push(save_info)
+        else:
+            self.primary_candidates.remove(save_info.path)
+        return save_info
+    
+    @traced
+    def refresh_saves(self) -> List[str]:
+        """Re-checks the save folders of the last scan without re-detecting the game.
+        
+        Only files that are new, changed (mtime or size) or gone go through
+        update_save. Returns their paths.
+        """
+        self.scanner.progress.reset("Refreshing saves")
+        seen = set()
+        changed = []
+        for directory in self.save_dirs:
+            for file_path in self.scanner._find_candidate_files(Path(directory)):
+                key = str(file_path)
+                seen.add(key)
+                known = self._classified.get(key)
+                if known is None or (known.mtime_ns, known.size) != file_snapshot(key):
+                    self.update_save(key)
+                    changed.append(key)
+                self.scanner.progress.files_analyzed += 1
+        for key in [k for k in self._classified if k not in seen]:
+            self.remove_save(key)
+            changed.append(key)
+        self.scanner.progress.phase = "Done"
+        return changed
+    
+    def remove_save(self, file_path):
+        """Forgets a deleted save file"""
+        self._classified.pop(str(file_path), None)
+        self.primary_candidates.remove(file_path)
 
-    def _classify_save(self, save_info: Dict) -> str:
+    def _classify_save(self, save_info) -> SaveClass:
         path = str(save_info['path']).lower()
         name = save_info['filename'].lower()
         
         if 'steam' in path and 'remote' in path:
-            return 'cloud'
+            return SaveClass.CLOUD
         if 'backup' in name or '.bak' in name:
-            return 'backup'
+            return SaveClass.BACKUP
         if 'slot' in name:
-            return 'slot'
+            return SaveClass.SLOT
         if 'savedata.json' in name:
             # Assume standard save is primary if it matches standard name
-            return 'slot' # effectively a slot, will be promoted if best candidate
-        return 'old_versions'
+            return SaveClass.SLOT # effectively a slot, will be promoted if best candidate
+        return SaveClass.OLD_VERSION
     
     def modify_all_saves(self, amount: float, operation: str = 'set') -> Dict:
         """Modifies all found saves"""
@@ -86,22 +180,73 @@ class MultiSaveManager:
                 unique_targets.append(t)
                 seen_paths.add(t['path'])
         
-        for save_info in unique_targets:
-            result = self._modify_single_save(save_info, amount, operation)
+        for result in self._modify_saves(unique_targets, amount, operation):
             (results['success'] if result['success'] else results['failed']).append(result)
+            if result['success']:
+                self.update_save(result['file'])
         
         return results
     
     def _modify_single_save(self, save_info: Dict, amount: float, operation: str) -> Dict:
         """Modifies a single save file"""
+        return self._modify_saves([save_info], amount, operation)[0]
+    
+    @traced
+    def _modify_saves(self, targets: List[Dict], amount: float, operation: str) -> List[Dict]:
+        """Stages every save, then replaces them all in one group commit.
+        
+        All targets stay locked from read to commit. Saves another program
+        wrote in the meantime are left out of the commit and retried.
+        """
+        results = {}
+        # Fixed lock order so parallel batch workers cannot deadlock each other
+        pending = sorted(targets, key=lambda t: str(t['path']))
+        for attempt in range(self.lock_manager.retries + 1):
+            with ExitStack() as locks:
+                tx = self._begin_transaction()
+                staged = [self._stage_single_save(save_info, amount, operation, tx, locks) for save_info in pending]
+                committed = self._commit_staged(tx, staged)
+            
+            retry = []
+            for save_info, result in zip(pending, committed):
+                results[save_info['path']] = result
+                if result.pop('conflict', False):
+                    retry.append(save_info)
+            if not retry:
+                break
+            pending = retry
+            time.sleep(self.lock_manager.retry_delay)
+        
+        return [results[t['path']] for t in targets]
+    
+    def _begin_transaction(self) -> SaveTransaction:
+        return SaveTransaction(self.journal_dir, self.safety)
+    
+    @traced
+    def _stage_single_save(self, save_info: Dict, amount: float, operation: str,
+                           tx: SaveTransaction, locks: ExitStack) -> Dict:
+        """Locks and backs up one save and stages its modified copy in tx; the original is untouched."""
         try:
-            backup_path = self._create_backup(save_info['path'])
+            guard = locks.enter_context(self.lock_manager.lock(save_info['path']))
+            safe, message = self.safety.pre_modification_check(save_info)
+            if not safe:
+                return {
+                    'success': False,
+                    'file': save_info['path'],
+                    'error': message,
+                    'backup': None
+                }
+            
+            backup = self._create_backup(save_info['path'])
+            backup_path = str(backup.backup_path)
             
-            success = False
+            staged = False
             if save_info['file_type'] == 'json':
-                success = self._modify_json_save(save_info['path'], amount, operation)
+                staged = self._modify_json_save(save_info['path'], amount, operation, backup, tx, guard)
+            elif save_info['file_type'] == 'binary' and is_binary_save(save_info['path']):
+                staged = self._modify_binary_save(save_info['path'], amount, operation, backup, tx, guard)
             
-            if success:
+            if staged:
                 return {
                     'success': True,
                     'file': save_info['path'],
@@ -123,15 +268,69 @@ class MultiSaveManager:
                 'backup': None
             }
     
-    def _create_backup(self, original_path: str) -> str:
+    @traced
+    def _commit_staged(self, tx: SaveTransaction, results: List[Dict]) -> List[Dict]:
+        """Commits every staged save at once, then verifies each one."""
+        staged = {entry.target: entry for entry in tx.staged}
+        for result in results:
+            entry = staged.get(Path(result['file']))
+            if result['success'] and entry is not None:
+                try:
+                    entry.guard.check()
+                except ConcurrentWriteError as e:
+                    tx.discard(entry)
+                    result.update({'success': False, 'error': str(e), 'conflict': True})
+        
+        try:
+            tx.commit()
+        except PartialCommitError as e:
+            # Past the commit point: never roll back, the journal finishes the rest on next start
+            for result in results:
+                if result['success'] and str(Path(result['file'])) in e.failed:
+                    result['success'] = False
+                    result['partial_commit'] = True
+                    result['error'] = (f"Partial commit: this save could not be replaced yet and will be "
+                                       f"completed on next start: {e.failed[str(Path(result['file']))]}")
+        except Exception as e:
+            if tx.committed:
+                # Same as above, but without knowing which saves were replaced
+                for result in results:
+                    if result['success']:
+                        result['success'] = False
+                        result['partial_commit'] = True
+                        result['error'] = f"Commit recorded but not finished, completing on next start: {e}"
+                return results
+            tx.rollback()
+            for result in results:
+                if result['success']:
+                    result['success'] = False
+                    result['error'] = f"Commit failed, no saves were changed: {e}"
+            return results
+        
+        for result in results:
+            if not result['success']:
+                continue
+            entry = staged[Path(result['file'])]
+            verified, message = self.safety.post_modification_verify(
+                result['file'], result['backup'], entry.written, entry.backup.sha256 if entry.backup else None)
+            if not verified:
+                result['success'] = False
+                result['error'] = message
+            elif message == UNCHANGED_WARNING:
+                result['warning'] = message
+        return results
+    
+    def _create_backup(self, original_path: str):
+        """Queues a backup on the shared worker and returns its BackupHandle."""
         original = Path(original_path)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_name = f"{original.stem}_backup_{timestamp}{original.suffix}"
         backup_path = self.backup_folder / backup_name
-        shutil.copy2(original, backup_path)
-        return str(backup_path)
+        return self.backup_worker.submit(original, backup_path)
     
-    def _modify_json_save(self, file_path: str, amount: float, operation: str) -> bool:
+    def _modify_json_save(self, file_path: str, amount: float, operation: str, backup,
+                          tx: SaveTransaction, guard: SaveGuard) -> bool:
+        """Stages the modified save in tx. Returns False if nothing was changed."""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
@@ -139,14 +338,44 @@ class MultiSaveManager:
             modified = self._modify_money_fields(data, amount, operation)
             
             if modified:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2)
+                if backup is not None and not backup.wait_durable():
+                    print(f"Backup failed, skipping {file_path}: {backup.error}")
+                    return False
+                tx.stage(file_path, json.dumps(data, indent=2), backup, guard)
                 return True
             return False
         except Exception as e:
             print(f"JSON modification error: {e}")
             return False
     
+    def _modify_binary_save(self, file_path: str, amount: float, operation: str, backup,
+                            tx: SaveTransaction, guard: SaveGuard) -> bool:
+        """Binary counterpart of _modify_json_save; only members named like money are touched."""
+        try:
+            save = BinarySave.from_file(file_path)
+            modified = False
+            for field in save.fields:
+                if field.is_numeric and any(kw in field.name for kw in MONEY_KEYWORDS):
+                    value = save.get(field)
+                    if operation == 'set':
+                        save.set(field, amount)
+                    elif operation == 'add':
+                        save.set(field, value + amount)
+                    elif operation == 'multiply':
+                        save.set(field, value * amount)
+                    modified = True
+            
+            if modified:
+                if backup is not None and not backup.wait_durable():
+                    print(f"Backup failed, skipping {file_path}: {backup.error}")
+                    return False
+                tx.stage(file_path, save.to_bytes(), backup, guard)
+                return True
+            return False
+        except Exception as e:
+            print(f"Binary modification error: {e}")
+            return False
+    
     def _modify_money_fields(self, data, amount: float, operation: str) -> bool:
         modified = False
         
@@ -177,9 +406,8 @@ class MultiSaveManager:
             return False
         
         key_str = str(key).lower()
-        money_keywords = ['money', 'cash', 'balance', 'wallet', 'currency', 'funds', 'gold', 'currentmoney']
         
-        if any(kw in key_str for kw in money_keywords):
+        if any(kw in key_str for kw in MONEY_KEYWORDS):
             return True
         
         if 0 < value < 100000000:
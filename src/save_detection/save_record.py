@@ -0,0 +1,208 @@
+import os
+from enum import Enum
+from pathlib import Path
+from datetime import datetime
+from typing import Optional
+
+
+class _StrEnum(str, Enum):
+    """Enum members are single shared objects that still compare equal to their string value."""
+
+    def __str__(self):
+        return self.value
+
+
+class FileType(_StrEnum):
+    JSON = 'json'
+    BINARY = 'binary'
+    UNKNOWN = 'unknown'
+
+
+class SaveFormat(_StrEnum):
+    JSON = 'json'
+    JSON_ERROR = 'json_error'
+    BINARY = 'binary'
+    UNKNOWN = 'unknown'
+
+
+class SaveClass(_StrEnum):
+    PRIMARY = 'primary'
+    SLOT = 'slot'
+    BACKUP = 'backup'
+    CLOUD = 'cloud'
+    OLD_VERSION = 'old_versions'
+
+
+PREVIEW_CHARS = 500
+
+# Keys of the save dict the scanner used to return, in their old order
+_DICT_KEYS = ('path', 'filename', 'size', 'modified', 'created', 'is_backup', 'slot_number',
+              'checksum', 'file_type', 'money_amount', 'is_valid', 'format', 'classification')
+
+
+_NOT_LOADED = object()
+
+
+class SaveRecord:
+    """One discovered save file.
+
+    Creating a record only needs a stat. The checksum, the content fields
+    (format, money_amount, is_valid) and the raw preview are computed by the
+    analyzer (the scanner) on first access and then memoized, so they
+    describe the file as it was at that moment. Timestamps are integer
+    nanoseconds and type/format/classification are shared enum members.
+    record['key'] / record.get('key') still work for code written against
+    the old per-file dicts (see to_dict for a real dict).
+    """
+
+    __slots__ = ('path', 'size', 'mtime_ns', 'ctime_ns', 'is_backup', 'slot_number', 'file_type',
+                 'classification', '_analyzer', '_checksum', '_format', '_money_amount', '_is_valid', '_preview')
+
+    def __init__(self, path: str, size: int, mtime_ns: int, ctime_ns: int, is_backup: bool = False,
+                 slot_number: Optional[int] = None, file_type: FileType = FileType.UNKNOWN, analyzer=None):
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.ctime_ns = ctime_ns
+        self.is_backup = is_backup
+        self.slot_number = slot_number
+        self.file_type = file_type
+        self.classification = None  # SaveClass, set by MultiSaveManager
+        # analyzer provides _calculate_checksum(path) and _read_save_content(path);
+        # without one the lazy fields keep their defaults until assigned
+        self._analyzer = analyzer
+        self._checksum = None if analyzer else ""
+        self._format = _NOT_LOADED if analyzer else None
+        self._money_amount = None
+        self._is_valid = False
+        self._preview = _NOT_LOADED
+
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def modified(self) -> datetime:
+        return datetime.fromtimestamp(self.mtime_ns / 1e9)
+
+    @property
+    def created(self) -> datetime:
+        return datetime.fromtimestamp(self.ctime_ns / 1e9)
+
+    # --- computed on first access ---
+
+    @property
+    def checksum(self) -> str:
+        if self._checksum is None:
+            self._checksum = self._analyzer._calculate_checksum(Path(self.path))
+        return self._checksum
+
+    @checksum.setter
+    def checksum(self, value):
+        self._checksum = value
+
+    @property
+    def format(self) -> Optional[SaveFormat]:
+        """SaveFormat of the content, or None if it could not be read."""
+        if self._format is _NOT_LOADED:
+            self._load_content()
+        return self._format
+
+    @format.setter
+    def format(self, value):
+        self._format = value
+
+    @property
+    def money_amount(self) -> Optional[float]:
+        if self._format is _NOT_LOADED:
+            self._load_content()
+        return self._money_amount
+
+    @money_amount.setter
+    def money_amount(self, value):
+        self._money_amount = value
+
+    @property
+    def is_valid(self) -> bool:
+        if self._format is _NOT_LOADED:
+            self._load_content()
+        return self._is_valid
+
+    @is_valid.setter
+    def is_valid(self, value):
+        self._is_valid = value
+
+    @property
+    def raw_preview(self) -> Optional[str]:
+        """First characters of a JSON save (None for other formats)."""
+        if self._preview is _NOT_LOADED:
+            self._preview = self._read_preview() if self.format is SaveFormat.JSON else None
+        return self._preview
+
+    @property
+    def is_analyzed(self) -> bool:
+        """Whether the content has been read (checksum and preview may still be pending)."""
+        return self._format is not _NOT_LOADED
+
+    def analyze(self):
+        """Reads the content now (no-op once analyzed); meant for background threads."""
+        if self._format is _NOT_LOADED:
+            self._load_content()
+
+    def _load_content(self):
+        content_info = self._analyzer._read_save_content(Path(self.path))
+        if content_info:
+            self._money_amount = content_info.get('money_amount')
+            self._is_valid = True
+            self._format = content_info['format']
+        else:
+            self._format = None
+
+    def _read_preview(self) -> Optional[str]:
+        try:
+            with open(self.path, 'r', encoding='utf-8', errors='ignore') as f:
+                return f.read(PREVIEW_CHARS)
+        except OSError:
+            return None
+
+    # --- dict compatibility ---
+
+    def __getitem__(self, key):
+        if key in _DICT_KEYS or key == 'raw_preview':
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None and key == 'raw_preview' else value
+
+    def __contains__(self, key):
+        return key in _DICT_KEYS or (key == 'raw_preview' and self.format is SaveFormat.JSON)
+
+    def keys(self):
+        return list(_DICT_KEYS)
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in _DICT_KEYS]
+
+    def to_dict(self, include_preview: bool = False) -> dict:
+        data = dict(self.items())
+        if include_preview and self.format is SaveFormat.JSON:
+            data['raw_preview'] = self.raw_preview
+        return data
+
+    def __repr__(self):
+        return f"SaveRecord({self.path!r}, size={self.size}, analyzed={self.is_analyzed})"
+
+
+def known_money(save) -> Optional[float]:
+    """Money of a save if already known; never reads the file (None until analyzed).
+
+    Also accepts the plain save dicts older callers build.
+    """
+    if isinstance(save, SaveRecord):
+        return save._money_amount if save.is_analyzed else None
+    return save.get('money_amount')
@@ -1,22 +1,72 @@
 import os
 import json
-import winreg
 import glob
+import time
+import fnmatch
 import hashlib
-from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
-import psutil
+
+from src.save_editor.binary_save import BinarySave, BinarySaveError
+from src.tracing import traced, count
+from .save_record import SaveRecord, FileType, SaveFormat
+
+MONEY_KEYS = ['money', 'cash', 'balance', 'wallet', 'currency']
+
+class ScanProgress:
+    """Counters the scanner bumps as it works; the UI samples them at its own refresh rate.
+
+    Plain attribute increments keep this cheap enough to leave on for every scan.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, phase="Idle"):
+        self.phase = phase
+        self.dirs_visited = 0
+        self.files_matched = 0
+        self.files_analyzed = 0
+        self.started = time.monotonic()
+        self.analysis_started = None
+
+    def eta(self):
+        """Seconds left for analyzing the files discovered so far, or None if unknown."""
+        if not self.analysis_started or not self.files_analyzed:
+            return None
+        elapsed = time.monotonic() - self.analysis_started
+        remaining = max(0, self.files_matched - self.files_analyzed)
+        return elapsed * remaining / self.files_analyzed
+
+    def percent(self):
+        return 100.0 * self.files_analyzed / self.files_matched if self.files_matched else 0.0
+
+    def snapshot(self):
+        return {
+            'phase': self.phase,
+            'dirs_visited': self.dirs_visited,
+            'files_matched': self.files_matched,
+            'files_analyzed': self.files_analyzed,
+            'elapsed': time.monotonic() - self.started,
+            'eta': self.eta(),
+        }
+
 
 class SupermarketSaveScanner:
     def __init__(self):
         self.found_saves = []
+        self.progress = ScanProgress()
         self.game_process_name = "Supermarket Simulator.exe"
         self.save_patterns = ["*.json", "*.dat", "*.save", "*.sav", "*.bak", "*.backup", "*.es3"]
         self.save_keywords = ["save", "data", "game", "player", "profile", "slot"]
         
-    def detect_game_installation(self) -> Dict[str, str]:
-        """Detects all possible game installation locations"""
+    @traced
+    def detect_game_installation(self, scan_saves: bool = True) -> Dict[str, str]:
+        """Detects all possible game installation locations.
+
+        With scan_saves=False only the locations are returned; found_saves is
+        not filled and no save file is listed.
+        """
         locations = {
             'steam': None,
             'epic': None,
@@ -25,6 +75,8 @@ class SupermarketSaveScanner:
             'saves': []
         }
         
+        self.progress.reset("Detecting Steam")
+        
         # 1. Check Steam via Registry
         try:
             steam_path = self._get_steam_install_path()
@@ -35,11 +87,12 @@ class SupermarketSaveScanner:
                 if game_path:
                     locations['steam'] = str(game_path)
                     # Find saves in Steam Cloud
-                    locations['saves'].extend(self._find_steam_cloud_saves(steam_path))
+                    locations['saves'].extend(self._find_steam_cloud_saves(steam_path, scan_saves))
         except Exception as e:
             print(f"Steam detection error: {e}")
         
         # 2. Check standard Unity locations
+        self.progress.phase = "Scanning save folders"
         user_profile = os.environ.get('USERPROFILE')
         if user_profile:
             unity_paths = [
@@ -52,10 +105,11 @@ class SupermarketSaveScanner:
             for path in unity_paths:
                 if path.exists():
                     locations['saves'].append(str(path))
-                    save_files = self._scan_for_save_files(path)
-                    self.found_saves.extend(save_files)
+                    if scan_saves:
+                        self.found_saves.extend(self._scan_for_save_files(path))
         
         # 3. Check running game processes
+        self.progress.phase = "Checking running game"
         game_process = self._find_running_game()
         if game_process:
             try:
@@ -73,24 +127,29 @@ class SupermarketSaveScanner:
              # Basic fallback scan in Documents if nothing else found
              pass 
 
+        self.progress.phase = "Done"
         return locations
     
     def _get_steam_install_path(self) -> Optional[Path]:
         """Gets Steam install path from Registry"""
+        try:
+            import winreg
+        except ImportError:
+            return None  # Not Windows
         try:
             # 64-bit Windows
             key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, 
                                 r"SOFTWARE\WOW6432Node\Valve\Steam")
             install_path, _ = winreg.QueryValueEx(key, "InstallPath")
             return Path(install_path)
-        except WindowsError:
+        except OSError:
             try:
                 # 32-bit Windows
                 key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, 
                                     r"SOFTWARE\Valve\Steam")
                 install_path, _ = winreg.QueryValueEx(key, "InstallPath")
                 return Path(install_path)
-            except WindowsError:
+            except OSError:
                 return None
     
     def _find_game_in_directory(self, directory: Path) -> Optional[Path]:
@@ -101,7 +160,7 @@ class SupermarketSaveScanner:
                     return child
         return None
 
-    def _find_steam_cloud_saves(self, steam_path: Path) -> List[str]:
+    def _find_steam_cloud_saves(self, steam_path: Path, scan_saves: bool = True) -> List[str]:
         """Finds Steam Cloud saves"""
         cloud_saves = []
         userdata_path = steam_path / "userdata"
@@ -117,12 +176,13 @@ class SupermarketSaveScanner:
                         if remote_path.exists():
                             cloud_saves.append(str(remote_path))
                             # Scan files in remote
-                            save_files = self._scan_for_save_files(remote_path)
-                            self.found_saves.extend(save_files)
+                            if scan_saves:
+                                self.found_saves.extend(self._scan_for_save_files(remote_path))
         return cloud_saves
     
-    def _find_running_game(self) -> Optional[psutil.Process]:
+    def _find_running_game(self) -> Optional["psutil.Process"]:
         """Finds running game process"""
+        import psutil  # Imported on first scan; slow to load at startup
         for proc in psutil.process_iter(['name', 'exe']):
             try:
                 if proc.info['name'] and self.game_process_name.lower() in proc.info['name'].lower():
@@ -131,21 +191,40 @@ class SupermarketSaveScanner:
                 continue
         return None
     
-    def _scan_for_save_files(self, directory: Path) -> List[Dict]:
+    def _scan_for_save_files(self, directory: Path) -> List[SaveRecord]:
         """Scans directory for save files"""
         save_files = []
         
         if not directory.exists():
             return []
 
-        for pattern in self.save_patterns:
-            for file_path in directory.rglob(pattern):
-                if self._is_likely_save_file(file_path):
-                    save_info = self._analyze_save_file(file_path)
-                    if save_info:
-                        save_files.append(save_info)
+        progress = self.progress
+        candidates = self._find_candidate_files(directory)
+        if progress.analysis_started is None:
+            progress.analysis_started = time.monotonic()
+        for file_path in candidates:
+            save_info = self._analyze_save_file(file_path)
+            progress.files_analyzed += 1
+            if save_info:
+                save_files.append(save_info)
         
         return save_files
+
+    @traced
+    def _find_candidate_files(self, directory: Path) -> List[Path]:
+        """Likely save files under directory (stat only, no content reads)."""
+        # One walk for all patterns (instead of one rglob per pattern), counting as we go
+        progress = self.progress
+        candidates = []
+        for root, dirs, files in os.walk(directory):
+            progress.dirs_visited += 1
+            for name in files:
+                if any(fnmatch.fnmatch(name, pattern) for pattern in self.save_patterns):
+                    file_path = Path(root) / name
+                    if self._is_likely_save_file(file_path):
+                        candidates.append(file_path)
+                        progress.files_matched += 1
+        return candidates
     
     def _is_likely_save_file(self, file_path: Path) -> bool:
         """Checks if file is likely a save file"""
@@ -166,31 +245,27 @@ class SupermarketSaveScanner:
         
         return False
     
-    def _analyze_save_file(self, file_path: Path) -> Optional[Dict]:
-        """Analyzes save file and extracts info"""
+    @traced
+    def _analyze_save_file(self, file_path: Path) -> Optional[SaveRecord]:
+        """Record for a save file from a single stat.
+
+        The checksum and content (format, money, validity, preview) are read
+        by the record on first access, so only saves that are viewed or
+        edited pay for hashing and parsing.
+        """
         try:
             stats = file_path.stat()
             
-            save_info = {
-                'path': str(file_path),
-                'filename': file_path.name,
-                'size': stats.st_size,
-                'modified': datetime.fromtimestamp(stats.st_mtime),
-                'created': datetime.fromtimestamp(stats.st_ctime),
-                'is_backup': self._is_backup_file(file_path),
-                'slot_number': self._extract_slot_number(file_path),
-                'checksum': self._calculate_checksum(file_path),
-                'file_type': self._detect_file_type(file_path),
-                'money_amount': None,
-                'is_valid': False
-            }
-            
-            content_info = self._read_save_content(file_path)
-            if content_info:
-                save_info.update(content_info)
-                save_info['is_valid'] = True
-            
-            return save_info
+            return SaveRecord(
+                path=str(file_path),
+                size=stats.st_size,
+                mtime_ns=stats.st_mtime_ns,
+                ctime_ns=stats.st_ctime_ns,
+                is_backup=self._is_backup_file(file_path),
+                slot_number=self._extract_slot_number(file_path),
+                file_type=self._detect_file_type(file_path),
+                analyzer=self,
+            )
             
         except Exception as e:
             print(f"Error analyzing {file_path}: {e}")
@@ -207,17 +282,25 @@ class SupermarketSaveScanner:
             return int(match.group(1))
         return None
 
+    @traced
     def _calculate_checksum(self, file_path: Path) -> str:
         try:
-            return hashlib.md5(file_path.read_bytes()).hexdigest()
+            digest = hashlib.md5()
+            hashed = 0
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+                    hashed += len(chunk)
+            count('scanner.bytes_hashed', hashed)
+            return digest.hexdigest()
         except:
             return ""
 
-    def _detect_file_type(self, file_path: Path) -> str:
+    def _detect_file_type(self, file_path: Path) -> FileType:
         suffix = file_path.suffix.lower()
-        if suffix == '.json' or suffix == '.es3': return 'json'
-        if suffix == '.dat': return 'binary'
-        return 'unknown'
+        if suffix == '.json' or suffix == '.es3': return FileType.JSON
+        if suffix == '.dat': return FileType.BINARY
+        return FileType.UNKNOWN
     
     def _read_save_content(self, file_path: Path) -> Optional[Dict]:
         """Reads and analyzes save content"""
@@ -225,23 +308,20 @@ class SupermarketSaveScanner:
             if file_path.suffix.lower() in ['.json', '.es3']:
                 return self._parse_json_save(file_path)
             elif file_path.suffix.lower() == '.dat':
-                # Binary parsing placeholder
-                return {'format': 'binary'}
+                return self._parse_binary_save(file_path)
             else:
-                return {'format': 'unknown'}
+                return {'format': SaveFormat.UNKNOWN}
         except:
             return None
     
+    @traced
     def _parse_json_save(self, file_path: Path) -> Dict:
-        """Parses JSON save and finds money"""
+        """Parses JSON save and finds money (the preview is read separately, on demand)"""
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
             
-            result = {
-                'format': 'json',
-                'raw_preview': content[:500],
-            }
+            result = {'format': SaveFormat.JSON}
             
             data = json.loads(content)
             money = self._find_money_in_structure(data)
@@ -250,14 +330,28 @@ class SupermarketSaveScanner:
                 
             return result
         except Exception:
-            return {'format': 'json_error'}
+            return {'format': SaveFormat.JSON_ERROR}
     
+    @traced
+    def _parse_binary_save(self, file_path: Path) -> Dict:
+        """Reads money from a BinaryFormatter save; unknown binary layouts are listed without it."""
+        result = {'format': SaveFormat.BINARY}
+        try:
+            save = BinarySave.from_file(file_path)
+        except BinarySaveError:
+            return result
+        for field in save.fields:
+            if field.is_numeric and any(key in field.name for key in MONEY_KEYS):
+                result['money_amount'] = float(save.get(field))
+                break
+        return result
+
     def _find_money_in_structure(self, data) -> Optional[float]:
         """Recursively search for money value"""
         if isinstance(data, dict):
             for key, value in data.items():
                 if isinstance(key, str) and any(money_key in key.lower() 
-                    for money_key in ['money', 'cash', 'balance', 'wallet', 'currency']):
+                    for money_key in MONEY_KEYS):
                     if isinstance(value, (int, float)):
                         return float(value)
                 
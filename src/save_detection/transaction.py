@@ -0,0 +1,239 @@
+import os
+import json
+import time
+import uuid
+import hashlib
+from pathlib import Path
+from typing import Dict, List
+
+from .safety_system import SafetySystem, WriteResult
+
+JOURNAL_SUFFIX = ".journal"
+# os.replace can fail transiently on Windows while another process has the target open
+REPLACE_ATTEMPTS = 5
+REPLACE_RETRY_DELAY = 0.2
+
+
+class PartialCommitError(IOError):
+    """The transaction is committed, but some targets could not be replaced yet.
+
+    The journal and their temp files are kept, so recover_transactions()
+    finishes them on the next start.
+    """
+
+    def __init__(self, failed: Dict[str, Exception]):
+        super().__init__("; ".join(f"{target}: {error}" for target, error in failed.items()))
+        self.failed = failed
+
+
+class StagedSave:
+    """One save rewritten into a temp file next to its target, waiting for commit."""
+
+    def __init__(self, target: Path, temp: Path, written: WriteResult, backup=None, guard=None):
+        self.target = target
+        self.temp = temp
+        self.written = written
+        # In-memory only, not journaled: the BackupHandle and SaveGuard of the target
+        self.backup = backup
+        self.guard = guard
+
+    def to_dict(self) -> Dict:
+        return {
+            'target': str(self.target),
+            'temp': str(self.temp),
+            'sha256': self.written.sha256,
+            'size': self.written.size,
+        }
+
+
+class SaveTransaction:
+    """Writes several saves all-or-nothing using temp files and a write-ahead journal.
+
+    stage() records the intent in '<journal_dir>/<txid>.journal' (state
+    'pending') and then writes the new save to '<target>.<txid>.tmp'.
+    commit() fsyncs all temp files in one round, marks the journal 'committed'
+    with the only journal fsync (the commit point) and then os.replace()s
+    every target. From the commit
+    point on the transaction only rolls forward. recover_transactions()
+    finishes or undoes whatever a crash left behind.
+    """
+
+    def __init__(self, journal_dir, safety: SafetySystem = None):
+        self.journal_dir = Path(journal_dir)
+        self.safety = safety or SafetySystem()
+        self.tx_id = uuid.uuid4().hex[:12]
+        self.journal_path = self.journal_dir / f"{self.tx_id}{JOURNAL_SUFFIX}"
+        self.staged: List[StagedSave] = []
+        self.committed = False
+
+    def stage(self, target_path, content, backup=None, guard=None) -> StagedSave:
+        """Writes content to a temp file beside target_path."""
+        target = Path(target_path)
+        temp = target.with_name(f"{target.name}.{self.tx_id}.tmp")
+        # On record before the temp file exists, so a crashed process cannot orphan it.
+        # Not fsynced: until commit a crash means rollback, and the one fsync is the commit record
+        planned = {'target': str(target), 'temp': str(temp), 'sha256': None, 'size': None}
+        _write_journal(self.journal_path, self.tx_id, 'pending', self._entries() + [planned], durable=False)
+        try:
+            written = self.safety.write_verified(temp, content)
+        except Exception:
+            _remove(temp)
+            raise
+        entry = StagedSave(target, temp, written, backup, guard)
+        self.staged.append(entry)
+        _write_journal(self.journal_path, self.tx_id, 'pending', self._entries(), durable=False)
+        return entry
+
+    def discard(self, entry: StagedSave):
+        """Drops one staged save from the transaction before commit."""
+        self.staged.remove(entry)
+        _remove(entry.temp)
+        _write_journal(self.journal_path, self.tx_id, 'pending', self._entries(), durable=False)
+
+    def commit(self):
+        """Commits every staged save.
+
+        Raises before the commit point (nothing changed, rollback() cleans
+        up) or PartialCommitError after it (some targets still pending).
+        """
+        if not self.staged:
+            _remove(self.journal_path)
+            return
+        for entry in self.staged:
+            _fsync_file(entry.temp)
+        _write_journal(self.journal_path, self.tx_id, 'committed', self._entries(), durable=True)
+        self.committed = True
+        failed = _apply_entries(self._entries(), retries=REPLACE_ATTEMPTS)
+        if failed:
+            raise PartialCommitError(failed)
+        _remove(self.journal_path)
+
+    def rollback(self):
+        """Undoes an uncommitted transaction; never touches one past its commit point."""
+        if self.committed:
+            return
+        for entry in self.staged:
+            _remove(entry.temp)
+        _remove(self.journal_path)
+        self.staged = []
+
+    def _entries(self) -> List[Dict]:
+        return [e.to_dict() for e in self.staged]
+
+
+def recover_transactions(journal_dir) -> Dict[str, int]:
+    """Rolls committed transactions forward and pending ones back. Run on startup."""
+    summary = {'rolled_forward': 0, 'rolled_back': 0}
+    journal_dir = Path(journal_dir)
+    if not journal_dir.is_dir():
+        return summary
+
+    for journal_path in journal_dir.glob(f"*{JOURNAL_SUFFIX}"):
+        try:
+            with open(journal_path, 'r', encoding='utf-8') as f:
+                journal = json.load(f)
+        except (OSError, ValueError) as e:
+            # A torn journal was never fsynced, so it cannot be a commit record
+            print(f"Discarding unreadable journal {journal_path}: {e}")
+            _remove(journal_path)
+            continue
+
+        entries = journal.get('entries', [])
+        if journal.get('state') == 'committed':
+            failed = _apply_entries(entries, verify=True)
+            if failed:
+                # Keep the journal and the temp files; the next start tries again
+                print(f"Could not finish transaction {journal_path.name}: {failed}")
+                continue
+            summary['rolled_forward'] += 1
+        else:
+            for entry in entries:
+                _remove(Path(entry['temp']))
+            summary['rolled_back'] += 1
+        _remove(journal_path)
+
+    return summary
+
+
+def _apply_entries(entries: List[Dict], verify: bool = False, retries: int = 1) -> Dict[str, Exception]:
+    """Moves every temp over its target; returns {target: error} for those that failed."""
+    dirs = set()
+    pending = []
+    for entry in entries:
+        temp = Path(entry['temp'])
+        if not temp.exists():
+            # Already replaced before the crash
+            continue
+        if verify and _sha256(temp) != entry['sha256']:
+            print(f"Staged save {temp} is damaged, leaving {entry['target']} untouched")
+            _remove(temp)
+            continue
+        pending.append(entry)
+
+    failed = {}
+    for attempt in range(retries):
+        if attempt:
+            time.sleep(REPLACE_RETRY_DELAY)
+        failed = {}
+        for entry in pending:
+            try:
+                os.replace(entry['temp'], entry['target'])
+                dirs.add(str(Path(entry['target']).parent))
+            except OSError as e:
+                failed[entry['target']] = e
+        if not failed:
+            break
+        pending = [entry for entry in pending if entry['target'] in failed]
+    for directory in dirs:
+        try:
+            _fsync_dir(directory)
+        except OSError as e:
+            # The renames happened; only their durability is in doubt
+            print(f"Could not fsync {directory}: {e}")
+    return failed
+
+
+def _write_journal(path: Path, tx_id: str, state: str, entries: List[Dict], durable: bool):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'id': tx_id, 'state': state, 'entries': entries}, f)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if durable:
+        _fsync_dir(path.parent)
+
+
+def _fsync_file(path: Path):
+    # r+b because Windows can only flush handles opened for writing
+    with open(path, 'r+b') as f:
+        os.fsync(f.fileno())
+
+
+def _fsync_dir(directory):
+    if os.name == 'nt':
+        return  # Directory handles cannot be fsynced on Windows; NTFS journals renames
+    fd = os.open(str(directory), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _remove(path: Path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Could not remove {path}: {e}")
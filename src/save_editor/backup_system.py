@@ -1,26 +1,44 @@
 import shutil
 from pathlib import Path
 from datetime import datetime
+from .backup_worker import get_backup_worker
+from .file_lock import get_lock_manager
+from src.tracing import traced
 
 class BackupSystem:
+    def __init__(self):
+        self.worker = get_backup_worker()
+
+    @traced
     def create_backup(self, save_path):
-        """Creates a backup of the save file."""
+        """Creates a backup of the save file and waits until it is on disk."""
+        handle = self.create_backup_async(save_path)
+        if handle and handle.wait_durable():
+            return handle.backup_path
+        return None
+
+    @traced
+    def create_backup_async(self, save_path):
+        """Snapshots the save and queues the backup. Returns a BackupHandle or None."""
         if not save_path or not Path(save_path).exists():
             return None
             
         save_path = Path(save_path)
         backup_dir = save_path.parent / 'backups'
-        backup_dir.mkdir(exist_ok=True)
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_path = backup_dir / f"backup_{timestamp}_{save_path.name}"
         
         try:
-            shutil.copy2(save_path, backup_path)
-            return backup_path
+            return self.worker.submit(save_path, backup_path)
         except Exception as e:
             print(f"Backup failed: {e}")
             return None
+
+    def pending_backups(self):
+        """Number of backups still being written or catalogued."""
+        return self.worker.pending_count()
+
     def list_backups(self, save_path):
         """Lists available backups for a given save slot."""
         if not save_path: return []
@@ -41,7 +59,8 @@ class BackupSystem:
     def restore_backup(self, backup_path, target_path):
         """Restores a backup to the target save path."""
         try:
-            shutil.copy2(backup_path, target_path)
+            with get_lock_manager().lock(target_path):
+                shutil.copy2(backup_path, target_path)
             return True
         except Exception as e:
             print(f"Restore failed: {e}")
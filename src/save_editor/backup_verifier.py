@@ -0,0 +1,207 @@
+import os
+import sys
+import json
+import hashlib
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .backup_worker import BackupIndex, INDEX_FILENAME, INDEX_TMP_FILENAME
+
+CHUNK_SIZE = 1024 * 1024
+# Files larger than this are hashed but not parsed
+MAX_PARSE_BYTES = 64 * 1024 * 1024
+# Content buffered for parsing across all workers at once; workers wait for room
+MAX_BUFFERED_BYTES = 128 * 1024 * 1024
+
+RESULT_KEYS = ('ok', 'unindexed', 'corrupted', 'truncated', 'unparseable', 'unreadable', 'missing')
+FAILURE_KEYS = ('corrupted', 'truncated', 'unparseable', 'unreadable', 'missing')
+
+
+def default_backup_dirs(save_path=None) -> List[Path]:
+    """Backup locations used by BackupSystem (next to the save) and MultiSaveManager."""
+    dirs = []
+    if save_path:
+        dirs.append(Path(save_path).parent / 'backups')
+    dirs.append(Path(os.environ.get('USERPROFILE', '')) / "SupermarketSaveBackups")
+    return [d for d in dirs if d.is_dir()]
+
+
+class _ByteBudget:
+    """Shared limit on bytes held in memory; acquire blocks until enough is released."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.available = limit
+        self._cond = threading.Condition()
+
+    def acquire(self, amount: int):
+        with self._cond:
+            self._cond.wait_for(lambda: self.available >= amount)
+            self.available -= amount
+
+    def release(self, amount: int):
+        with self._cond:
+            self.available += amount
+            self._cond.notify_all()
+
+
+class BackupVerifier:
+    """Hashes (and optionally parses) every backup on a thread pool and checks it against the index.
+
+    Reads are streamed in CHUNK_SIZE blocks; hashlib and file reads release
+    the GIL so the pool keeps the disk busy rather than one core. Content kept
+    for parsing comes out of one budget of max_buffered_bytes shared by all
+    workers, so memory stays bounded whatever the worker count.
+    """
+
+    def __init__(self, parse: bool = True, workers: Optional[int] = None,
+                 chunk_size: int = CHUNK_SIZE, max_parse_bytes: int = MAX_PARSE_BYTES,
+                 max_buffered_bytes: int = MAX_BUFFERED_BYTES):
+        self.parse = parse
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 2)
+        self.chunk_size = chunk_size
+        self.max_parse_bytes = min(max_parse_bytes, max_buffered_bytes // 2)
+        self.budget = _ByteBudget(max_buffered_bytes)
+
+    def verify(self, backup_dirs: Iterable, progress: Optional[Callable[[int, int, int], None]] = None) -> Dict:
+        """Verifies all backups in the given directories.
+
+        progress(done, total, bytes_read) is called after each file.
+        Returns a report with one list of {'path', 'reason'} per RESULT_KEYS entry.
+        """
+        report = {key: [] for key in RESULT_KEYS}
+        jobs = []
+
+        for backup_dir in backup_dirs:
+            backup_dir = Path(backup_dir)
+            if not backup_dir.is_dir():
+                continue
+            entries = BackupIndex(backup_dir).load()
+            on_disk = set()
+            for file_path in backup_dir.iterdir():
+                if file_path.name in (INDEX_FILENAME, INDEX_TMP_FILENAME) or not file_path.is_file():
+                    continue
+                on_disk.add(file_path.name)
+                jobs.append((file_path, entries.get(file_path.name)))
+            for name in entries:
+                if name not in on_disk:
+                    report['missing'].append({'path': str(backup_dir / name), 'reason': "Indexed backup not found"})
+
+        total = len(jobs)
+        done = 0
+        bytes_read = 0
+        if progress:
+            progress(0, total, 0)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(self._verify_one, path, entry) for path, entry in jobs]
+            for future in as_completed(futures):
+                status, result, size = future.result()
+                report[status].append(result)
+                done += 1
+                bytes_read += size
+                if progress:
+                    progress(done, total, bytes_read)
+
+        report['total'] = total
+        report['bytes_read'] = bytes_read
+        return report
+
+    def _verify_one(self, file_path: Path, entry: Optional[Dict]):
+        digest = hashlib.sha256()
+        content = bytearray()
+        size = 0
+        reserved = 0
+        try:
+            with open(file_path, 'rb') as f:
+                expected = os.fstat(f.fileno()).st_size
+                keep_content = self.parse and self._wants_parse(file_path) and expected <= self.max_parse_bytes
+                if keep_content:
+                    # The raw bytes plus their decoded text are alive together while parsing
+                    reserved = 2 * expected
+                    self.budget.acquire(reserved)
+                while True:
+                    chunk = f.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    size += len(chunk)
+                    if keep_content:
+                        if size > expected:
+                            # Grew while being read: hash it, but do not buffer past the reservation
+                            keep_content = False
+                            content = bytearray()
+                        else:
+                            content += chunk
+        except OSError as e:
+            if reserved:
+                self.budget.release(reserved)
+            return 'unreadable', {'path': str(file_path), 'reason': str(e)}, size
+
+        try:
+            return self._classify(file_path, entry, digest, size, content if keep_content else None)
+        finally:
+            if reserved:
+                self.budget.release(reserved)
+
+    def _classify(self, file_path: Path, entry: Optional[Dict], digest, size: int, content):
+        result = {'path': str(file_path), 'size': size, 'sha256': digest.hexdigest()}
+
+        if entry:
+            expected_size = entry.get('size')
+            if size == 0 or (expected_size is not None and size < expected_size):
+                result['reason'] = f"Truncated: {size} of {expected_size} bytes"
+                return 'truncated', result, size
+            if entry.get('sha256') and entry['sha256'] != result['sha256']:
+                result['reason'] = "Hash mismatch"
+                return 'corrupted', result, size
+        elif size == 0:
+            result['reason'] = "Empty file"
+            return 'truncated', result, size
+
+        if content is not None:
+            error = self._parse_error(file_path, content)
+            if error:
+                result['reason'] = error
+                return 'unparseable', result, size
+
+        if not entry:
+            result['reason'] = "No recorded hash"
+            return 'unindexed', result, size
+        result['reason'] = "OK"
+        return 'ok', result, size
+
+    def _wants_parse(self, file_path: Path) -> bool:
+        return file_path.suffix.lower() in ('.json', '.es3')
+
+    def _parse_error(self, file_path: Path, content: bytes) -> Optional[str]:
+        """Returns a description of why the backup does not parse, or None."""
+        try:
+            json.loads(content.decode('utf-8', errors='ignore'))
+            return None
+        except ValueError as e:
+            return f"Invalid JSON: {e}"
+
+
+def format_report(report: Dict) -> str:
+    lines = [f"Verified {report.get('total', 0)} backups ({report.get('bytes_read', 0):,} bytes)"]
+    for key in RESULT_KEYS:
+        lines.append(f"  {key}: {len(report[key])}")
+    for key in FAILURE_KEYS:
+        for item in report[key]:
+            lines.append(f"  [{key}] {item['path']}: {item['reason']}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    dirs = sys.argv[1:] or default_backup_dirs()
+
+    def _print_progress(done, total, bytes_read):
+        print(f"\r{done}/{total} backups, {bytes_read / (1024 * 1024):.1f} MB", end="", flush=True)
+
+    result = BackupVerifier().verify(dirs, progress=_print_progress)
+    print()
+    print(format_report(result))
+    sys.exit(0 if not any(result[k] for k in FAILURE_KEYS) else 1)
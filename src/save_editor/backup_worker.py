@@ -0,0 +1,186 @@
+import os
+import json
+import queue
+import hashlib
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Optional
+
+from src.tracing import traced, count
+
+INDEX_FILENAME = ".backup_index.json"
+INDEX_TMP_FILENAME = ".backup_index.tmp"
+
+
+class BackupIndex:
+    """Catalogue of backups in one backup directory (name -> sha256, size, source)."""
+
+    def __init__(self, backup_dir):
+        self.backup_dir = Path(backup_dir)
+        self.index_path = self.backup_dir / INDEX_FILENAME
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('backups', {})
+        except (OSError, ValueError):
+            return {}
+
+    def record(self, backup_path: Path, entry: Dict):
+        with self._lock:
+            entries = self.load()
+            entries[Path(backup_path).name] = entry
+            tmp_path = self.backup_dir / INDEX_TMP_FILENAME
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'backups': entries}, f, indent=2)
+            os.replace(tmp_path, self.index_path)
+
+
+class BackupHandle:
+    """Tracks one queued backup. Durable once the bytes are fsynced (sha256 is set by then), done once catalogued."""
+
+    def __init__(self, source_path, backup_path, data: bytes, source_stat):
+        self.source_path = Path(source_path)
+        self.backup_path = Path(backup_path)
+        self.size = len(data)
+        self.sha256 = None
+        self.error = None
+        self._data = data
+        self._source_stat = source_stat
+        self._durable = threading.Event()
+        self._done = threading.Event()
+
+    @property
+    def is_durable(self) -> bool:
+        return self._durable.is_set() and self.error is None
+
+    @property
+    def is_done(self) -> bool:
+        return self._done.is_set()
+
+    def wait_durable(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the backup is safely on disk. Returns False on failure or timeout."""
+        self._durable.wait(timeout)
+        return self.is_durable
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the backup is also hashed and indexed."""
+        self._done.wait(timeout)
+        return self.is_done and self.error is None
+
+
+class BackupWorker:
+    """Background thread that writes and catalogues backups off the edit path.
+
+    `submit` only snapshots the source bytes; writing, fsync, hashing and
+    indexing run on the worker thread in FIFO order.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._indexes = {}
+
+    @traced
+    def submit(self, source_path, backup_path) -> BackupHandle:
+        source_path = Path(source_path)
+        with open(source_path, 'rb') as f:
+            source_stat = os.fstat(f.fileno())
+            data = f.read()
+
+        handle = BackupHandle(source_path, backup_path, data, source_stat)
+        with self._lock:
+            self._pending += 1
+            self._ensure_thread()
+        self._queue.put(handle)
+        return handle
+
+    def pending_count(self) -> int:
+        """Number of backups not yet fully catalogued."""
+        with self._lock:
+            return self._pending
+
+    def flush(self, timeout: Optional[float] = None):
+        """Waits for all queued backups to finish (used on shutdown)."""
+        done = threading.Event()
+        with self._lock:
+            if not self._pending:
+                return
+            self._ensure_thread()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="BackupWorker", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            try:
+                self._process(item)
+            finally:
+                with self._lock:
+                    self._pending -= 1
+
+    @traced
+    def _process(self, handle: BackupHandle):
+        try:
+            handle.backup_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(handle.backup_path, 'wb') as f:
+                f.write(handle._data)
+                f.flush()
+                os.fsync(f.fileno())
+            # Keep the source timestamps like shutil.copy2 did; list_backups sorts on mtime
+            st = handle._source_stat
+            os.utime(handle.backup_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+            # Hashed before the durable event so anyone who waited for durability can use it
+            handle.sha256 = hashlib.sha256(handle._data).hexdigest()
+        except Exception as e:
+            handle.error = e
+            print(f"Backup failed: {e}")
+            handle._durable.set()
+            handle._done.set()
+            return
+        handle._durable.set()
+        count('backups.bytes_written', handle.size)
+
+        try:
+            self._index_for(handle.backup_path.parent).record(handle.backup_path, {
+                'source': str(handle.source_path),
+                'sha256': handle.sha256,
+                'size': handle.size,
+                'created': datetime.now().isoformat(timespec='seconds'),
+            })
+        except Exception as e:
+            print(f"Backup indexing failed: {e}")
+        finally:
+            handle._data = None
+            handle._done.set()
+
+    def _index_for(self, backup_dir: Path) -> BackupIndex:
+        key = str(backup_dir)
+        if key not in self._indexes:
+            self._indexes[key] = BackupIndex(backup_dir)
+        return self._indexes[key]
+
+
+_default_worker = None
+_default_lock = threading.Lock()
+
+
+def get_backup_worker() -> BackupWorker:
+    """Returns the process-wide worker so the UI sees all pending backups in one place."""
+    global _default_worker
+    with _default_lock:
+        if _default_worker is None:
+            _default_worker = BackupWorker()
+        return _default_worker
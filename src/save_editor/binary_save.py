@@ -0,0 +1,388 @@
+"""Reader/in-place writer for binary (.dat) saves in .NET BinaryFormatter format.
+
+Unity games that do not use ES3's JSON text write their binary saves with
+BinaryFormatter (MS-NRBF). The stream is parsed once over a memoryview:
+every fixed-width primitive member (ints, floats, bools...) is indexed as a
+BinaryField holding its byte offset, so values are read with
+struct.unpack_from and edits are packed back over the same bytes - the file
+layout never changes, nothing is re-serialized. Strings and arrays can be
+read but not resized.
+"""
+import os
+import struct
+from typing import Dict, Iterable, List
+
+# MS-NRBF record types
+_HEADER = 0
+_CLASS_WITH_ID = 1
+_SYSTEM_CLASS_WITH_MEMBERS = 2
+_CLASS_WITH_MEMBERS = 3
+_SYSTEM_CLASS_WITH_MEMBERS_AND_TYPES = 4
+_CLASS_WITH_MEMBERS_AND_TYPES = 5
+_OBJECT_STRING = 6
+_BINARY_ARRAY = 7
+_MEMBER_PRIMITIVE_TYPED = 8
+_MEMBER_REFERENCE = 9
+_OBJECT_NULL = 10
+_MESSAGE_END = 11
+_LIBRARY = 12
+_NULL_MULTIPLE_256 = 13
+_NULL_MULTIPLE = 14
+_ARRAY_SINGLE_PRIMITIVE = 15
+_ARRAY_SINGLE_OBJECT = 16
+_ARRAY_SINGLE_STRING = 17
+
+# BinaryTypeEnum
+_BT_PRIMITIVE = 0
+_BT_SYSTEM_CLASS = 3
+_BT_CLASS = 4
+_BT_PRIMITIVE_ARRAY = 7
+
+# PrimitiveTypeEnum -> struct format of the fixed-width ones
+_PRIMITIVE_FORMATS = {
+    1: '<?', 2: '<B', 6: '<d', 7: '<h', 8: '<i', 9: '<q', 10: '<b',
+    11: '<f', 12: '<q', 13: '<q', 14: '<H', 15: '<I', 16: '<Q',
+}
+_PT_CHAR = 3
+_PT_DECIMAL = 5
+_PT_NULL = 17
+_PT_STRING = 18
+
+_INTEGER_CODES = set('bBhHiIqQ')
+
+# Null runs let an object array be longer than the bytes that encode it;
+# beyond this many elements it must be backed by at least a byte each
+MAX_SPARSE_ARRAY_LENGTH = 1 << 20
+
+
+class BinarySaveError(ValueError):
+    """The data is not a BinaryFormatter stream this parser understands."""
+
+
+class BinaryField:
+    """One fixed-width primitive member: where it lives in the buffer and how to decode it."""
+
+    __slots__ = ('name', 'path', 'offset', 'fmt')
+
+    def __init__(self, name: str, path: str, offset: int, fmt: str):
+        self.name = name        # normalized member name (lowercase, no backing-field wrapper)
+        self.path = path        # e.g. "GameData.playerData.money"
+        self.offset = offset
+        self.fmt = fmt
+
+    @property
+    def size(self) -> int:
+        return struct.calcsize(self.fmt)
+
+    @property
+    def is_numeric(self) -> bool:
+        return self.fmt != '<?'
+
+    def __repr__(self):
+        return f"BinaryField({self.path!r}, offset={self.offset}, fmt={self.fmt!r})"
+
+
+class BinarySave:
+    """A parsed binary save; `root` is the object tree, `fields` the patchable members."""
+
+    def __init__(self, data):
+        # A bytearray is taken over as is, anything else is copied once
+        self.buffer = data if isinstance(data, bytearray) else bytearray(data)
+        self.view = memoryview(self.buffer)
+        self.fields: List[BinaryField] = []
+        self.root = None
+        _Parser(self).parse()
+
+    @classmethod
+    def from_file(cls, path) -> 'BinarySave':
+        with open(path, 'rb') as f:
+            buffer = bytearray(os.fstat(f.fileno()).st_size)
+            read = f.readinto(buffer)
+        if read != len(buffer):
+            raise BinarySaveError(f"{path} changed size while being read")
+        return cls(buffer)
+
+    def get(self, field: BinaryField):
+        return struct.unpack_from(field.fmt, self.view, field.offset)[0]
+
+    def set(self, field: BinaryField, value):
+        """Overwrites a field in place; integers are range-checked, never resized."""
+        if field.fmt[-1] in _INTEGER_CODES:
+            value = int(round(value))
+        try:
+            # Packed separately first: a failed pack_into can leave the field zeroed
+            packed = struct.pack(field.fmt, value)
+        except struct.error as e:
+            raise ValueError(f"{value!r} does not fit {field.path} ({field.fmt}): {e}")
+        self.view[field.offset:field.offset + len(packed)] = packed
+
+    def find(self, names: Iterable[str]) -> List[BinaryField]:
+        """Fields whose normalized name is one of names, in file order."""
+        names = set(names)
+        return [f for f in self.fields if f.name in names]
+
+    def value_of(self, names: Iterable[str]):
+        """Value of the first matching numeric field, or None."""
+        for field in self.find(names):
+            if field.is_numeric:
+                return self.get(field)
+        return None
+
+    def modify_first(self, names: Iterable[str], value, operation='set') -> bool:
+        """Sets (or adds to) the first matching numeric field, like the JSON field search."""
+        for field in self.find(names):
+            if field.is_numeric:
+                new_value = self.get(field) + value if operation == 'add' else value
+                self.set(field, new_value)
+                return True
+        return False
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.buffer)
+
+    def write(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.view)
+
+
+def is_binary_save(path) -> bool:
+    """True if the file starts with a BinaryFormatter serialization header."""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(17)
+    except OSError:
+        return False
+    if len(head) < 17 or head[0] != _HEADER:
+        return False
+    _, header_id, major, minor = struct.unpack_from('<iiii', head, 1)
+    return major == 1 and minor == 0
+
+
+def normalize_member_name(name: str) -> str:
+    """'<Money>k__BackingField' -> 'money' (auto-property backing fields)."""
+    if name.startswith('<') and '>' in name:
+        name = name[1:name.index('>')]
+    return name.lower()
+
+
+class _Parser:
+    def __init__(self, save: BinarySave):
+        self.save = save
+        self.view = save.view
+        self.pos = 0
+        self.classes = {}   # object id -> (class name, [(member name, binary type, extra)])
+        self.objects = {}   # object id -> parsed value
+
+    def parse(self):
+        if len(self.view) < 17 or self.view[0] != _HEADER:
+            raise BinarySaveError("Missing BinaryFormatter header")
+        self.pos = 1
+        root_id = self._i32()
+        self.pos += 12  # header id, major, minor version
+        while True:
+            if self.pos >= len(self.view):
+                raise BinarySaveError("Stream ended without MessageEnd")
+            if self.view[self.pos] == _MESSAGE_END:
+                self.pos += 1
+                break
+            try:
+                self._record("")
+            except (struct.error, IndexError, KeyError, UnicodeDecodeError) as e:
+                raise BinarySaveError(f"Malformed record near offset {self.pos}: {e}")
+        self.save.root = self.objects.get(root_id)
+
+    # --- primitives ---
+
+    def _u8(self) -> int:
+        value = self.view[self.pos]
+        self.pos += 1
+        return value
+
+    def _i32(self) -> int:
+        value = struct.unpack_from('<i', self.view, self.pos)[0]
+        self.pos += 4
+        return value
+
+    def _left(self) -> int:
+        return len(self.view) - self.pos
+
+    def _array_length(self) -> int:
+        length = self._i32()
+        if length < 0:
+            raise BinarySaveError(f"Negative array length at {self.pos - 4}")
+        return length
+
+    def _string(self) -> str:
+        length = shift = 0
+        while True:
+            byte = self._u8()
+            length |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                break
+            shift += 7
+            if shift > 28:
+                raise BinarySaveError(f"Bad string length at {self.pos}")
+        end = self.pos + length
+        if end > len(self.view):
+            raise BinarySaveError("String runs past the end of the data")
+        value = str(self.view[self.pos:end], 'utf-8')
+        self.pos = end
+        return value
+
+    def _primitive(self, ptype: int, name: str, path: str):
+        fmt = _PRIMITIVE_FORMATS.get(ptype)
+        if fmt is not None:
+            offset = self.pos
+            value = struct.unpack_from(fmt, self.view, offset)[0]
+            self.pos += struct.calcsize(fmt)
+            if name:
+                self.save.fields.append(BinaryField(name, path, offset, fmt))
+            return value
+        if ptype in (_PT_STRING, _PT_DECIMAL):
+            return self._string()
+        if ptype == _PT_CHAR:
+            first = self.view[self.pos]
+            width = 1 if first < 0x80 else 2 if first < 0xE0 else 3 if first < 0xF0 else 4
+            value = str(self.view[self.pos:self.pos + width], 'utf-8')
+            self.pos += width
+            return value
+        if ptype == _PT_NULL:
+            return None
+        raise BinarySaveError(f"Unsupported primitive type {ptype}")
+
+    # --- records ---
+
+    def _record(self, path: str):
+        """Reads one record; returns (value, null_count) where null_count > 0 for null runs."""
+        kind = self._u8()
+        if kind in (_CLASS_WITH_MEMBERS_AND_TYPES, _SYSTEM_CLASS_WITH_MEMBERS_AND_TYPES):
+            return self._class_with_types(kind == _CLASS_WITH_MEMBERS_AND_TYPES, path), 0
+        if kind == _CLASS_WITH_ID:
+            object_id = self._i32()
+            metadata_id = self._i32()
+            if metadata_id not in self.classes:
+                raise BinarySaveError(f"Unknown class metadata {metadata_id}")
+            class_name, members = self.classes[metadata_id]
+            self.classes[object_id] = (class_name, members)
+            return self._members(object_id, class_name, members, path), 0
+        if kind == _OBJECT_STRING:
+            object_id = self._i32()
+            value = self.objects[object_id] = self._string()
+            return value, 0
+        if kind == _MEMBER_PRIMITIVE_TYPED:
+            return self._primitive(self._u8(), "", path), 0
+        if kind == _MEMBER_REFERENCE:
+            return {'__ref__': self._i32()}, 0
+        if kind == _OBJECT_NULL:
+            return None, 1
+        if kind == _NULL_MULTIPLE_256:
+            return None, self._u8()
+        if kind == _NULL_MULTIPLE:
+            return None, self._i32()
+        if kind == _LIBRARY:
+            self._i32()
+            self._string()
+            return self._record(path)
+        if kind == _ARRAY_SINGLE_PRIMITIVE:
+            object_id = self._i32()
+            length = self._array_length()
+            ptype = self._u8()
+            value = self.objects[object_id] = self._primitive_array(ptype, length)
+            return value, 0
+        if kind in (_ARRAY_SINGLE_OBJECT, _ARRAY_SINGLE_STRING):
+            object_id = self._i32()
+            value = self.objects[object_id] = self._object_array(self._array_length(), path)
+            return value, 0
+        if kind == _BINARY_ARRAY:
+            return self._binary_array(path), 0
+        raise BinarySaveError(f"Unsupported record type {kind} at offset {self.pos - 1}")
+
+    def _class_with_types(self, has_library: bool, path: str):
+        object_id = self._i32()
+        class_name = self._string()
+        names = [self._string() for _ in range(self._i32())]
+        types = [self._u8() for _ in names]
+        members = []
+        for name, btype in zip(names, types):
+            extra = None
+            if btype in (_BT_PRIMITIVE, _BT_PRIMITIVE_ARRAY):
+                extra = self._u8()
+            elif btype == _BT_SYSTEM_CLASS:
+                extra = self._string()
+            elif btype == _BT_CLASS:
+                extra = self._string()
+                self._i32()  # library id
+            members.append((name, btype, extra))
+        if has_library:
+            self._i32()
+        self.classes[object_id] = (class_name, members)
+        return self._members(object_id, class_name, members, path)
+
+    def _members(self, object_id: int, class_name: str, members, path: str) -> Dict:
+        obj = {'__class__': class_name}
+        self.objects[object_id] = obj
+        base = path or class_name
+        for name, btype, extra in members:
+            member_path = f"{base}.{name}"
+            if btype == _BT_PRIMITIVE:
+                obj[name] = self._primitive(extra, normalize_member_name(name), member_path)
+            else:
+                obj[name], _ = self._record(member_path)
+        return obj
+
+    def _primitive_array(self, ptype: int, length: int) -> list:
+        fmt = _PRIMITIVE_FORMATS.get(ptype)
+        if fmt is not None:
+            size = struct.calcsize(fmt)
+            end = self.pos + size * length
+            if end > len(self.view):
+                raise BinarySaveError("Array runs past the end of the data")
+            values = [v[0] for v in struct.iter_unpack(fmt, self.view[self.pos:end])]
+            self.pos = end
+            return values
+        # Strings and chars take at least one byte each
+        if length > self._left():
+            raise BinarySaveError("Array runs past the end of the data")
+        return [self._primitive(ptype, "", "") for _ in range(length)]
+
+    def _object_array(self, length: int, path: str) -> list:
+        if length > self._left() and length > MAX_SPARSE_ARRAY_LENGTH:
+            raise BinarySaveError(f"Array of {length} elements is longer than the data")
+        values = []
+        while len(values) < length:
+            value, nulls = self._record(f"{path}[{len(values)}]")
+            if nulls:
+                if nulls < 0 or nulls > length - len(values):
+                    raise BinarySaveError(f"Null run of {nulls} overflows {path or 'array'}")
+                values.extend([None] * nulls)
+            else:
+                values.append(value)
+        return values
+
+    def _binary_array(self, path: str) -> list:
+        object_id = self._i32()
+        array_type = self._u8()
+        rank = self._i32()
+        if rank < 0 or 4 * rank > self._left():
+            raise BinarySaveError(f"Bad array rank {rank}")
+        lengths = [self._array_length() for _ in range(rank)]
+        if array_type in (3, 4, 5):  # *Offset variants carry lower bounds
+            self.pos += 4 * rank
+        btype = self._u8()
+        extra = None
+        if btype in (_BT_PRIMITIVE, _BT_PRIMITIVE_ARRAY):
+            extra = self._u8()
+        elif btype == _BT_SYSTEM_CLASS:
+            extra = self._string()
+        elif btype == _BT_CLASS:
+            extra = self._string()
+            self._i32()
+        total = 1
+        for length in lengths:
+            total *= length
+        if btype == _BT_PRIMITIVE:
+            values = self._primitive_array(extra, total)
+        else:
+            values = self._object_array(total, path)
+        self.objects[object_id] = values
+        return values
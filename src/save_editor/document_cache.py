@@ -0,0 +1,58 @@
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from .file_lock import file_snapshot
+
+
+class DocumentCache:
+    """Parsed save documents kept in memory between edits (used by the local service).
+
+    An entry is only handed out while the file's (mtime_ns, size) still
+    matches, so a save written by the game is reparsed. Documents are
+    returned without copying: callers must hold the save lock while using
+    one and invalidate it if an edit fails half-way. At most max_entries
+    documents are kept, least recently used first out.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, save_path, snapshot=None):
+        """Cached document for the file as it is now (or as of snapshot), or None."""
+        key = str(Path(save_path))
+        snapshot = snapshot if snapshot is not None else file_snapshot(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != snapshot:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, save_path, document, snapshot=None):
+        key = str(Path(save_path))
+        snapshot = snapshot if snapshot is not None else file_snapshot(key)
+        if snapshot is None:
+            return
+        with self._lock:
+            self._entries[key] = (snapshot, document)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, save_path=None):
+        """Drops one document, or all of them when save_path is None."""
+        with self._lock:
+            if save_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(Path(save_path)), None)
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,181 @@
+import os
+import time
+import zlib
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Callable, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_FILENAME = ".smb.lock"
+
+
+class ConcurrentWriteError(IOError):
+    """The save changed on disk (e.g. game autosave) during a read-modify-write."""
+
+
+class SaveLockedError(IOError):
+    """Another editor held the save lock for longer than the timeout."""
+
+
+def file_snapshot(path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class SaveGuard:
+    """Held while one save is read, modified and written back."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.snapshot = file_snapshot(path)
+
+    def check(self):
+        """Raises ConcurrentWriteError if the file changed since the guard was taken."""
+        current = file_snapshot(self.path)
+        if current != self.snapshot:
+            raise ConcurrentWriteError(f"{self.path.name} was changed by another program during modification")
+
+
+class SaveLockManager:
+    """Coordinates writers of save files across threads and processes.
+
+    Each save directory gets one lock file; every save in it is locked as a
+    one-byte advisory range at an offset derived from its name, so the save
+    files themselves are never locked (the game must still be able to read
+    them). A per-save threading lock covers threads of this process, since
+    OS record locks are per-process.
+    """
+
+    def __init__(self, timeout: float = 10.0, retries: int = 3, retry_delay: float = 0.5):
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._registry_lock = threading.Lock()
+        self._thread_locks = {}
+        self._dir_fds = {}
+
+    @contextmanager
+    def lock(self, save_path):
+        """Exclusively locks one save; yields a SaveGuard for conflict detection."""
+        path = Path(save_path).absolute()
+        thread_lock = self._thread_lock_for(path)
+        if not thread_lock.acquire(timeout=self.timeout):
+            raise SaveLockedError(f"{path.name} is being modified by another task")
+        try:
+            fd = self._acquire_os_lock(path)
+            try:
+                yield SaveGuard(path)
+            finally:
+                self._release_os_lock(fd, path)
+        finally:
+            thread_lock.release()
+
+    def run(self, save_path, func: Callable[[SaveGuard], object]):
+        """Runs func(guard) under the save lock, retrying when a concurrent write is detected.
+
+        func must do the whole read-modify-write and call guard.check() right
+        before writing; it is re-run from scratch on conflict.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                with self.lock(save_path) as guard:
+                    return func(guard)
+            except ConcurrentWriteError:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.retry_delay)
+
+    def _thread_lock_for(self, path: Path) -> threading.Lock:
+        with self._registry_lock:
+            key = os.path.normcase(str(path))
+            if key not in self._thread_locks:
+                self._thread_locks[key] = threading.Lock()
+            return self._thread_locks[key]
+
+    def _acquire_os_lock(self, path: Path) -> Optional[int]:
+        fd = self._open_dir_lock(path.parent)
+        if fd is None:
+            return None
+
+        offset = _lock_offset(path)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                with self._registry_lock:
+                    _lock_range(fd, offset, exclusive=True)
+                return fd
+            except OSError:
+                if time.monotonic() >= deadline:
+                    self._close_dir_lock(path.parent)
+                    raise SaveLockedError(f"{path.name} is locked by another editor")
+                time.sleep(0.05)
+
+    def _release_os_lock(self, fd: Optional[int], path: Path):
+        if fd is None:
+            return
+        try:
+            with self._registry_lock:
+                _lock_range(fd, _lock_offset(path), exclusive=False)
+        finally:
+            self._close_dir_lock(path.parent)
+
+    def _open_dir_lock(self, directory: Path) -> Optional[int]:
+        # One shared descriptor per directory: on POSIX closing any descriptor
+        # of the lock file would drop every lock this process holds on it
+        with self._registry_lock:
+            key = os.path.normcase(str(directory))
+            entry = self._dir_fds.get(key)
+            if entry is None:
+                try:
+                    fd = os.open(str(directory / LOCK_FILENAME), os.O_RDWR | os.O_CREAT, 0o644)
+                except OSError:
+                    # Read-only directory: nothing else can write here either
+                    return None
+                entry = self._dir_fds[key] = [fd, 0]
+            entry[1] += 1
+            return entry[0]
+
+    def _close_dir_lock(self, directory: Path):
+        with self._registry_lock:
+            key = os.path.normcase(str(directory))
+            entry = self._dir_fds[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                os.close(entry[0])
+                del self._dir_fds[key]
+
+
+def _lock_range(fd: int, offset: int, exclusive: bool):
+    """Locks (exclusive=True, non-blocking) or unlocks one byte of the lock file."""
+    if fcntl:
+        fcntl.lockf(fd, (fcntl.LOCK_EX | fcntl.LOCK_NB) if exclusive else fcntl.LOCK_UN, 1, offset)
+    else:
+        os.lseek(fd, offset, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_NBLCK if exclusive else msvcrt.LK_UNLCK, 1)
+
+
+def _lock_offset(path: Path) -> int:
+    return zlib.crc32(os.path.normcase(path.name).encode('utf-8')) & 0x7FFFFFFF
+
+
+_default_manager = None
+_default_lock = threading.Lock()
+
+
+def get_lock_manager() -> SaveLockManager:
+    """Process-wide lock manager shared by the editor, batch modifications and workers."""
+    global _default_manager
+    with _default_lock:
+        if _default_manager is None:
+            _default_manager = SaveLockManager()
+        return _default_manager
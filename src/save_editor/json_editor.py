@@ -1,62 +1,74 @@
 import json
 import shutil
 from pathlib import Path
+from typing import Optional
 from .backup_system import BackupSystem
+from .file_lock import get_lock_manager, file_snapshot
+from .stats_cache import StatsCache
+from .document_cache import DocumentCache
+from .binary_save import BinarySave, is_binary_save
+from src.tracing import traced, span, count
+
+# Stat name -> field names searched for it (first match wins), in JSON and binary saves
+STAT_FIELDS = {
+    'money': ['money', 'cash', 'balance', 'wallet', 'currentmoney'],
+    'level': ['storelevel', 'level'],
+    'xp': ['storeexperiencepoints', 'experience', 'xp'],
+    'points': ['storeexpansionpoints', 'upgradepoints', 'points'],
+    'rating': ['storerating', 'reputation', 'satisfaction', 'satisfactionpoints'],
+}
 
 class SaveEditor:
-    def __init__(self):
+    def __init__(self, documents: Optional[DocumentCache] = None):
         self.backup_system = BackupSystem()
+        self.lock_manager = get_lock_manager()
+        self.stats_cache = StatsCache()
+        # Optional: keep parsed documents between edits instead of re-reading the file
+        self.documents = documents
     
     def modify_money(self, save_path, amount, operation='add'):
         """Modifies money in the save file."""
-        return self._modify_field_generic(save_path, ['money', 'cash', 'balance', 'wallet', 'currentmoney'], amount, operation)
+        return self._modify_field_generic(save_path, STAT_FIELDS['money'], amount, operation)
 
     def modify_level(self, save_path, level):
         """Modifies store level."""
-        return self._modify_field_generic(save_path, ['storelevel', 'level'], level, 'set')
+        return self._modify_field_generic(save_path, STAT_FIELDS['level'], level, 'set')
 
     def modify_xp(self, save_path, xp):
         """Modifies store XP."""
-        return self._modify_field_generic(save_path, ['storeexperiencepoints', 'experience', 'xp'], xp, 'set')
+        return self._modify_field_generic(save_path, STAT_FIELDS['xp'], xp, 'set')
 
     def modify_store_points(self, save_path, points):
         """Modifies store upgrade/expansion points."""
-        return self._modify_field_generic(save_path, ['storeexpansionpoints', 'upgradepoints', 'points'], points, 'set')
+        return self._modify_field_generic(save_path, STAT_FIELDS['points'], points, 'set')
 
     def unlock_all_licenses(self, save_path):
         """Unlocks all product licenses and ensures they show up."""
-        try:
-            self.backup_system.create_backup(save_path)
-            with open(save_path, 'r', encoding='utf-8') as f:
-                save_data = json.load(f)
-            
-            # IDs 21-105 are typical stable product licenses. Going too high can break game logic.
-            safe_license_ids = list(range(21, 106))
-            
+        # IDs 21-105 are typical stable product licenses. Going too high can break game logic.
+        safe_license_ids = list(range(21, 106))
+
+        def unlock(save_data):
             # Update multiple potential license keys to ensure visibility
             l1 = self._update_list_field(save_data, ['unlockedlicenses', 'licenses'], safe_license_ids)
             l2 = self._update_list_field(save_data, ['m_unlockedproductlicenses', 'unlockedproductlicenses'], safe_license_ids)
-            
-            if l1 or l2:
-                self._save_es3_format(save_path, save_data)
-                return True
-            return False
+            return l1 or l2
+
+        try:
+            return self._edit_save(save_path, unlock)
         except Exception as e:
             print(f"Error unlocking licenses: {e}")
             return False
 
     def reset_licenses(self, save_path):
         """Resets licenses to basic (ID 21 only) to fix possible corruption."""
-        try:
-            self.backup_system.create_backup(save_path)
-            with open(save_path, 'r', encoding='utf-8') as f:
-                save_data = json.load(f)
-            
-            l1 = self._update_list_field(save_data, ['unlockedlicenses', 'licenses'], [21], overwrite=True)
-            l2 = self._update_list_field(save_data, ['m_unlockedproductlicenses', 'unlockedproductlicenses'], [21], overwrite=True)
-            
-            self._save_es3_format(save_path, save_data)
+        def reset(save_data):
+            self._update_list_field(save_data, ['unlockedlicenses', 'licenses'], [21], overwrite=True)
+            self._update_list_field(save_data, ['m_unlockedproductlicenses', 'unlockedproductlicenses'], [21], overwrite=True)
+            # Always rewrite so the file gets normalized ES3 formatting
             return True
+
+        try:
+            return self._edit_save(save_path, reset)
         except Exception as e:
             print(f"Error resetting licenses: {e}")
             return False
@@ -88,22 +100,14 @@ class SaveEditor:
 
     def modify_rating(self, save_path, rating):
         """Modifies store rating/satisfaction."""
-        return self._modify_field_generic(save_path, ['storerating', 'reputation', 'satisfaction', 'satisfactionpoints'], rating, 'set')
+        return self._modify_field_generic(save_path, STAT_FIELDS['rating'], rating, 'set')
 
     def boost_staff_stats(self, save_path, multiplier=10):
         """Boosts speed and accuracy for all hired employees."""
         try:
-            self.backup_system.create_backup(save_path)
-            with open(save_path, 'r', encoding='utf-8') as f:
-                save_data = json.load(f)
-            
-            modified = self._find_and_boost_staff(save_data, multiplier)
-            
-            if modified:
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    json.dump(save_data, f, indent=2)
-                return True
-            return False
+            return self._edit_save(save_path,
+                                   lambda save_data: self._find_and_boost_staff(save_data, multiplier),
+                                   write=self._save_plain_json)
         except Exception as e:
             print(f"Error boosting staff: {e}")
             return False
@@ -134,20 +138,94 @@ class SaveEditor:
 
     def _modify_field_generic(self, save_path, field_patterns, value, operation):
         try:
-            self.backup_system.create_backup(save_path)
-            with open(save_path, 'r', encoding='utf-8') as f:
-                save_data = json.load(f)
-            
-            modified = self._find_and_modify_field(save_data, field_patterns, value, operation)
-            
-            if modified:
-                self._save_es3_format(save_path, save_data)
-                return True
-            return False
+            if is_binary_save(save_path):
+                return self._edit_binary_save(save_path,
+                                              lambda save: save.modify_first(field_patterns, value, operation))
+            return self._edit_save(save_path,
+                                   lambda save_data: self._find_and_modify_field(save_data, field_patterns, value, operation))
         except Exception as e:
             print(f"Error modifying save: {e}")
             return False
 
+    @traced
+    def _edit_save(self, save_path, mutate, write=None):
+        """Backs up, loads, mutates and writes a save while holding its lock.
+
+        mutate(save_data) returns True if it changed anything; only then is the
+        save rewritten. If the game writes the file in the meantime the whole
+        attempt is repeated (see SaveLockManager.run).
+        """
+        write = write or self._save_es3_format
+
+        def attempt(guard):
+            backup = self.backup_system.create_backup_async(save_path)
+            save_data = self._load_document(save_path, guard.snapshot)
+            try:
+                with span("SaveEditor.modify", 'json_editor'):
+                    changed = mutate(save_data)
+                if not changed:
+                    return False
+
+                self._await_backup(backup)
+                with span("SaveEditor.safety_check", 'json_editor'):
+                    guard.check()
+                with span("SaveEditor.write", 'json_editor'):
+                    write(save_path, save_data)
+            except BaseException:
+                # A cached document may have been mutated without being written
+                if self.documents is not None:
+                    self.documents.invalidate(save_path)
+                raise
+            # The edited document is still in memory; no need to reparse it for the stats labels
+            snapshot = file_snapshot(save_path)
+            self.stats_cache.put(save_path, self._extract_stats(save_data), snapshot)
+            if self.documents is not None:
+                self.documents.put(save_path, save_data, snapshot)
+            return True
+
+        return self.lock_manager.run(save_path, attempt)
+
+    @traced
+    def _edit_binary_save(self, save_path, mutate):
+        """_edit_save for BinaryFormatter saves: fields are patched in place, the layout is kept."""
+        def attempt(guard):
+            backup = self.backup_system.create_backup_async(save_path)
+            with span("SaveEditor.load", 'json_editor', format='binary'):
+                save = BinarySave.from_file(save_path)
+            with span("SaveEditor.modify", 'json_editor'):
+                changed = mutate(save)
+            if not changed:
+                return False
+
+            self._await_backup(backup)
+            with span("SaveEditor.safety_check", 'json_editor'):
+                guard.check()
+            with span("SaveEditor.write", 'json_editor'):
+                save.write(save_path)
+            self.stats_cache.put(save_path, self._extract_binary_stats(save))
+            return True
+
+        return self.lock_manager.run(save_path, attempt)
+
+    def _load_document(self, save_path, snapshot):
+        if self.documents is not None:
+            cached = self.documents.get(save_path, snapshot)
+            if cached is not None:
+                count('documents.hits')
+                return cached
+        with span("SaveEditor.load", 'json_editor', format='json'):
+            with open(save_path, 'r', encoding='utf-8') as f:
+                save_data = json.load(f)
+        if self.documents is not None:
+            self.documents.put(save_path, save_data, snapshot)
+        return save_data
+
+    @traced
+    def _await_backup(self, backup):
+        """Blocks until the queued backup is durable; never overwrite a save without one."""
+        if backup is None or not backup.wait_durable():
+            raise IOError(f"Backup failed, refusing to overwrite save: {getattr(backup, 'error', None)}")
+
     def _save_es3_format(self, path, data):
         """Saves JSON with ES3-compatible formatting (Tabs, Spaces)."""
         content = json.dumps(data, indent="\t")
@@ -156,6 +234,10 @@ class SaveEditor:
         with open(path, 'w', encoding='utf-8') as f:
             f.write(content)
 
+    def _save_plain_json(self, path, data):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
     def _find_and_modify_field(self, data, field_patterns, new_val, operation):
         """Recursively search for fields matching patterns, handles ES3 'value' wrapper."""
         if isinstance(data, dict):
@@ -185,19 +267,36 @@ class SaveEditor:
         return False
     
     def get_current_stats(self, save_path):
-        """Reads current money, level, and XP from save file."""
+        """Reads current money, level, and XP from save file.
+
+        Served from the stats cache unless the file changed on disk since.
+        """
         try:
-            with open(save_path, 'r', encoding='utf-8') as f:
-                save_data = json.load(f)
-            return {
-                'money': self._find_field_value(save_data, ['money', 'cash', 'balance', 'wallet', 'currentmoney']),
-                'level': self._find_field_value(save_data, ['storelevel', 'level']),
-                'xp': self._find_field_value(save_data, ['storeexperiencepoints', 'experience', 'xp']),
-                'points': self._find_field_value(save_data, ['storeexpansionpoints', 'upgradepoints', 'points']),
-                'rating': self._find_field_value(save_data, ['storerating', 'reputation', 'satisfaction', 'satisfactionpoints'])
-            }
+            return self.read_stats(save_path)
         except Exception:
             return {'money': 0, 'level': 0, 'xp': 0, 'points': 0, 'rating': 0}
+
+    @traced
+    def read_stats(self, save_path):
+        """Like get_current_stats, but raises instead of returning zeros for unreadable saves."""
+        cached = self.stats_cache.get(save_path)
+        if cached is not None:
+            return cached
+        snapshot = file_snapshot(save_path)
+        if is_binary_save(save_path):
+            stats = self._extract_binary_stats(BinarySave.from_file(save_path))
+        else:
+            with open(save_path, 'r', encoding='utf-8') as f:
+                save_data = json.load(f)
+            stats = self._extract_stats(save_data)
+        self.stats_cache.put(save_path, stats, snapshot)
+        return stats
+
+    def _extract_stats(self, save_data):
+        return {stat: self._find_field_value(save_data, fields) for stat, fields in STAT_FIELDS.items()}
+
+    def _extract_binary_stats(self, save):
+        return {stat: save.value_of(fields) for stat, fields in STAT_FIELDS.items()}
             
     def _find_field_value(self, data, field_patterns):
         """Recursively retrieve field value, handles ES3 'value' wrapper."""
@@ -0,0 +1,198 @@
+"""Structural diff of two saves using bottom-up (Merkle) subtree hashes.
+
+Every dict/list gets a hash built from its children's hashes in one pass
+per document. The diff then walks both trees together and skips any
+subtree whose hashes match in O(1), so the cost beyond hashing is
+proportional to the changed paths, not to the size of the save.
+
+Hashes use Python's built-in hash() on (type, value) tuples: fast C code,
+stable within one process, which is all an in-memory diff needs. hash() is
+not collision-free (hash(-1) == hash(-2)), so equal hashes are only a hint:
+a node is skipped once its type and == confirm it, a C-level compare that
+only ever touches unchanged parts. Dict hashes follow key order, so a
+reordered object is walked (and reports nothing) rather than skipped.
+"""
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+
+from .binary_save import BinarySave, is_binary_save
+from .file_lock import file_snapshot
+from src.tracing import traced
+
+
+class MerkleTree:
+    """Subtree hashes of one parsed document, keyed by id() of each container.
+
+    The document must stay alive and unmodified while the tree is used.
+    """
+
+    __slots__ = ('document', 'hashes', 'root_hash')
+
+    def __init__(self, document):
+        self.document = document
+        self.hashes = {}
+        kind = type(document)
+        self.root_hash = self._hash(document) if kind is dict or kind is list else hash((kind, document))
+
+    def hash_of(self, node) -> int:
+        kind = type(node)
+        if kind is dict or kind is list:
+            return self.hashes[id(node)]
+        return hash((kind, node))
+
+    def _hash(self, node) -> int:
+        # Hot loop over every value of the save: leaves are hashed inline
+        # together with their type, which keeps 1, 1.0 and True apart
+        hash_node = self._hash
+        if type(node) is dict:
+            pairs = []
+            for key, value in node.items():
+                kind = type(value)
+                pairs.append((key, hash_node(value) if kind is dict or kind is list else hash((kind, value))))
+            digest = hash((dict, tuple(pairs)))
+        else:
+            items = []
+            for value in node:
+                kind = type(value)
+                items.append(hash_node(value) if kind is dict or kind is list else hash((kind, value)))
+            digest = hash((list, tuple(items)))
+        self.hashes[id(node)] = digest
+        return digest
+
+
+@traced
+def diff_trees(old: MerkleTree, new: MerkleTree, limit: int = 10000) -> List[Dict]:
+    """Changed paths between two documents: [{'path', 'change', 'old', 'new'}].
+
+    change is 'added', 'removed' or 'changed'. Lists are compared by index
+    (a shorter list reports its missing tail as removed/added). At most
+    limit changes are returned.
+    """
+    changes = []
+    if _differs(old, new, old.document, new.document):
+        _diff_node(old, new, old.document, new.document, "", changes, limit)
+    return changes
+
+
+def diff_documents(old_document, new_document, limit: int = 10000) -> List[Dict]:
+    return diff_trees(_build_tree(old_document), _build_tree(new_document), limit)
+
+
+@traced
+def _build_tree(document) -> MerkleTree:
+    return MerkleTree(document)
+
+
+def _differs(old_tree, new_tree, old, new) -> bool:
+    if old is new:
+        return False
+    if old_tree.hash_of(old) != new_tree.hash_of(new):
+        return True
+    # Same hash: a collision unless type and value agree too (NaN, which json
+    # accepts, never equals itself but is not a change)
+    return type(old) is not type(new) or (old != new and not (old != old and new != new))
+
+
+def _diff_node(old_tree, new_tree, old, new, path, changes, limit):
+    """Walks two nodes known to differ."""
+    if len(changes) >= limit:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, old_value in old.items():
+            child_path = f"{path}.{key}" if path else str(key)
+            if key not in new:
+                changes.append({'path': child_path, 'change': 'removed', 'old': old_value, 'new': None})
+            elif _differs(old_tree, new_tree, old_value, new[key]):
+                _diff_node(old_tree, new_tree, old_value, new[key], child_path, changes, limit)
+            if len(changes) >= limit:
+                return
+        for key, new_value in new.items():
+            if len(changes) >= limit:
+                return
+            if key not in old:
+                child_path = f"{path}.{key}" if path else str(key)
+                changes.append({'path': child_path, 'change': 'added', 'old': None, 'new': new_value})
+    elif isinstance(old, list) and isinstance(new, list):
+        common = min(len(old), len(new))
+        for i in range(common):
+            if _differs(old_tree, new_tree, old[i], new[i]):
+                _diff_node(old_tree, new_tree, old[i], new[i], f"{path}[{i}]", changes, limit)
+                if len(changes) >= limit:
+                    return
+        room = limit - len(changes)
+        for i in range(common, min(len(old), common + room)):
+            changes.append({'path': f"{path}[{i}]", 'change': 'removed', 'old': old[i], 'new': None})
+        room = limit - len(changes)
+        for i in range(common, min(len(new), common + room)):
+            changes.append({'path': f"{path}[{i}]", 'change': 'added', 'old': None, 'new': new[i]})
+    else:
+        # A changed leaf or a type change
+        changes.append({'path': path, 'change': 'changed', 'old': old, 'new': new})
+
+
+@traced
+def load_document(path):
+    """Parsed save as nested dicts/lists; binary saves become {field path: value}."""
+    if is_binary_save(path):
+        save = BinarySave.from_file(path)
+        return {field.path: save.get(field) for field in save.fields}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def diff_files(old_path, new_path, limit: int = 10000) -> List[Dict]:
+    return diff_documents(load_document(old_path), load_document(new_path), limit)
+
+
+class TreeCache:
+    """Hashed trees per file, reused while the file's (mtime_ns, size) is unchanged.
+
+    Diffing a save against several backups (or the same pair again) then
+    parses and hashes each file only once.
+    """
+
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # path -> (snapshot, MerkleTree)
+        self._lock = threading.Lock()
+
+    def tree_for(self, path) -> MerkleTree:
+        key = str(path)
+        snapshot = file_snapshot(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == snapshot:
+                self._entries.move_to_end(key)
+                return entry[1]
+        tree = _build_tree(load_document(path))
+        with self._lock:
+            self._entries[key] = (snapshot, tree)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return tree
+
+    def diff(self, old_path, new_path, limit: int = 10000) -> List[Dict]:
+        return diff_trees(self.tree_for(old_path), self.tree_for(new_path), limit)
+
+
+def format_diff(changes: List[Dict], max_lines: int = 200) -> str:
+    """Human-readable list of changes, one per line."""
+    lines = []
+    for change in changes[:max_lines]:
+        if change['change'] == 'changed':
+            lines.append(f"~ {change['path']}: {_short(change['old'])} -> {_short(change['new'])}")
+        elif change['change'] == 'added':
+            lines.append(f"+ {change['path']}: {_short(change['new'])}")
+        else:
+            lines.append(f"- {change['path']}: {_short(change['old'])}")
+    if len(changes) > max_lines:
+        lines.append(f"... and {len(changes) - max_lines} more")
+    return "\n".join(lines)
+
+
+def _short(value, width=60) -> str:
+    text = json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else repr(value)
+    return text if len(text) <= width else text[:width - 3] + "..."
@@ -0,0 +1,46 @@
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from .file_lock import file_snapshot
+
+
+class StatsCache:
+    """Last extracted stats per save, valid while the file's (mtime_ns, size) is unchanged.
+
+    Entries are filled from the in-memory document after each edit, so a
+    lookup only costs one stat() unless the game changed the file.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, save_path) -> Optional[Dict]:
+        key = str(Path(save_path))
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        snapshot, stats = entry
+        if file_snapshot(key) != snapshot:
+            self.invalidate(key)
+            return None
+        return dict(stats)
+
+    def put(self, save_path, stats: Dict, snapshot=None):
+        """Stores stats; snapshot defaults to the file's current (mtime_ns, size)."""
+        key = str(Path(save_path))
+        snapshot = snapshot if snapshot is not None else file_snapshot(key)
+        if snapshot is None:
+            return
+        with self._lock:
+            self._entries[key] = (snapshot, dict(stats))
+
+    def invalidate(self, save_path=None):
+        """Drops one entry, or all of them when save_path is None."""
+        with self._lock:
+            if save_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(Path(save_path)), None)
@@ -0,0 +1,348 @@
+"""Local JSON-RPC 2.0 service that keeps parsed saves and the scan index in memory.
+
+    python money_mods.py serve --port 8765
+
+POST a JSON-RPC request (or a batch array) to http://127.0.0.1:<port>/ with
+Content-Type: application/json and the token printed on start as
+"Authorization: Bearer <token>":
+
+    {"jsonrpc": "2.0", "id": 1, "method": "edit",
+     "params": {"path": "slot1.json", "command": "money", "value": 5000}}
+
+Requests with an Origin header (browsers) or an unexpected Host are refused,
+and paths must lie inside the detected save folders or a --root directory.
+
+Methods: ping, stats, edit, batch_edit, scan, backup, diff, invalidate. Cached
+documents and scan entries are keyed by the file's (mtime_ns, size), so a
+save changed by the game is reloaded on its next use.
+"""
+import sys
+import hmac
+import json
+import secrets
+import os
+import inspect
+import threading
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from src.cli import EDIT_COMMANDS, expand_paths, json_default
+from src.save_editor.json_editor import SaveEditor
+from src.save_editor.document_cache import DocumentCache
+from src.save_editor.file_lock import file_snapshot
+from src.save_editor.save_diff import TreeCache
+from src.save_editor.backup_worker import get_backup_worker
+
+DEFAULT_PORT = 8765
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+class RPCError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class ScanIndex:
+    """Analyzed save info per file, reused while the file's (mtime_ns, size) is unchanged.
+
+    A rescan still walks the directories, but only new or changed files are
+    hashed and parsed again.
+    """
+
+    def __init__(self, scanner=None):
+        from src.save_detection.save_scanner import SupermarketSaveScanner
+        self.scanner = scanner or SupermarketSaveScanner()
+        self._entries = {}   # path -> (snapshot, save_info)
+        self._lock = threading.Lock()
+        self._game_dirs = None
+
+    def game_directories(self) -> List[str]:
+        """Save folders from game detection, detected once per service lifetime."""
+        if self._game_dirs is None:
+            # Locations only: scan() and the path checks list the files themselves
+            self._game_dirs = self.scanner.detect_game_installation(scan_saves=False)['saves']
+        return self._game_dirs
+
+    def scan(self, directories) -> List[Dict]:
+        results = []
+        for directory in directories:
+            directory = Path(directory)
+            if directory.is_file():
+                candidates = [directory]
+            elif directory.is_dir():
+                candidates = self.scanner._find_candidate_files(directory)
+            else:
+                raise FileNotFoundError(f"No such file or directory: {directory}")
+
+            for file_path in candidates:
+                info = self._analyze(file_path)
+                if info:
+                    results.append(info)
+            self._forget_missing(directory, candidates)
+        return results
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(Path(path)), None)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _analyze(self, file_path: Path) -> Optional[Dict]:
+        key = str(file_path)
+        snapshot = file_snapshot(key)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] == snapshot:
+            return entry[1]
+        info = self.scanner._analyze_save_file(file_path)
+        if info is not None:
+            with self._lock:
+                self._entries[key] = (snapshot, info)
+        return info
+
+    def _forget_missing(self, directory: Path, candidates):
+        present = {str(p) for p in candidates}
+        # The separator keeps /saves from also matching /saves2
+        prefix = os.path.join(str(directory), '')
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix) and k not in present]:
+                del self._entries[key]
+
+
+class SaveService:
+    """JSON-RPC method dispatch over one shared, cache-backed SaveEditor."""
+
+    def __init__(self, workers: int = 4, max_documents: int = 16, roots=None):
+        # Directories the service may touch besides the detected save folders
+        self.roots = [Path(root).resolve() for root in roots or []]
+        self.editor = SaveEditor(documents=DocumentCache(max_documents))
+        self.index = ScanIndex()
+        self.trees = TreeCache()
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rpc-batch")
+        self.methods = {
+            'ping': self.ping,
+            'stats': self.stats,
+            'edit': self.edit,
+            'batch_edit': self.batch_edit,
+            'scan': self.scan,
+            'backup': self.backup,
+            'diff': self.diff,
+            'invalidate': self.invalidate,
+        }
+
+    # --- methods ---
+
+    def ping(self):
+        return {'documents': len(self.editor.documents), 'indexed_saves': len(self.index)}
+
+    def stats(self, path):
+        return self.editor.read_stats(self._existing_file(path))
+
+    def edit(self, path, command, value=None, operation='add'):
+        path = self._existing_file(path)
+        ok = self._call_edit(path, command, value, operation)
+        return {'ok': ok, 'stats': self.editor.read_stats(path) if ok else None}
+
+    def batch_edit(self, paths, command, value=None, operation='add'):
+        if command not in EDIT_COMMANDS:
+            raise RPCError(INVALID_PARAMS, f"Unknown edit command: {command}")
+        futures = [(path, self.pool.submit(self.edit, str(path), command, value, operation))
+                   for path in expand_paths(paths)]
+        results = []
+        for path, future in futures:
+            try:
+                result = future.result()
+                result['path'] = str(path)
+            except Exception as e:
+                result = {'path': str(path), 'ok': False, 'error': str(e)}
+            results.append(result)
+        return results
+
+    def scan(self, paths=None):
+        directories = [self._allowed(p) for p in expand_paths(paths)] if paths else self.index.game_directories()
+        return self.index.scan(directories)
+
+    def backup(self, path):
+        backup_path = self.editor.backup_system.create_backup(self._existing_file(path))
+        if not backup_path:
+            raise RPCError(SERVER_ERROR, f"Backup of {path} failed")
+        return {'backup': str(backup_path)}
+
+    def diff(self, old, new, limit=1000):
+        changes = self.trees.diff(self._existing_file(old), self._existing_file(new), limit)
+        return {'changes': changes, 'count': len(changes)}
+
+    def invalidate(self, path=None):
+        if path is not None:
+            path = str(self._allowed(path))
+        self.editor.documents.invalidate(path)
+        self.editor.stats_cache.invalidate(path)
+        self.index.invalidate(path)
+        return True
+
+    # --- dispatch ---
+
+    def handle_payload(self, payload: bytes) -> Optional[bytes]:
+        """Handles one request or a batch; returns the response body (None for notifications only)."""
+        try:
+            request = json.loads(payload)
+        except ValueError as e:
+            return self._encode(_error_response(None, PARSE_ERROR, f"Parse error: {e}"))
+
+        if isinstance(request, list):
+            if not request:
+                return self._encode(_error_response(None, INVALID_REQUEST, "Empty batch"))
+            responses = [r for r in (self.handle(item) for item in request) if r is not None]
+            return self._encode(responses) if responses else None
+        response = self.handle(request)
+        return self._encode(response) if response is not None else None
+
+    def handle(self, request) -> Optional[Dict]:
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return _error_response(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get('id')
+        is_notification = 'id' not in request
+        method = self.methods.get(request['method'])
+        params = request.get('params') or {}
+        try:
+            if method is None:
+                raise RPCError(METHOD_NOT_FOUND, f"Method not found: {request['method']}")
+            args, kwargs = ((), params) if isinstance(params, dict) else (params, {})
+            try:
+                inspect.signature(method).bind(*args, **kwargs)
+            except TypeError as e:
+                raise RPCError(INVALID_PARAMS, str(e))
+            result = method(*args, **kwargs)
+        except RPCError as e:
+            return None if is_notification else _error_response(request_id, e.code, str(e))
+        except Exception as e:
+            return None if is_notification else _error_response(request_id, SERVER_ERROR, str(e))
+        if is_notification:
+            return None
+        return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+    def allowed_roots(self) -> List[Path]:
+        return self.roots + [Path(d).resolve() for d in self.index.game_directories()]
+
+    def _allowed(self, path) -> Path:
+        """path resolved, if it lies inside an allowed root (symlinks and '..' included)."""
+        resolved = Path(path).resolve()
+        for root in self.allowed_roots():
+            if resolved == root or root in resolved.parents:
+                return resolved
+        raise RPCError(INVALID_PARAMS, f"Path outside the save directories: {path}")
+
+    def _existing_file(self, path) -> Path:
+        path = self._allowed(path)
+        if not path.is_file():
+            raise RPCError(INVALID_PARAMS, f"No such file: {path}")
+        return path
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+        get_backup_worker().flush(timeout=30)
+
+    def _call_edit(self, path, command, value, operation):
+        if command not in EDIT_COMMANDS:
+            raise RPCError(INVALID_PARAMS, f"Unknown edit command: {command}")
+        method_name, value_type, _ = EDIT_COMMANDS[command]
+        method = getattr(self.editor, method_name)
+        if value_type is None:
+            return method(path)
+        if value is None:
+            raise RPCError(INVALID_PARAMS, f"'{command}' requires a value")
+        if command == 'money':
+            return method(path, value_type(value), operation)
+        return method(path, value_type(value))
+
+    def _encode(self, response) -> bytes:
+        return json.dumps(response, default=json_default).encode('utf-8')
+
+
+def _error_response(request_id, code, message) -> Dict:
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+
+class _RPCRequestHandler(BaseHTTPRequestHandler):
+    # set by make_server
+    service = None
+    token = None
+    allowed_hosts = ()
+
+    def do_POST(self):
+        rejection = self._rejection()
+        if rejection:
+            self.send_error(*rejection)
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.service.handle_payload(self.rfile.read(length))
+        if body is None:
+            self.send_response(204)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _rejection(self):
+        """(status, reason) if the request must not reach the service, else None."""
+        # Browsers always send Origin on cross-site POSTs; local clients do not
+        if self.headers.get('Origin') is not None:
+            return 403, "Cross-origin requests are not allowed"
+        # Guards against DNS rebinding, where Origin would look same-site
+        if self.headers.get('Host') not in self.allowed_hosts:
+            return 403, "Unexpected Host header"
+        supplied = self.headers.get('Authorization', '').encode('latin-1', 'replace')
+        if not hmac.compare_digest(supplied, f"Bearer {self.token}".encode('ascii')):
+            return 401, "Missing or wrong token"
+        content_type = (self.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            return 415, "Content-Type must be application/json"
+        return None
+
+    def log_message(self, format, *args):
+        pass  # one line per request would drown the useful output
+
+
+def make_server(service: SaveService, token: str, host: str = '127.0.0.1',
+                port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """HTTP server bound to localhost; each client request runs on its own thread."""
+    handler = type('RPCRequestHandler', (_RPCRequestHandler,), {'service': service, 'token': token})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    port = server.server_address[1]
+    handler.allowed_hosts = {f"{name}:{port}" for name in (host, '127.0.0.1', 'localhost')}
+    return server
+
+
+def serve(host: str = '127.0.0.1', port: int = DEFAULT_PORT, workers: int = 4, roots=None) -> int:
+    service = SaveService(workers=workers, roots=roots)
+    # New on every launch, so only whoever can read this output can call the service
+    token = secrets.token_urlsafe(32)
+    # Detect the allowed save folders now rather than during the first request
+    service.allowed_roots()
+    server = make_server(service, token, host, port)
+    print(f"Save service listening on http://{host}:{server.server_address[1]}/", file=sys.stderr)
+    print(f"Token (send as 'Authorization: Bearer <token>'): {token}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
@@ -0,0 +1,77 @@
+import sys
+import time
+import builtins
+
+_active = None
+
+
+class StartupProfile:
+    """Collects an import and init timing breakdown for `money_mods.py --profile-startup`."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.marks = []      # (label, seconds since previous mark)
+        self.imports = {}    # top-level module -> inclusive seconds of its first import
+        self._original_import = None
+        self._depth = 0
+
+    def mark(self, label):
+        now = time.perf_counter()
+        self.marks.append((label, now - self.last))
+        self.last = now
+
+    def install_import_hook(self):
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def remove_import_hook(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, *args, **kwargs):
+        top = name.partition('.')[0]
+        # Only time the outermost first import of a module; nested imports are included in it
+        if self._depth or not name or name in sys.modules:
+            return self._original_import(name, *args, **kwargs)
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, *args, **kwargs)
+        finally:
+            self._depth -= 1
+            key = name if top == 'src' else top
+            self.imports[key] = self.imports.get(key, 0.0) + time.perf_counter() - start
+
+    def report(self) -> str:
+        total = time.perf_counter() - self.started
+        lines = ["Startup timing breakdown:", "  Phases:"]
+        for label, seconds in self.marks:
+            lines.append(f"    {label:<32}{seconds * 1000:8.1f} ms")
+        lines.append("  Imports (first import, inclusive):")
+        for module, seconds in sorted(self.imports.items(), key=lambda item: -item[1])[:15]:
+            lines.append(f"    {module:<32}{seconds * 1000:8.1f} ms")
+        lines.append(f"  Total{'':<29}{total * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+
+def start() -> StartupProfile:
+    global _active
+    _active = StartupProfile()
+    _active.install_import_hook()
+    return _active
+
+
+def stop():
+    global _active
+    profile, _active = _active, None
+    if profile:
+        profile.remove_import_hook()
+    return profile
+
+
+def mark(label):
+    """Records a startup phase; a no-op unless profiling is active."""
+    if _active is not None:
+        _active.mark(label)
@@ -0,0 +1,177 @@
+"""Spans and counters around the slow stages (scanning, hashing, parsing, edits, backups).
+
+Disabled by default; then a traced function costs one global lookup. Enable it
+for a run and attach the trace to a "it's slow" report:
+
+    python money_mods.py --trace trace.json scan ~/saves
+    MONEY_BOOSTER_TRACE=trace.json python money_mods.py      (GUI)
+
+The file loads in chrome://tracing or https://ui.perfetto.dev; a summary
+table is printed to stderr when the run ends.
+"""
+import os
+import json
+import time
+import functools
+import threading
+from typing import Dict, Optional
+
+TRACE_ENV = "MONEY_BOOSTER_TRACE"
+
+_tracer = None
+
+
+class Tracer:
+    def __init__(self):
+        self.started = time.perf_counter_ns()
+        self.events = []       # (name, category, start_ns, duration_ns, thread id, args)
+        self.counters = {}     # name -> running total
+        self.samples = []      # (name, time_ns, total) for the counter tracks
+        self.threads = {}      # thread id -> name
+        self._lock = threading.Lock()
+
+    def add_span(self, name, category, start_ns, duration_ns, args=None):
+        thread = threading.current_thread()
+        self.threads.setdefault(thread.ident, thread.name)
+        self.events.append((name, category, start_ns, duration_ns, thread.ident, args))
+
+    def count(self, name, value=1):
+        with self._lock:
+            total = self.counters.get(name, 0) + value
+            self.counters[name] = total
+            self.samples.append((name, time.perf_counter_ns(), total))
+
+    def to_chrome_trace(self) -> Dict:
+        """Trace Event Format: complete ('X') events per span, 'C' events per counter update."""
+        pid = os.getpid()
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                  for tid, name in self.threads.items()]
+        for name, category, start_ns, duration_ns, tid, args in list(self.events):
+            event = {'name': name, 'cat': category, 'ph': 'X', 'pid': pid, 'tid': tid,
+                     'ts': (start_ns - self.started) / 1000, 'dur': duration_ns / 1000}
+            if args:
+                event['args'] = {key: str(value) for key, value in args.items()}
+            events.append(event)
+        for name, time_ns, total in list(self.samples):
+            events.append({'name': name, 'ph': 'C', 'pid': pid, 'ts': (time_ns - self.started) / 1000,
+                           'args': {'value': total}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    def summary(self) -> str:
+        """Calls, total, mean and max time per span name (inclusive), slowest total first."""
+        stats = {}
+        for name, _, _, duration_ns, _, _ in list(self.events):
+            entry = stats.setdefault(name, [0, 0, 0])
+            entry[0] += 1
+            entry[1] += duration_ns
+            entry[2] = max(entry[2], duration_ns)
+        wall = (time.perf_counter_ns() - self.started) / 1e6
+        lines = [f"Trace summary ({wall:.1f} ms wall):",
+                 f"  {'span':<44}{'calls':>7}{'total ms':>11}{'mean ms':>10}{'max ms':>10}"]
+        for name, (calls, total, longest) in sorted(stats.items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {name:<44}{calls:>7}{total / 1e6:>11.2f}{total / calls / 1e6:>10.3f}{longest / 1e6:>10.2f}")
+        if self.counters:
+            lines.append("  Counters:")
+            for name, total in sorted(self.counters.items()):
+                lines.append(f"    {name:<42}{total:>12,}")
+        return "\n".join(lines)
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'category', 'args', 'start')
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.add_span(self.name, self.category, self.start,
+                             time.perf_counter_ns() - self.start, self.args)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def enable() -> Tracer:
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+
+def disable() -> Optional[Tracer]:
+    """Stops tracing and returns the collected trace (None if tracing was off)."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def is_enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name, category='app', **args):
+    """Context manager timing a block; a shared no-op object while tracing is off."""
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, name, category, args)
+
+
+def count(name, value=1):
+    tracer = _tracer
+    if tracer is not None:
+        tracer.count(name, value)
+
+
+def traced(func):
+    """Decorator recording each call of func as a span named after its qualified name."""
+    name = func.__qualname__
+    category = func.__module__.rpartition('.')[2]
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        tracer = _tracer
+        if tracer is None:
+            return func(*args, **kwargs)
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            tracer.add_span(name, category, start, time.perf_counter_ns() - start)
+    return wrapper
+
+
+def finish(path, out=None):
+    """Stops tracing, writes the Chrome trace to path and prints the summary (to stderr by default)."""
+    import sys
+    tracer = disable()
+    if tracer is None:
+        return None
+    try:
+        tracer.write_chrome_trace(path)
+        print(f"Trace written to {path}", file=out or sys.stderr)
+    except OSError as e:
+        print(f"Could not write trace: {e}", file=out or sys.stderr)
+    print(tracer.summary(), file=out or sys.stderr)
+    return tracer
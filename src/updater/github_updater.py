@@ -1,34 +1,90 @@
 import requests
 import zipfile
-import io
+import hashlib
+import json
+import re
 import os
 import shutil
+import time
+from glob import escape as glob_escape
 from pathlib import Path
+from urllib.parse import quote
+
+from .manifest import MANIFEST_NAME, changed_files, validate_manifest
+from .update_cache import UpdateCheckCache
+from .staged_applier import StagedUpdateApplier
+
+CHUNK_SIZE = 64 * 1024
+DOWNLOAD_RETRIES = 5
+_SHA256_RE = re.compile(r'sha-?256\W+([0-9a-fA-F]{64})', re.IGNORECASE)
+
+
+class ChecksumMismatchError(IOError):
+    """The downloaded archive does not match the published SHA-256."""
+
 
 class GitHubUpdater:
-    def __init__(self, repo_owner, repo_name, current_version):
+    def __init__(self, repo_owner, repo_name, current_version, download_path="update_temp.zip"):
         self.repo_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}"
+        self.raw_url = f"https://raw.githubusercontent.com/{repo_owner}/{repo_name}"
         self.current_version = current_version
+        # Partial downloads are kept here so an interrupted update resumes
+        self.download_path = Path(download_path)
+        self.cache = UpdateCheckCache()
+        self.delta_manifest = None  # set when the last download was a delta
+        # One pooled session: keep-alive connections are reused across checks and downloads
+        self.session = requests.Session()
+        self.session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4))
     
-    def check_for_updates(self):
+    def check_for_updates(self, force=False):
+        """Checks the latest release, using the on-disk cache where possible.
+
+        Within the cache TTL no request is made at all; after it the request
+        is conditional (ETag / Last-Modified) and a 304 reuses the cached
+        release. force skips the TTL but still sends the validators.
+        """
+        url = f"{self.repo_url}/releases/latest"
         try:
-            response = requests.get(f"{self.repo_url}/releases/latest", timeout=5)
-            if response.status_code == 200:
-                latest_release = response.json()
-                latest_version = latest_release.get('tag_name', '').lstrip('v')
-                
-                if self.is_newer(latest_version):
-                    return {
-                        'available': True,
-                        'version': latest_version,
-                        'download_url': latest_release.get('zipball_url') or latest_release['assets'][0]['browser_download_url'],
-                        'body': latest_release.get('body', '')
-                    }
-            return {'available': False}
+            cached = self.cache.get(url)
+            if not force and self.cache.is_fresh(cached):
+                latest_release = cached['release']
+            else:
+                headers = self.cache.conditional_headers(cached)
+                headers['Accept'] = 'application/vnd.github+json'
+                response = self.session.get(url, timeout=5, headers=headers)
+                if response.status_code == 304 and cached:
+                    self.cache.touch(url)
+                    latest_release = cached['release']
+                elif response.status_code == 200:
+                    latest_release = _trim_release(response.json())
+                    self.cache.store(url, latest_release, response.headers.get('ETag'),
+                                     response.headers.get('Last-Modified'))
+                else:
+                    return {'available': False}
+            return self._release_info(latest_release, url)
         except Exception as e:
             print(f"Update check failed: {e}")
             return {'available': False}
 
+    def _release_info(self, latest_release, url=None):
+        tag = latest_release.get('tag_name', '')
+        latest_version = tag.lstrip('v')
+        
+        if self.is_newer(latest_version):
+            manifest_asset = next((a for a in latest_release.get('assets') or []
+                                   if a.get('name') == MANIFEST_NAME), None)
+            return {
+                'available': True,
+                'version': latest_version,
+                'download_url': latest_release.get('zipball_url') or latest_release['assets'][0]['browser_download_url'],
+                'body': latest_release.get('body', ''),
+                'sha256': self._release_checksum(latest_release, url),
+                # Delta update: per-file hashes, files fetched from the tagged tree
+                'manifest_url': manifest_asset['browser_download_url'] if manifest_asset else None,
+                'files_url': f"{self.raw_url}/{quote(tag)}/"
+            }
+        return {'available': False}
+
     def is_newer(self, remote_version):
         try:
             v1_parts = [int(p) for p in self.current_version.split('.')]
@@ -37,54 +93,289 @@ class GitHubUpdater:
         except:
             return False
 
-    def download_update(self, download_url):
-        """Downloads the update archive."""
+    def _release_checksum(self, release, url=None):
+        """Published checksum of the release, fetched once per release and kept in the update cache."""
+        cached = self.cache.get(url) if url else None
+        if cached and cached.get('release') == release and 'sha256' in cached:
+            return cached['sha256']
+        checksum, definitive = self._published_checksum(release)
+        # A failed asset download is retried on the next check instead of caching "no checksum"
+        if url and definitive:
+            self.cache.remember_checksum(url, checksum)
+        return checksum
+
+    def _published_checksum(self, release):
+        """(sha256 or None, definitive) for the release.
+
+        The checksum is a '<name>.sha256' asset or a 'SHA256: <hex>' line in
+        the notes; definitive is False if the asset could not be fetched.
+        """
+        definitive = True
+        for asset in release.get('assets') or []:
+            if asset.get('name', '').lower().endswith('.sha256'):
+                try:
+                    response = self.session.get(asset['browser_download_url'], timeout=5)
+                    if response.status_code == 200:
+                        match = re.search(r'[0-9a-fA-F]{64}', response.text)
+                        if match:
+                            return match.group(0).lower(), True
+                    else:
+                        definitive = False
+                except requests.RequestException as e:
+                    print(f"Could not fetch checksum: {e}")
+                    definitive = False
+        match = _SHA256_RE.search(release.get('body') or '')
+        if match:
+            return match.group(1).lower(), True
+        return None, definitive
+
+    def download_update(self, download_url, expected_sha256=None, progress=None):
+        """Downloads and extracts the update archive.
+
+        The archive is streamed to disk in chunks (constant memory). A partial
+        download left by an earlier attempt or a dropped connection is resumed
+        with an HTTP Range request. progress(downloaded, total) is called after
+        each chunk; total is None if the server does not send a length. If
+        expected_sha256 is given the archive must match it before extraction.
+        """
         try:
-            response = requests.get(download_url, stream=True, timeout=30)
-            if response.status_code == 200:
-                update_path = Path("update_temp")
-                if update_path.exists():
-                    shutil.rmtree(update_path)
-                update_path.mkdir(exist_ok=True)
-                
-                # If it's a zip from GitHub releases
-                with zipfile.ZipFile(io.BytesIO(response.content)) as z:
-                    z.extractall("update_temp")
-                
-                # Usually GitHub zips have a root folder like 'repo-tagname'
-                # Find the actual content folder
-                root_folders = [f for f in update_path.iterdir() if f.is_dir()]
-                if root_folders:
-                    self.content_dir = root_folders[0]
-                else:
-                    self.content_dir = update_path
-                return True
-            return False
+            self.delta_manifest = None
+            archive = self._fetch_archive(download_url, expected_sha256, progress)
+            update_path = Path("update_temp")
+            if update_path.exists():
+                shutil.rmtree(update_path)
+            update_path.mkdir(exist_ok=True)
+            
+            # If it's a zip from GitHub releases
+            with zipfile.ZipFile(archive) as z:
+                z.extractall("update_temp")
+            archive.unlink()
+            
+            # Usually GitHub zips have a root folder like 'repo-tagname'
+            # Find the actual content folder
+            root_folders = [f for f in update_path.iterdir() if f.is_dir()]
+            if root_folders:
+                self.content_dir = root_folders[0]
+            else:
+                self.content_dir = update_path
+            return True
         except Exception as e:
             print(f"Update download failed: {e}")
             return False
 
-    def apply_update(self):
-        """Applies the update by creating a replacement script."""
+    def download_delta(self, manifest_url, files_url, install_dir=None, progress=None):
+        """Downloads only the files that differ from the release manifest.
+
+        Files are compared against install_dir, by default the active version
+        (which apply_update copies the unchanged files from).
+
+        Changed files are staged under update_temp/ (verified against their
+        manifest hashes) and become self.content_dir, so apply_update only
+        touches what changed. Returns a report dict, or None on failure (the
+        caller should fall back to the full archive).
+        progress(downloaded, total) counts bytes of the changed files.
+        """
+        try:
+            response = self.session.get(manifest_url, timeout=10)
+            response.raise_for_status()
+            manifest = response.json()
+            validate_manifest(manifest)
+
+            changed = changed_files(manifest, install_dir or StagedUpdateApplier().active_dir())
+            files = manifest['files']
+            bytes_total = sum(entry['size'] for entry in files.values())
+            bytes_needed = sum(files[rel]['size'] for rel in changed)
+
+            update_path = Path("update_temp")
+            if update_path.exists():
+                shutil.rmtree(update_path)
+            content_dir = update_path / "delta"
+            content_dir.mkdir(parents=True)
+
+            done = 0
+            for rel_path in changed:
+                entry = files[rel_path]
+                target = content_dir / rel_path
+                target.parent.mkdir(parents=True, exist_ok=True)
+                on_chunk = (lambda d, t, base=done: progress(base + d, bytes_needed)) if progress else None
+                self._fetch(files_url + quote(rel_path), target, entry['sha256'], on_chunk)
+                done += entry['size']
+
+            self.content_dir = content_dir
+            self.delta_manifest = manifest
+            report = {
+                'files_total': len(files),
+                'files_changed': len(changed),
+                'bytes_total': bytes_total,
+                'bytes_downloaded': bytes_needed,
+                'bytes_saved': bytes_total - bytes_needed,
+            }
+            print(f"Delta update: {len(changed)}/{len(files)} files, "
+                  f"{bytes_needed:,} of {bytes_total:,} bytes ({report['bytes_saved']:,} saved)")
+            return report
+        except Exception as e:
+            print(f"Delta update failed: {e}")
+            return None
+
+    def _fetch_archive(self, download_url, expected_sha256=None, progress=None) -> Path:
+        return self._fetch(download_url, self.download_path, expected_sha256, progress)
+
+    def _fetch(self, download_url, destination: Path, expected_sha256=None, progress=None) -> Path:
+        """Streams download_url into destination, resuming and retrying; returns the path.
+
+        The partial file is named after the URL (which contains the release
+        tag), so a different release never resumes from another one's bytes.
+        """
+        url_key = hashlib.sha256(download_url.encode('utf-8')).hexdigest()[:16]
+        part_path = destination.with_name(f"{destination.name}.{url_key}.part")
+        for stale in destination.parent.glob(f"{glob_escape(destination.name)}.*.part*"):
+            if not stale.name.startswith(part_path.name):
+                stale.unlink()
+        for attempt in range(DOWNLOAD_RETRIES):
+            try:
+                if self._stream_to(download_url, part_path, progress):
+                    break
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                if attempt == DOWNLOAD_RETRIES - 1:
+                    raise
+                print(f"Download interrupted ({e}), resuming...")
+                time.sleep(min(2 ** attempt, 10))
+        else:
+            raise IOError("Download did not complete")
+
+        if expected_sha256:
+            actual = _sha256_file(part_path)
+            if actual != expected_sha256.lower():
+                _discard_part(part_path)  # corrupt or tampered: never resume from it
+                raise ChecksumMismatchError(f"Checksum mismatch: expected {expected_sha256}, got {actual}")
+        os.replace(part_path, destination)
+        _discard_part(part_path)
+        return destination
+
+    def _stream_to(self, download_url, part_path: Path, progress=None) -> bool:
+        """One download attempt; returns True once the file is complete.
+
+        A resume sends If-Range with the validator (ETag or Last-Modified)
+        saved when the download started, so a file changed on the server
+        comes back whole (200) instead of being spliced onto the old bytes.
+        """
+        meta = _read_part_meta(part_path)
+        offset = part_path.stat().st_size if part_path.exists() and meta.get('validator') else 0
+        headers = {'Range': f'bytes={offset}-', 'If-Range': meta['validator']} if offset else {}
+        with self.session.get(download_url, stream=True, timeout=30, headers=headers) as response:
+            if response.status_code == 416:
+                # Complete only if it has exactly the size the server reports
+                total = _content_range_total(response.headers.get('Content-Range')) or meta.get('total')
+                if total is not None and offset == total:
+                    return True
+                _discard_part(part_path)
+                return False
+            if response.status_code == 206:
+                total = _content_range_total(response.headers.get('Content-Range'))
+                if _content_range_start(response.headers.get('Content-Range')) != offset:
+                    _discard_part(part_path)
+                    return False
+                mode = 'ab'
+            elif response.status_code == 200:
+                # Server ignored the range or the file changed; start over
+                offset = 0
+                total = int(response.headers['Content-Length']) if 'Content-Length' in response.headers else None
+                mode = 'wb'
+                _write_part_meta(part_path, response.headers.get('ETag') or response.headers.get('Last-Modified'), total)
+            else:
+                raise IOError(f"Download failed: HTTP {response.status_code}")
+
+            downloaded = offset
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    f.write(chunk)
+                    downloaded += len(chunk)
+                    if progress:
+                        progress(downloaded, total)
+            return total is None or downloaded >= total
+
+    def apply_update(self, version=None):
+        """Installs the downloaded update side by side and switches to it.
+
+        The extracted tree (or the delta of changed files) is staged under
+        versions/<version>, verified and activated by replacing the pointer
+        file; the previous version stays installed for rollback. Takes effect
+        on the next start.
+        """
         if not hasattr(self, 'content_dir') or not self.content_dir.exists():
             return False
             
         try:
-            # Create a batch script to replace files after app closes
-            # It waits 2 seconds, moves files, deletes itself
-            batch_content = f"""@echo off
-timeout /t 2 /nobreak > nul
-xcopy /s /e /y "{self.content_dir.absolute()}\\*" .
-rd /s /q "update_temp"
-start python money_mods.py
-del "%~f0"
-"""
-            with open("updater_helper.bat", "w") as f:
-                f.write(batch_content)
-            
-            # Run the batch script and exit current app
-            os.startfile("updater_helper.bat")
+            version = version or time.strftime("%Y%m%d%H%M%S")
+            applier = StagedUpdateApplier()
+            applier.install(self.content_dir, version, manifest=self.delta_manifest,
+                            delta=self.delta_manifest is not None)
+            applier.prune()
+            shutil.rmtree("update_temp", ignore_errors=True)
             return True
         except Exception as e:
-            print(f"Failed to prepare update application: {e}")
+            print(f"Failed to apply update: {e}")
             return False
+
+
+def _trim_release(release):
+    """The parts of a GitHub release response the updater uses (keeps the cache file small)."""
+    return {
+        'tag_name': release.get('tag_name', ''),
+        'zipball_url': release.get('zipball_url'),
+        'body': release.get('body', ''),
+        'assets': [{'name': a.get('name', ''), 'browser_download_url': a.get('browser_download_url')}
+                   for a in release.get('assets') or []],
+    }
+
+
+def _content_range_total(content_range):
+    """Total size from a 'bytes start-end/total' header, or None."""
+    if content_range and '/' in content_range:
+        total = content_range.rsplit('/', 1)[1]
+        if total.isdigit():
+            return int(total)
+    return None
+
+
+def _content_range_start(content_range):
+    """First byte from a 'bytes start-end/total' header, or None."""
+    match = re.match(r'bytes\s+(\d+)-', content_range or '')
+    return int(match.group(1)) if match else None
+
+
+def _part_meta_path(part_path: Path) -> Path:
+    return part_path.with_name(part_path.name + ".json")
+
+
+def _read_part_meta(part_path: Path) -> dict:
+    """Validator and total size saved for a partial download ({} if none)."""
+    try:
+        with open(_part_meta_path(part_path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_part_meta(part_path: Path, validator, total):
+    # Weak ETags cannot be used in If-Range; without a validator the download is not resumed
+    if validator and validator.startswith('W/'):
+        validator = None
+    with open(_part_meta_path(part_path), 'w', encoding='utf-8') as f:
+        json.dump({'validator': validator, 'total': total}, f)
+
+
+def _discard_part(part_path: Path):
+    for path in (part_path, _part_meta_path(part_path)):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _sha256_file(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
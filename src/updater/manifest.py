@@ -0,0 +1,103 @@
+"""Release manifest: SHA-256 and size of every shipped file, for delta updates.
+
+Build one for a release (upload it as a release asset named manifest.json):
+
+    python -m src.updater.manifest <source_dir> --version 1.2.0 -o manifest.json
+"""
+import os
+import sys
+import json
+import fnmatch
+import hashlib
+import argparse
+from pathlib import Path, PurePosixPath, PureWindowsPath
+from typing import Dict, List
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Never shipped and never overwritten: user state, caches, build output
+EXCLUDE_PATTERNS = [
+    '.git', '__pycache__', '*.pyc', 'update_temp*', 'updater_helper.bat', 'backups',
+    'config.ini', 'session.json', 'update_cache.json', 'build', 'dist', 'releases', MANIFEST_NAME,
+    'versions', 'current_version.json*',
+]
+
+
+def is_excluded(name: str) -> bool:
+    return any(fnmatch.fnmatch(name, pattern) for pattern in EXCLUDE_PATTERNS)
+
+
+def hash_file(path, chunk_size=1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_manifest(root, version: str) -> Dict:
+    """Manifest of every file under root, keyed by '/'-separated relative path."""
+    root = Path(root)
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not is_excluded(d))
+        for name in sorted(filenames):
+            if is_excluded(name):
+                continue
+            path = Path(dirpath) / name
+            files[path.relative_to(root).as_posix()] = {
+                'sha256': hash_file(path),
+                'size': path.stat().st_size,
+            }
+    return {'manifest_version': MANIFEST_VERSION, 'version': version, 'files': files}
+
+
+def changed_files(manifest: Dict, root) -> List[str]:
+    """Relative paths whose local copy is missing or differs from the manifest.
+
+    A size mismatch settles it without reading the file; only same-sized
+    files are hashed.
+    """
+    root = Path(root)
+    changed = []
+    for rel_path, entry in manifest.get('files', {}).items():
+        local = root / rel_path
+        try:
+            if local.stat().st_size != entry['size'] or hash_file(local) != entry['sha256']:
+                changed.append(rel_path)
+        except OSError:
+            changed.append(rel_path)
+    return changed
+
+
+def validate_manifest(manifest: Dict):
+    """Raises ValueError for manifests this updater cannot use safely."""
+    if manifest.get('manifest_version') != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported manifest version: {manifest.get('manifest_version')}")
+    for rel_path in manifest.get('files', {}):
+        # Paths come from the network: never let one escape the install directory.
+        # Checked under both path flavours, whichever OS we run on ('C:foo', '\\foo', 'a\\..\\b')
+        posix, windows = PurePosixPath(rel_path), PureWindowsPath(rel_path)
+        if (not posix.parts or posix.is_absolute() or windows.drive or windows.root
+                or '..' in posix.parts or '..' in windows.parts):
+            raise ValueError(f"Unsafe path in manifest: {rel_path}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build a release manifest for delta updates")
+    parser.add_argument('source_dir')
+    parser.add_argument('--version', required=True)
+    parser.add_argument('-o', '--output', default=MANIFEST_NAME)
+    args = parser.parse_args(argv)
+
+    manifest = build_manifest(args.source_dir, args.version)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    total = sum(entry['size'] for entry in manifest['files'].values())
+    print(f"{len(manifest['files'])} files, {total:,} bytes -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""Side-by-side versioned installs switched by a pointer file.
+
+    <install>/money_mods.py            base install (also the launcher)
+    <install>/versions/1.2.0/...       one complete tree per applied update
+    <install>/current_version.json     {"current": "1.2.0", "previous": "1.1.0"}
+
+An update is extracted and verified under versions/<v>.staging, renamed into
+place, and activated by atomically replacing the pointer file. The running
+program is never overwritten, rollback rewrites the pointer back, and
+nothing depends on a shell script, so it works the same on Windows and Linux.
+User files (config.ini, session.json, backups) stay in the install root,
+which remains the working directory.
+"""
+import os
+import sys
+import json
+import shutil
+from pathlib import Path
+from typing import Dict, Optional
+
+from .manifest import hash_file, is_excluded
+
+POINTER_FILE = "current_version.json"
+VERSIONS_DIR = "versions"
+ENTRY_POINT = "money_mods.py"
+BASE_VERSION = "base"  # the tree the user originally installed
+
+
+class UpdateVerificationError(IOError):
+    """A staged update is incomplete or does not match its manifest."""
+
+
+class StagedUpdateApplier:
+    def __init__(self, install_dir=None):
+        self.install_dir = Path(install_dir) if install_dir else install_root()
+        self.versions_dir = self.install_dir / VERSIONS_DIR
+        self.pointer_path = self.install_dir / POINTER_FILE
+
+    # --- pointer ---
+
+    def read_pointer(self) -> Dict:
+        try:
+            with open(self.pointer_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def current_version(self) -> str:
+        return self.read_pointer().get('current') or BASE_VERSION
+
+    def version_dir(self, version: str) -> Path:
+        return self.install_dir if version == BASE_VERSION else self.versions_dir / version
+
+    def active_dir(self) -> Path:
+        """Directory the launcher should run; the base install if the pointer is missing or stale."""
+        active = self.version_dir(self.current_version())
+        return active if (active / ENTRY_POINT).exists() else self.install_dir
+
+    def _write_pointer(self, current: str, previous: Optional[str]):
+        import tempfile
+        fd, tmp = tempfile.mkstemp(prefix=POINTER_FILE, dir=self.install_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'current': current, 'previous': previous}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.pointer_path)
+
+    # --- applying ---
+
+    def install(self, content_dir, version: str, manifest: Optional[Dict] = None, delta: bool = False) -> Path:
+        """Stages content_dir as `version`, verifies it and makes it current.
+
+        With delta=True content_dir only holds changed files; the rest is
+        taken from the active version (hard-linked where the filesystem allows)
+        and files the manifest no longer lists are left out.
+        """
+        staging = self.versions_dir / f"{version}.staging"
+        target = self.versions_dir / version
+        if target.exists() and target == self.active_dir():
+            raise UpdateVerificationError(f"Version {version} is already active")
+        if staging.exists():
+            shutil.rmtree(staging)
+        self.versions_dir.mkdir(exist_ok=True)
+
+        if delta:
+            _copy_tree(self.active_dir(), staging)
+            _copy_tree(Path(content_dir), staging, overwrite=True)
+            if manifest:
+                _remove_unlisted(staging, manifest)
+        else:
+            _copy_tree(Path(content_dir), staging)
+
+        try:
+            self.verify(staging, manifest)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        if target.exists():
+            shutil.rmtree(target)
+        os.replace(staging, target)
+        self.activate(version)
+        return target
+
+    def verify(self, tree: Path, manifest: Optional[Dict] = None):
+        """Checks the entry point exists, every file matches the manifest and all sources compile."""
+        if not (tree / ENTRY_POINT).exists():
+            raise UpdateVerificationError(f"{ENTRY_POINT} missing from update")
+        for rel_path, entry in (manifest or {}).get('files', {}).items():
+            path = tree / rel_path
+            if not path.exists() or path.stat().st_size != entry['size'] or hash_file(path) != entry['sha256']:
+                raise UpdateVerificationError(f"{rel_path} does not match the release manifest")
+        for source in tree.rglob('*.py'):
+            try:
+                compile(source.read_bytes(), str(source), 'exec')
+            except SyntaxError as e:
+                raise UpdateVerificationError(f"{source.relative_to(tree)} does not compile: {e}")
+
+    def activate(self, version: str):
+        """Makes an installed version current (one atomic file replace)."""
+        if not (self.version_dir(version) / ENTRY_POINT).exists():
+            raise UpdateVerificationError(f"Version {version} is not installed")
+        current = self.current_version()
+        if current != version:
+            self._write_pointer(version, current)
+
+    def rollback(self) -> Optional[str]:
+        """Switches back to the previously active version; returns it, or None if there is none."""
+        previous = self.read_pointer().get('previous')
+        if not previous or not (self.version_dir(previous) / ENTRY_POINT).exists():
+            return None
+        self.activate(previous)
+        return previous
+
+    def prune(self, keep: int = 2):
+        """Deletes old versions, keeping the current, the previous and the newest `keep` others."""
+        if not self.versions_dir.exists():
+            return
+        pointer = self.read_pointer()
+        protected = {pointer.get('current'), pointer.get('previous')}
+        installed = sorted((d for d in self.versions_dir.iterdir() if d.is_dir()),
+                           key=lambda d: d.stat().st_mtime, reverse=True)
+        for directory in installed[keep:]:
+            if directory.name not in protected:
+                shutil.rmtree(directory, ignore_errors=True)
+
+
+def _code_root() -> Path:
+    """Root of the tree this code is running from (the base install or versions/<v>)."""
+    return Path(__file__).resolve().parent.parent.parent
+
+
+def install_root() -> Path:
+    """The base install directory, also when running from one of its versions."""
+    root = _code_root()
+    if root.parent.name == VERSIONS_DIR and (root.parent.parent / ENTRY_POINT).exists():
+        return root.parent.parent
+    return root
+
+
+def _link_or_copy(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _copy_tree(source: Path, destination: Path, overwrite=False):
+    """Copies source into destination, skipping user state, caches and other versions."""
+    for dirpath, dirnames, filenames in os.walk(source):
+        rel = Path(dirpath).relative_to(source)
+        dirnames[:] = [d for d in dirnames if not is_excluded(d)]
+        (destination / rel).mkdir(parents=True, exist_ok=True)
+        for name in filenames:
+            if is_excluded(name):
+                continue
+            target = destination / rel / name
+            if target.exists():
+                if not overwrite:
+                    continue
+                target.unlink()  # never write through a hard link into another version
+            # Delta files are fresh downloads; shared files are immutable once installed
+            (shutil.copy2 if overwrite else _link_or_copy)(Path(dirpath) / name, target)
+
+
+def _remove_unlisted(tree: Path, manifest: Dict):
+    """Deletes files under tree that the manifest does not ship (removed in this release)."""
+    listed = set(manifest.get('files', {}))
+    for dirpath, dirnames, filenames in os.walk(tree, topdown=False):
+        for name in filenames:
+            path = Path(dirpath) / name
+            if path.relative_to(tree).as_posix() not in listed:
+                path.unlink()
+        if Path(dirpath) != tree and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+
+
+def relaunch_target() -> Optional[Path]:
+    """Entry point of the active version if it is not the tree running now, else None."""
+    if getattr(sys, 'frozen', False):
+        return None  # bundled executables update themselves as a whole
+    active = StagedUpdateApplier().active_dir().resolve()
+    if active == _code_root():
+        return None
+    return active / ENTRY_POINT
+
+
+def launch_active_version(args):
+    """Hands over to the active version if it is not this tree; returns only if this tree is active.
+
+    The working directory stays the install root so user files are shared.
+    """
+    target = relaunch_target()
+    if target is None:
+        return
+    argv = [sys.executable, str(target)] + list(args)
+    if os.name == 'posix':
+        os.execv(sys.executable, argv)
+    import subprocess
+    sys.exit(subprocess.call(argv))
+
+
+def restart_application():
+    """Starts a fresh instance through the base launcher (which picks the active version)."""
+    import subprocess
+    root = install_root()
+    if getattr(sys, 'frozen', False):
+        subprocess.Popen([sys.executable], cwd=os.getcwd())
+    else:
+        subprocess.Popen([sys.executable, str(root / ENTRY_POINT)], cwd=os.getcwd())
+
+
+def main(argv=None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="Manage side-by-side installed versions")
+    parser.add_argument('action', choices=('status', 'rollback', 'prune'))
+    args = parser.parse_args(argv)
+    applier = StagedUpdateApplier()
+    if args.action == 'rollback':
+        previous = applier.rollback()
+        print(f"Rolled back to {previous}" if previous else "Nothing to roll back to")
+        return 0 if previous else 1
+    if args.action == 'prune':
+        applier.prune()
+    pointer = applier.read_pointer()
+    print(f"current: {pointer.get('current') or BASE_VERSION}, previous: {pointer.get('previous')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
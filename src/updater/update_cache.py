@@ -0,0 +1,90 @@
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+CACHE_FILE = "update_cache.json"
+DEFAULT_TTL = 6 * 3600  # seconds a successful check is trusted without touching the network
+
+
+class UpdateCheckCache:
+    """Last release response per URL with its ETag/Last-Modified validators.
+
+    Within the TTL the cached release is used as-is; after it, the validators
+    turn the next request into a conditional one that usually returns 304.
+    """
+
+    def __init__(self, cache_file=CACHE_FILE, ttl: float = DEFAULT_TTL):
+        self.cache_file = Path(cache_file)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def get(self, url) -> Optional[Dict]:
+        """{'etag', 'last_modified', 'checked_at', 'release'} for url, or None.
+
+        'sha256' is present once remember_checksum() ran for this release.
+        """
+        with self._lock:
+            return self._load().get(url)
+
+    def is_fresh(self, entry: Optional[Dict], now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return bool(entry) and 0 <= now - entry.get('checked_at', 0) < self.ttl
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict:
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, release: Dict, etag=None, last_modified=None):
+        self._update(url, {
+            'etag': etag,
+            'last_modified': last_modified,
+            'checked_at': time.time(),
+            'release': release,
+        })
+
+    def touch(self, url):
+        """Marks a cached entry as revalidated (after a 304)."""
+        with self._lock:
+            entry = self._load().get(url)
+        if entry:
+            self._update(url, dict(entry, checked_at=time.time()))
+
+    def remember_checksum(self, url, sha256: Optional[str]):
+        """Keeps the checksum published with the cached release (None: none published).
+
+        A new release replaces the entry through store(), which drops it again.
+        """
+        with self._lock:
+            entry = self._load().get(url)
+        if entry:
+            self._update(url, dict(entry, sha256=sha256))
+
+    def _update(self, url, entry):
+        with self._lock:
+            entries = self._load()
+            entries[url] = entry
+            try:
+                tmp = self.cache_file.with_name(self.cache_file.name + '.tmp')
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(entries, f)
+                os.replace(tmp, self.cache_file)
+            except OSError as e:
+                print(f"Could not write update cache: {e}")
+
+    def _load(self) -> Dict:
+        if self._entries is None:
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
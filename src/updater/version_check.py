@@ -1,8 +1,12 @@
 import json
+from pathlib import Path
 
 class VersionCheck:
     @staticmethod
-    def get_local_version(version_file_path='version.json'):
+    def get_local_version(version_file_path=None):
+        # version.json of the tree that is running (an update may run from versions/<v>)
+        if version_file_path is None:
+            version_file_path = Path(__file__).parent.parent.parent / 'version.json'
         try:
             with open(version_file_path, 'r') as f:
                 data = json.load(f)